@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+End-to-end performance benchmark of the churn pipeline at several data scales.
+
+For every scale (`--scales`, rows) a CSV of that size is written (rows of
+`--input` tiled, or `--synthetic` customers from `src.data.synthetic`) and, in
+a fresh interpreter, each stage is timed and memory-profiled:
+
+    load_data -> validate_telco_data -> preprocess_data -> build_features
+    -> train (XGBoost, run.py hyperparameters) -> predict_single -> predict_batch
+
+Per stage the JSON report holds wall time, rows/s, the process peak RSS after
+the stage and how much the stage raised it (`peak_rss_delta_mb`). The
+prediction stages serve the model trained in the same run, with the
+prediction cache disabled. `--baseline` compares against an earlier report
+and flags stages that got slower or hungrier than `--tolerance`.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import contextlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# === Fix import path for local modules ===
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from src.data.synthetic import write_telco
+from src.utils.profiling import format_mb, frame_mb, peak_rss_mb
+
+STAGES = [
+    "load_data",
+    "validate_telco_data",
+    "preprocess_data",
+    "build_features",
+    "train",
+    "predict_single",
+    "predict_batch",
+]
+
+# Metrics compared against a baseline (lower is better for all)
+COMPARED = ("seconds", "peak_rss_mb", "peak_rss_delta_mb")
+
+
+def measure(fn: Callable[[], Any], rows: int) -> Tuple[Any, Dict[str, Any]]:
+    """Run `fn` once (stdout silenced) and return its value plus time / memory metrics."""
+    peak_before = peak_rss_mb()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = fn()
+    seconds = time.perf_counter() - t0
+    peak_after = peak_rss_mb()
+    metrics = {
+        "seconds": seconds,
+        "rows": rows,
+        "rows_per_s": rows / max(seconds, 1e-9),
+        "peak_rss_mb": peak_after,
+        "peak_rss_delta_mb": None if peak_after is None else peak_after - peak_before,
+    }
+    if isinstance(value, pd.DataFrame):
+        metrics["frame_mb"] = frame_mb(value)
+    return value, metrics
+
+
+def write_scale_csv(source: str, rows: int, path: str) -> None:
+    """Tile the rows of `source` up to `rows` rows (unique customerIDs) and write them to `path`."""
+    base = pd.read_csv(source)
+    df = base.iloc[np.resize(np.arange(len(base)), rows)].reset_index(drop=True)
+    if "customerID" in df.columns:
+        df["customerID"] = df["customerID"].astype(str) + "-" + (df.index // len(base)).astype(str)
+    df.to_csv(path, index=False)
+
+
+def run_scale(csv_path: str, rows: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Benchmark every stage on one CSV. Runs in its own interpreter so peak RSS
+    is not inherited from a previous (larger) scale.
+    """
+    # Score every request: repeated records would otherwise be served from the prediction cache
+    os.environ["PREDICTION_CACHE_SIZE"] = "0"
+
+    from sklearn.model_selection import train_test_split
+    from xgboost import XGBClassifier
+
+    from src.data.load_data import load_data
+    from src.data.validate_data import validate_telco_data
+    from src.data.preprocess import preprocess_data
+    from src.data.feature_engineering import FeatureTransformer, build_features
+    from src.data.predict.bundle import write_bundle
+
+    results: Dict[str, Dict[str, Any]] = {}
+    target = "Churn"
+
+    raw, results["load_data"] = measure(lambda: load_data(csv_path, typed=options["typed"]), rows)
+    (ok, _), results["validate_telco_data"] = measure(lambda: validate_telco_data(raw), rows)
+    results["validate_telco_data"]["success"] = bool(ok)
+
+    df, results["preprocess_data"] = measure(lambda: preprocess_data(raw, compact=options["compact"]), rows)
+    del raw
+    # Fitted before build_features, which may encode `df` in place (compact mode)
+    with contextlib.redirect_stdout(io.StringIO()):
+        transformer = FeatureTransformer(target_col=target).fit(df)
+
+    def features():
+        df_enc = build_features(df, target_col=target, copy=not options["compact"], compact=options["compact"])
+        for c in df_enc.select_dtypes(include=["bool"]).columns:
+            df_enc[c] = df_enc[c].astype("int8" if options["compact"] else int)
+        return df_enc
+
+    df_enc, results["build_features"] = measure(features, rows)
+    del df
+
+    X, y = df_enc.drop(columns=[target]), df_enc[target]
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+
+    def train():
+        model = XGBClassifier(
+            n_estimators=options["n_estimators"], learning_rate=0.034, max_depth=7,
+            subsample=0.95, colsample_bytree=0.98, n_jobs=-1, random_state=42, eval_metric="logloss",
+            scale_pos_weight=(y_train == 0).sum() / max((y_train == 1).sum(), 1),
+        )
+        return model.fit(X_train, y_train)
+
+    model, results["train"] = measure(train, len(X_train))
+    results["train"]["n_estimators"] = options["n_estimators"]
+    del X, y, X_train, y_train, df_enc
+
+    # Raw requests, re-read because preprocessing modified the loaded frame
+    batch = pd.read_csv(csv_path, nrows=options["batch_rows"] or None)
+    records = batch.head(options["single_calls"]).to_dict(orient="records")
+
+    # === Serve the model trained above through the real prediction module ===
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from src.data.predict import predict
+            from src.data.predict.registry import ServingModel
+    except (FileNotFoundError, RuntimeError) as e:
+        # The module loads the current artifacts at import time
+        reason = f"prediction module unavailable: {e}"
+        results["predict_single"] = {"skipped": reason}
+        results["predict_batch"] = {"skipped": reason}
+        return results
+
+    with tempfile.TemporaryDirectory() as bundles_dir, contextlib.redirect_stdout(io.StringIO()):
+        path = write_bundle(bundles_dir, model.get_booster(), transformer, threshold=0.35)
+        predict.registry.register(ServingModel.from_bundle(path, engine=predict.PREDICT_ENGINE))
+
+    def single():
+        latencies = np.empty(len(records))
+        for i, record in enumerate(records):
+            t = time.perf_counter()
+            predict.predict_single(record)
+            latencies[i] = time.perf_counter() - t
+        return latencies
+
+    latencies, results["predict_single"] = measure(single, len(records))
+    results["predict_single"].update({
+        "p50_us": float(np.percentile(latencies, 50) * 1e6),
+        "p99_us": float(np.percentile(latencies, 99) * 1e6),
+    })
+    _, results["predict_batch"] = measure(lambda: predict.predict_batch(batch), len(batch))
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    import xgboost
+
+    try:
+        commit = subprocess.run(
+            ["git", "-C", PROJECT_ROOT, "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "xgboost": xgboost.__version__,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Stage-by-stage ratios vs. the baseline report, for the scales and metrics both have."""
+    rows = []
+    for scale, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(scale)
+        if not base_stages:
+            continue
+        for stage, metrics in stages.items():
+            base = base_stages.get(stage, {})
+            for metric in COMPARED:
+                now, then = metrics.get(metric), base.get(metric)
+                if now is None or then is None:
+                    continue
+                # Memory deltas can be ~0: compare memory with an absolute 16 MB slack
+                slack = 0.0 if metric == "seconds" else 16.0
+                regressed = now > then * (1 + tolerance) + slack
+                rows.append({
+                    "scale": scale, "stage": stage, "metric": metric, "baseline": then, "current": now,
+                    "ratio": now / then if then else None, "regression": regressed,
+                })
+    return rows
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for scale, stages in report["results"].items():
+        print(f"\n⏱️  {int(scale):,} rows")
+        for stage in STAGES:
+            m = stages.get(stage, {})
+            if "skipped" in m:
+                print(f"   {stage:<20} skipped ({m['skipped']})")
+                continue
+            extra = f" | p50 {m['p50_us']:.0f}µs p99 {m['p99_us']:.0f}µs" if "p50_us" in m else ""
+            print(f"   {stage:<20} {m['seconds']:8.3f}s {m['rows_per_s']:>14,.0f} rows/s | "
+                  f"peak RSS {format_mb(m['peak_rss_mb'])} (+{format_mb(m['peak_rss_delta_mb'])}){extra}")
+
+
+def main(args):
+    scales = sorted({int(s) for s in args.scales.split(",")})
+    options = {
+        "typed": args.typed,
+        "compact": args.compact,
+        "n_estimators": args.n_estimators,
+        "single_calls": args.single_calls,
+        "batch_rows": args.batch_rows,
+    }
+    source = {"synthetic_seed": args.seed} if args.synthetic else {"input": args.input}
+    report = {"environment": environment(), "options": {**options, **source}, "results": {}}
+
+    print(f"🏁 Benchmarking {len(STAGES)} stages at {len(scales)} scale(s): {scales}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in scales:
+            csv_path = os.path.join(tmp, f"telco_{rows}.csv")
+            if args.synthetic:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    write_telco(csv_path, rows, seed=args.seed)
+            else:
+                write_scale_csv(args.input, rows, csv_path)
+            # Fresh interpreter per scale
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                report["results"][str(rows)] = pool.submit(run_scale, csv_path, rows, options).result()
+            os.remove(csv_path)
+            print(f"   ✅ {rows:,} rows done")
+
+    print_report(report)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerance)
+        regressions = [r for r in rows if r["regression"]]
+        print(f"\n📊 Compared with {args.baseline} ({baseline.get('environment', {}).get('git_commit')}), "
+              f"tolerance {args.tolerance:.0%}:")
+        for r in rows:
+            flag = "⚠️ " if r["regression"] else "  "
+            ratio = f"{r['ratio']:.2f}x" if r["ratio"] is not None else "n/a"
+            print(f"   {flag}{int(r['scale']):>10,} {r['stage']:<20} {r['metric']:<18} "
+                  f"{r['baseline']:10.3f} -> {r['current']:10.3f} ({ratio})")
+        print(f"{'❌' if regressions else '✅'} {len(regressions)} regression(s)")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Benchmark every churn pipeline stage at several data scales")
+    p.add_argument("--input", type=str, default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+                   help="source CSV whose rows are tiled up to each scale")
+    p.add_argument("--synthetic", action="store_true",
+                   help="generate each scale with the synthetic Telco generator instead of tiling --input")
+    p.add_argument("--seed", type=int, default=42, help="seed for --synthetic data")
+    p.add_argument("--scales", type=str, default="10000,100000,1000000", help="comma-separated row counts")
+    p.add_argument("--typed", action="store_true", help="load with the declared Telco schema")
+    p.add_argument("--compact", action="store_true", help="compact dtypes in preprocess / features")
+    p.add_argument("--n_estimators", type=int, default=301, help="boosting rounds for the training stage")
+    p.add_argument("--single_calls", type=int, default=1000, help="predict_single calls to time")
+    p.add_argument("--batch_rows", type=int, default=0, help="rows scored by predict_batch (0 = all)")
+    p.add_argument("--output", type=str,
+                   default=os.path.join(PROJECT_ROOT, "artifacts", "benchmarks", "pipeline.json"))
+    p.add_argument("--baseline", type=str, default=None, help="earlier JSON report to compare against")
+    p.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown / memory growth vs. baseline")
+    p.add_argument("--fail_on_regression", action="store_true", help="exit with status 1 on any regression")
+
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Latency comparison for single-row scoring:
+DataFrame + sklearn wrapper path vs. the NumPy row + booster.inplace_predict fast path.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.predict.predict import predict_single, predict_single_frame
+
+# Representative raw Telco record (same shape the API receives)
+SAMPLE_RECORD = {
+    "customerID": "7590-VHVEG",
+    "gender": "Female",
+    "SeniorCitizen": 0,
+    "Partner": "Yes",
+    "Dependents": "No",
+    "tenure": 1,
+    "PhoneService": "No",
+    "MultipleLines": "No phone service",
+    "InternetService": "DSL",
+    "OnlineSecurity": "No",
+    "OnlineBackup": "Yes",
+    "DeviceProtection": "No",
+    "TechSupport": "No",
+    "StreamingTV": "No",
+    "StreamingMovies": "No",
+    "Contract": "Month-to-month",
+    "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check",
+    "MonthlyCharges": 29.85,
+    "TotalCharges": "29.85",
+}
+
+
+def time_calls(fn, records, repeat: int) -> np.ndarray:
+    """Return per-call latencies in microseconds."""
+    latencies = np.empty(repeat, dtype=np.float64)
+    n = len(records)
+    for i in range(repeat):
+        rec = records[i % n]
+        t0 = time.perf_counter()
+        fn(rec)
+        latencies[i] = (time.perf_counter() - t0) * 1e6
+    return latencies
+
+
+def summarize(name: str, lat: np.ndarray) -> dict:
+    stats = {
+        "mean_us": float(lat.mean()),
+        "p50_us": float(np.percentile(lat, 50)),
+        "p99_us": float(np.percentile(lat, 99)),
+    }
+    print(f"   {name:<22} mean {stats['mean_us']:9.1f} µs | p50 {stats['p50_us']:9.1f} µs | p99 {stats['p99_us']:9.1f} µs")
+    return stats
+
+
+def main(args):
+    if args.input:
+        records = pd.read_csv(args.input, nrows=args.rows).to_dict(orient="records")
+    else:
+        records = [SAMPLE_RECORD]
+    print(f"📥 Benchmarking with {len(records)} distinct record(s), {args.repeat} calls per path")
+
+    # === Parity check: both paths must agree ===
+    for rec in records[: min(len(records), 100)]:
+        fast = predict_single(rec)["probability_churn"]
+        ref = predict_single_frame(rec)["probability_churn"]
+        if abs(fast - ref) > 1e-6:
+            raise AssertionError(f"❌ Fast path mismatch: {fast} vs {ref} for {rec}")
+    print("✅ Fast path matches DataFrame path")
+
+    # === Warm-up then measure ===
+    time_calls(predict_single_frame, records, min(args.repeat, 100))
+    time_calls(predict_single, records, min(args.repeat, 100))
+
+    print("\n⏱️  Single-row latency:")
+    ref_stats = summarize("DataFrame path", time_calls(predict_single_frame, records, args.repeat))
+    fast_stats = summarize("NumPy fast path", time_calls(predict_single, records, args.repeat))
+    print(f"\n🚀 Speedup (mean): {ref_stats['mean_us'] / fast_stats['mean_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Compare predict_single fast path against the DataFrame path")
+    p.add_argument("--input", type=str, default=None,
+                   help="optional raw CSV to draw records from (defaults to a built-in sample record)")
+    p.add_argument("--rows", type=int, default=1000, help="number of CSV rows to cycle through")
+    p.add_argument("--repeat", type=int, default=5000, help="calls per path")
+
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measure serving cold start: time and peak RSS to import the prediction module
+and score one record, loading the model from the serving bundle vs. MLflow.
+
+Each measurement runs in a fresh interpreter (CHURN_MODEL_SOURCE=bundle|mlflow).
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Runs inside the child interpreter
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from src.data.predict import predict
+t_load = time.perf_counter() - t0
+predict.predict_single({"tenure": 1, "MonthlyCharges": 29.85, "Contract": "Month-to-month"})
+t_first = time.perf_counter() - t0
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+except ImportError:  # Windows
+    rss_mb = None
+print(json.dumps({
+    "load_s": t_load,
+    "first_prediction_s": t_first,
+    "peak_rss_mb": rss_mb,
+    "model_version": predict.registry.active.version,
+    "mlflow_imported": "mlflow" in sys.modules,
+}))
+"""
+
+
+def measure(source: str) -> dict:
+    env = dict(os.environ, CHURN_MODEL_SOURCE=source)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, PROJECT_ROOT],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(args):
+    results = {}
+    for source in ("mlflow", "bundle"):
+        runs = [measure(source) for _ in range(args.repeat)]
+        results[source] = {
+            "load_s": statistics.median(r["load_s"] for r in runs),
+            "first_prediction_s": statistics.median(r["first_prediction_s"] for r in runs),
+            "peak_rss_mb": statistics.median(r["peak_rss_mb"] for r in runs) if runs[0]["peak_rss_mb"] else None,
+            "model_version": runs[0]["model_version"],
+            "mlflow_imported": runs[0]["mlflow_imported"],
+        }
+
+    print(f"⏱️  Cold start (median of {args.repeat} fresh interpreters):")
+    for source, r in results.items():
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r["peak_rss_mb"] else "n/a"
+        print(f"   {source:<7} load {r['load_s']:.2f}s | first prediction {r['first_prediction_s']:.2f}s | "
+              f"peak RSS {rss} | mlflow imported: {r['mlflow_imported']} | version {r['model_version']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Compare API cold start with the serving bundle vs. MLflow")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--output", type=str, default=None, help="optional JSON output path")
+
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the NumPy TreeEnsemble engine against XGBoost across batch sizes.
+
+Compares XGBClassifier.predict_proba (sklearn wrapper + DMatrix),
+booster.inplace_predict and TreeEnsemble.predict_proba on the trained model
+active in the serving registry, and checks that all engines agree within --tolerance.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.predict import predict as serving
+from src.data.predict.tree_engine import TreeEnsemble
+
+
+def best_time(fn, X, repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds (warm-up call excluded)."""
+    fn(X)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(X)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(args):
+    active = serving.registry.active
+    if active.transformer is None:
+        raise RuntimeError("❌ preprocessing.pkl has no fitted transformer; re-run Scripts/run.py first")
+
+    print(f"📥 Loading rows from {args.input}")
+    raw = pd.read_csv(args.input)
+    base = active.transformer.transform(raw).to_numpy(dtype=np.float32)
+
+    t0 = time.perf_counter()
+    engine = TreeEnsemble.from_booster(active.booster)
+    print(f"🌲 Exported {engine.n_trees} trees (max depth {engine.max_depth}, "
+          f"{len(engine.value)} nodes) in {time.perf_counter() - t0:.3f}s")
+
+    engines = {
+        "predict_proba": lambda X: active.model.predict_proba(X)[:, 1],
+        "inplace_predict": lambda X: active.booster.inplace_predict(X),
+        "numpy_engine": engine.predict_proba,
+    }
+
+    # === Parity check on the full input ===
+    ref = engines["predict_proba"](base)
+    diff = float(np.abs(engine.predict_proba(base) - ref).max())
+    if diff > args.tolerance:
+        raise AssertionError(f"❌ NumPy engine differs from predict_proba by {diff:.2e} (> {args.tolerance})")
+    print(f"✅ Max |numpy - predict_proba| = {diff:.2e} (tolerance {args.tolerance})")
+
+    # === Timing across batch sizes ===
+    print(f"\n⏱️  Best of {args.repeat} runs (ms per batch / rows per second):")
+    print(f"   {'batch':>8} | " + " | ".join(f"{name:>24}" for name in engines))
+    for size in args.batch_sizes:
+        X = np.resize(base, (size, base.shape[1]))
+        cells = []
+        for fn in engines.values():
+            seconds = best_time(fn, X, args.repeat)
+            cells.append(f"{seconds * 1000:9.3f} ms {size / seconds:10.0f}/s")
+        print(f"   {size:>8} | " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Compare XGBoost and NumPy tree-ensemble inference")
+    p.add_argument("--input", type=str, default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+                   help="raw CSV used to build feature rows")
+    p.add_argument("--batch_sizes", type=int, nargs="+", default=[1, 16, 256, 4096, 65536])
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--tolerance", type=float, default=1e-5)
+
+    args = p.parse_args()
+    main(args)
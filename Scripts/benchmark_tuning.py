@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-trial wall-clock time of the tuning objective with and without
+cached quantized CV folds.
+
+Both modes score the same randomly drawn parameter sets (pruning disabled) on
+the pipeline's engineered features and must return identical CV recall. The
+one-off cost of building the cached fold matrices is reported separately.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import optuna
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.load_data import load_data
+from src.data.preprocess import preprocess_data
+from src.data.feature_engineering import build_features
+from src.models.tune import _FoldCache, _Objective
+
+
+def sample_params(rng: np.random.Generator) -> dict:
+    """A parameter set from the same ranges `tune_model` searches."""
+    return {
+        "n_estimators": int(rng.integers(300, 801)),
+        "learning_rate": float(rng.uniform(0.01, 0.2)),
+        "max_depth": int(rng.integers(3, 11)),
+        "subsample": float(rng.uniform(0.5, 1.0)),
+        "colsample_bytree": float(rng.uniform(0.5, 1.0)),
+    }
+
+
+def timed_trial(objective: _Objective, params: dict) -> tuple:
+    t0 = time.perf_counter()
+    score = objective(optuna.trial.FixedTrial(params))
+    return score, time.perf_counter() - t0
+
+
+def main(args):
+    df = load_data(args.input)
+    if args.rows and args.rows > len(df):
+        df = df.iloc[np.resize(np.arange(len(df)), args.rows)].reset_index(drop=True)
+    df = build_features(preprocess_data(df), target_col="Churn")
+    X, y = df.drop(columns=["Churn"]), df["Churn"]
+
+    rng = np.random.default_rng(args.seed)
+    param_sets = [sample_params(rng) for _ in range(args.trials)]
+
+    t0 = time.perf_counter()
+    _FoldCache(X, y)
+    build_s = time.perf_counter() - t0
+
+    baseline = _Objective(X, y, args.threads, prune=False, report_every=10, cache_folds=False)
+    cached = _Objective(X, y, args.threads, prune=False, report_every=10, cache_folds=True)
+    cached._folds = _FoldCache(X, y)
+
+    # Interleave the two modes so machine noise hits both alike
+    base_scores, base_s, cached_scores, cached_s = [], [], [], []
+    for params in param_sets:
+        score, seconds = timed_trial(baseline, params)
+        base_scores.append(score)
+        base_s.append(seconds)
+        score, seconds = timed_trial(cached, params)
+        cached_scores.append(score)
+        cached_s.append(seconds)
+
+    if not np.allclose(base_scores, cached_scores):
+        raise AssertionError(f"❌ CV recall mismatch:\n   baseline: {base_scores}\n   cached:   {cached_scores}")
+    print(f"✅ Identical CV recall on {args.trials} parameter sets")
+
+    print(f"\n⏱️  {len(X):,} rows x {X.shape[1]} features, {args.threads} thread(s) per trial:")
+    print(f"   XGBClassifier per fold  : {np.mean(base_s):6.2f}s / trial (total {np.sum(base_s):.1f}s)")
+    print(f"   cached quantized folds  : {np.mean(cached_s):6.2f}s / trial (total {np.sum(cached_s):.1f}s) "
+          f"| speedup {np.sum(base_s) / np.sum(cached_s):.2f}x")
+    print(f"   one-off fold build      : {build_s:6.2f}s")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Benchmark tuning trials with and without cached quantized folds")
+    p.add_argument("--input", type=str, default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv")
+    p.add_argument("--rows", type=int, default=0, help="tile the input up to this many rows (0 = as is)")
+    p.add_argument("--trials", type=int, default=5)
+    p.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--seed", type=int, default=42)
+
+    args = p.parse_args()
+    main(args)
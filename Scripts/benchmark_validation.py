@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled validation plan against the original hand-written
+`validate_telco_data` checks on a large frame (default 10M rows).
+
+Rows are tiled from the input CSV; `--corrupt` injects nulls, invalid
+categories, non-numeric and out-of-range values so every rule fires. Both
+implementations - and the streaming validator fed the same rows in
+`--chunk_rows` chunks - must return the same (success, failed) summary.
+`validate_telco_file` is also checked against the in-memory validator on
+small CSVs with unparseable numeric values (`--file_rows`).
+"""
+
+import io
+import os
+import sys
+import time
+import tempfile
+import argparse
+import contextlib
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.validate_data import (
+    TELCO_VALIDATION_SPEC, run_validation, validate_stream, validate_telco_data, validate_telco_file
+)
+from src.utils.profiling import format_mb, frame_mb, peak_rss_mb
+
+
+def legacy_validate(df: pd.DataFrame) -> Tuple[bool, List[str]]:
+    """The original per-column implementation (reference for parity and timing)."""
+    failed: List[str] = []
+    required_columns = TELCO_VALIDATION_SPEC[0]["columns"]
+    for col in required_columns:
+        if col not in df.columns:
+            failed.append(f"missing_column:{col}")
+        elif df[col].isnull().any():
+            failed.append(f"nulls_in_column:{col}")
+
+    def check_in_set(col: str, allowed: List[str]):
+        if col not in df.columns:
+            return
+        invalid = ~df[col].isin(allowed)
+        if invalid.any():
+            failed.append(f"invalid_values_in_{col}:{float(invalid.mean()):.2f}")
+
+    check_in_set("gender", ["Male", "Female"])
+    check_in_set("Partner", ["Yes", "No"])
+    check_in_set("Dependents", ["Yes", "No"])
+    check_in_set("PhoneService", ["Yes", "No"])
+    check_in_set("Contract", ["Month-to-month", "One year", "Two year"])
+    check_in_set("InternetService", ["DSL", "Fiber optic", "No"])
+
+    def to_numeric(col: str) -> pd.Series:
+        return pd.to_numeric(df[col], errors="coerce")
+
+    if "tenure" in df.columns:
+        tenure = to_numeric("tenure")
+        if tenure.isnull().any():
+            failed.append("non_numeric:tenure")
+        elif (tenure < 0).any() or (tenure > 120).any():
+            failed.append("tenure_out_of_bounds")
+
+    if "MonthlyCharges" in df.columns:
+        monthly = to_numeric("MonthlyCharges")
+        if monthly.isnull().any():
+            failed.append("non_numeric:MonthlyCharges")
+        elif (monthly < 0).any() or (monthly > 200).any():
+            failed.append("MonthlyCharges_out_of_bounds")
+
+    if "TotalCharges" in df.columns:
+        total = to_numeric("TotalCharges")
+        if not total.isnull().any() and (total < 0).any():
+            failed.append("TotalCharges_negative")
+
+    if set(["TotalCharges", "MonthlyCharges"]).issubset(df.columns):
+        total = pd.to_numeric(df["TotalCharges"], errors="coerce")
+        monthly = pd.to_numeric(df["MonthlyCharges"], errors="coerce")
+        valid_mask = total.notnull() & monthly.notnull()
+        if valid_mask.any():
+            proportion = float((total[valid_mask] >= monthly[valid_mask]).mean())
+            if proportion < 0.9:
+                failed.append(f"total_vs_monthly_ratio:{proportion:.2f}")
+
+    return len(failed) == 0, failed
+
+
+def build_frame(path: str, rows: int, corrupt: float, typed: bool, seed: int) -> pd.DataFrame:
+    base = pd.read_csv(path)
+    columns = [c for c in TELCO_VALIDATION_SPEC[0]["columns"] if c in base.columns]
+    base = base[columns]
+    if typed:
+        base = base.astype({c: "category" for c in base.columns if base[c].dtype == "object" and c != "TotalCharges"})
+
+    df = base.iloc[np.resize(np.arange(len(base)), rows)].reset_index(drop=True)
+
+    if corrupt > 0:
+        rng = np.random.default_rng(seed)
+        k = max(1, int(rows * corrupt))
+        pick = lambda: rng.choice(rows, size=k, replace=False)
+        df.loc[pick(), "gender"] = np.nan
+        if typed:
+            df["Contract"] = df["Contract"].cat.add_categories(["Weekly"])
+        df.loc[pick(), "Contract"] = "Weekly"
+        df.loc[pick(), "tenure"] = 500
+        df.loc[pick(), "MonthlyCharges"] = np.nan
+        df["TotalCharges"] = df["TotalCharges"].astype(object)
+        df.loc[pick(), "TotalCharges"] = "n/a"
+    return df
+
+
+def check_file_parity(path: str, rows: int, seed: int) -> None:
+    """Streamed file validation must match `validate_telco_data(pd.read_csv(...))`, malformed numbers included."""
+    base = pd.read_csv(path, dtype=str, keep_default_na=False)
+    base = base.iloc[np.resize(np.arange(len(base)), rows)].reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    cases = {
+        "clean": {},
+        "tenure 'abc'": {"tenure": "abc"},
+        "MonthlyCharges '12,50'": {"MonthlyCharges": "12,50"},
+        "SeniorCitizen 'yes' + tenure '-'": {"SeniorCitizen": "yes", "tenure": "-"},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, faults in cases.items():
+            df = base.copy()
+            for col, value in faults.items():
+                df.loc[rng.choice(rows, size=3, replace=False), col] = value
+            csv = os.path.join(tmp, "case.csv")
+            df.to_csv(csv, index=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = validate_telco_data(pd.read_csv(csv))
+                streamed = validate_telco_file(csv, chunk_rows=max(1, rows // 4))
+            if streamed != expected:
+                raise AssertionError(f"❌ File summary mismatch ({name}):\n   in-memory: {expected}\n   file:      {streamed}")
+            print(f"✅ File parity ({name}): success={expected[0]} failed={expected[1]}")
+
+
+def best_time(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(args):
+    if args.file_rows > 0:
+        check_file_parity(args.input, args.file_rows, args.seed)
+
+    print(f"📥 Building {args.rows:,}-row frame from {args.input} (corrupt={args.corrupt}, typed={args.typed})")
+    df = build_frame(args.input, args.rows, args.corrupt, args.typed, args.seed)
+    print(f"   frame {frame_mb(df):.0f} MB | peak RSS {format_mb(peak_rss_mb())}")
+
+    t_legacy, legacy = best_time(lambda: legacy_validate(df), args.repeat)
+    t_plan, result = best_time(lambda: run_validation(df), args.repeat)
+    chunks = lambda: (df.iloc[i:i + args.chunk_rows] for i in range(0, len(df), args.chunk_rows))
+    t_stream, streamed = best_time(lambda: validate_stream(chunks(), workers=args.workers), args.repeat)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = validate_telco_data(df)
+    if summary != legacy:
+        raise AssertionError(f"❌ Summary mismatch:\n   legacy: {legacy}\n   plan:   {summary}")
+    if (streamed.success, streamed.failed) != legacy:
+        raise AssertionError(f"❌ Streaming summary mismatch:\n   legacy: {legacy}\n   stream: {streamed.failed}")
+    print(f"✅ Identical summary: success={summary[0]} failed={summary[1]}")
+
+    print(f"\n⏱️  Best of {args.repeat} runs on {args.rows:,} rows:")
+    print(f"   legacy checks : {t_legacy:7.2f}s ({args.rows / t_legacy:12,.0f} rows/s)")
+    print(f"   compiled plan : {t_plan:7.2f}s ({args.rows / t_plan:12,.0f} rows/s) | speedup {t_legacy / t_plan:.2f}x")
+    print(f"   streamed      : {t_stream:7.2f}s ({args.rows / t_stream:12,.0f} rows/s) | "
+          f"{args.chunk_rows:,}-row chunks, {args.workers} worker(s)")
+    print(f"   bitmap        : {len(result.checks)} checks, {result.bitmap.nbytes / 1e6:.1f} MB "
+          f"({result.bitmap.shape[1]} bytes/row), {int(result.invalid_rows().sum()):,} rows with violations")
+    print(f"   peak RSS      : {format_mb(peak_rss_mb())}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Benchmark compiled vs. legacy Telco data validation")
+    p.add_argument("--input", type=str, default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv")
+    p.add_argument("--rows", type=int, default=10_000_000)
+    p.add_argument("--corrupt", type=float, default=0.001, help="fraction of rows corrupted per injected fault")
+    p.add_argument("--typed", action="store_true", help="use category dtypes (as load_data(typed=True) does)")
+    p.add_argument("--chunk_rows", type=int, default=500_000, help="chunk size for the streaming validator")
+    p.add_argument("--workers", type=int, default=1, help="processes for the streaming validator")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--file_rows", type=int, default=2000,
+                   help="rows of the CSVs for the malformed-numeric file parity check (0 = skip)")
+    p.add_argument("--seed", type=int, default=42)
+
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Write a synthetic Telco churn dataset of any size (CSV or Parquet).
+
+Example:
+    python Scripts/generate_synthetic_data.py --rows 10000000 --output data/synthetic/telco_10m.parquet
+"""
+
+import os
+import sys
+import argparse
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.synthetic import write_telco
+
+
+def main(args):
+    write_telco(args.output, args.rows, seed=args.seed, chunk_rows=args.chunk_rows, file_format=args.format)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Generate synthetic Telco customers with the Kaggle schema")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--output", type=str, default="data/synthetic/telco_synthetic.csv",
+                   help="output path; .csv or .parquet selects the format")
+    p.add_argument("--format", type=str, default=None, choices=["csv", "parquet"],
+                   help="override the format implied by the extension")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--chunk_rows", type=int, default=1_000_000, help="rows generated and written per chunk")
+
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Async load generator for the prediction API.
+
+Drives `/predict/single` and `/predict/batch` with synthetic Telco records
+(`src.data.synthetic`) and reports latency percentiles, throughput and error
+rates as JSON. Targets:
+
+    (default)        the app in-process via httpx's ASGI transport (client and
+                     server share one event loop: good for relative comparisons)
+    --url URL        an already running server, e.g. http://127.0.0.1:8000
+    --serve          a local uvicorn started (and stopped) by this script
+
+Load models:
+
+    closed loop      `--concurrency` clients each send back-to-back requests
+    --rate R         open loop: R requests/s (fixed spacing, or `--poisson`),
+                     at most `--concurrency` in flight. Latency is measured
+                     from each request's scheduled start, so a saturated
+                     server shows up as queueing delay instead of being hidden.
+
+Example:
+    python Scripts/load_test.py --serve --mix single=0.9,batch=0.1 --rate 200 --duration 30
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+import platform
+import contextlib
+import subprocess
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# === Fix import path for local modules ===
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+import httpx
+
+from src.data.synthetic import generate_telco
+
+ENDPOINTS = {"single": "/predict/single", "batch": "/predict/batch"}
+
+# (endpoint, scheduled start offset s, latency s, HTTP status or None on a transport error, rows)
+Sample = Tuple[str, float, float, Optional[int], int]
+
+
+def build_payloads(n_records: int, seed: int) -> List[Dict[str, Any]]:
+    """Raw Telco records as the API receives them (no target column)."""
+    df = generate_telco(n_records, seed=seed).drop(columns=["Churn"]).astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' in --mix (expected one of {list(ENDPOINTS)})")
+        weights[name] = float(weight or 1.0)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("--mix weights must sum to a positive number")
+    return {k: v / total for k, v in weights.items()}
+
+
+class LoadGenerator:
+    """Issues requests until the deadline and collects one `Sample` per request."""
+
+    def __init__(self, client: httpx.AsyncClient, payloads: List[Dict[str, Any]], args):
+        self.client = client
+        self.payloads = payloads
+        self.args = args
+        self.mix = parse_mix(args.mix)
+        self.rng = random.Random(args.seed)
+        self.samples: List[Sample] = []
+        self.t0 = 0.0
+
+    def _next_request(self) -> Tuple[str, Dict[str, Any], int]:
+        endpoint = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if endpoint == "single":
+            return endpoint, {"data": self.rng.choice(self.payloads)}, 1
+        start = self.rng.randrange(max(1, len(self.payloads) - self.args.batch_size + 1))
+        rows = self.payloads[start:start + self.args.batch_size]
+        return endpoint, {"data": rows}, len(rows)
+
+    async def _send(self, scheduled: float) -> None:
+        endpoint, body, rows = self._next_request()
+        try:
+            response = await self.client.post(ENDPOINTS[endpoint], json=body)
+            await response.aread()
+            status: Optional[int] = response.status_code
+        except httpx.HTTPError:
+            status = None
+        end = time.perf_counter()
+        self.samples.append((endpoint, scheduled - self.t0, end - scheduled, status, rows))
+
+    async def run(self) -> float:
+        """Run for warmup + duration seconds; returns the measured wall time."""
+        self.t0 = time.perf_counter()
+        deadline = self.t0 + self.args.warmup + self.args.duration
+        if self.args.rate > 0:
+            await self._open_loop(deadline)
+        else:
+            await asyncio.gather(*(self._closed_loop(deadline) for _ in range(self.args.concurrency)))
+        return time.perf_counter() - self.t0 - self.args.warmup
+
+    async def _closed_loop(self, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            await self._send(time.perf_counter())
+
+    async def _open_loop(self, deadline: float) -> None:
+        limit = asyncio.Semaphore(self.args.concurrency)
+        tasks = set()
+        scheduled = self.t0
+
+        async def fire(at: float) -> None:
+            async with limit:
+                await self._send(at)
+
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(fire(scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            gap = self.rng.expovariate(self.args.rate) if self.args.poisson else 1.0 / self.args.rate
+            scheduled += gap
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+def summarize(samples: List[Sample], wall_s: float) -> Dict[str, Any]:
+    """Latency percentiles (ms), throughput and error rate of a set of samples."""
+    if not samples:
+        return {"requests": 0}
+    latency_ms = np.array([s[2] for s in samples]) * 1000
+    statuses = Counter("error" if s[3] is None else str(s[3]) for s in samples)
+    errors = sum(n for code, n in statuses.items() if code == "error" or not code.startswith("2"))
+    rows = sum(s[4] for s in samples)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples),
+        "status_codes": dict(statuses),
+        "throughput_rps": len(samples) / wall_s,
+        "rows_per_s": rows / wall_s,
+        "latency_ms": {
+            "mean": float(latency_ms.mean()),
+            "p50": float(np.percentile(latency_ms, 50)),
+            "p95": float(np.percentile(latency_ms, 95)),
+            "p99": float(np.percentile(latency_ms, 99)),
+            "max": float(latency_ms.max()),
+        },
+    }
+
+
+@contextlib.asynccontextmanager
+async def open_client(args):
+    """An httpx client for the chosen target (in-process app, --url or --serve)."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url or args.serve:
+        url = args.url or f"http://127.0.0.1:{args.port}"
+        server = _start_uvicorn(args) if args.serve else None
+        try:
+            async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+                if server is not None:
+                    await _wait_healthy(client, server)
+                yield client, url
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+        return
+
+    # In-process: import lazily so --url runs need no model artifacts locally
+    from src.api.app import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://in-process", timeout=args.timeout) as client:
+            yield client, "in-process"
+
+
+def _start_uvicorn(args) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "uvicorn", "src.api.app:app", "--host", "127.0.0.1",
+           "--port", str(args.port), "--log-level", "warning", "--workers", str(args.server_workers)]
+    print(f"🚀 Starting: {' '.join(cmd)}")
+    return subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+
+
+async def _wait_healthy(client: httpx.AsyncClient, server: subprocess.Popen, timeout_s: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"❌ uvicorn exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.25)
+    raise TimeoutError("❌ uvicorn did not become healthy in time")
+
+
+async def main_async(args) -> Dict[str, Any]:
+    payloads = build_payloads(args.payload_records, args.seed)
+    async with open_client(args) as (client, target):
+        mode = f"open loop {args.rate:g} req/s" if args.rate > 0 else "closed loop"
+        print(f"🔥 Load test: {target} | mix {args.mix} | {mode} | concurrency {args.concurrency} | "
+              f"{args.duration:g}s (+{args.warmup:g}s warmup)")
+        generator = LoadGenerator(client, payloads, args)
+        wall_s = await generator.run()
+
+    measured = [s for s in generator.samples if s[1] >= args.warmup]
+    report = {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "target": target,
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpu_count": os.cpu_count()},
+        "duration_s": wall_s,
+        "overall": summarize(measured, wall_s),
+        "endpoints": {
+            name: summarize([s for s in measured if s[0] == name], wall_s)
+            for name in ENDPOINTS if any(s[0] == name for s in measured)
+        },
+    }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n⏱️  {report['duration_s']:.1f}s measured against {report['target']}:")
+    for name, r in [("overall", report["overall"]), *report["endpoints"].items()]:
+        if not r["requests"]:
+            print(f"   {name:<8} no requests")
+            continue
+        lat = r["latency_ms"]
+        print(f"   {name:<8} {r['requests']:>7,} req | {r['throughput_rps']:8.1f} req/s {r['rows_per_s']:10,.0f} rows/s | "
+              f"p50 {lat['p50']:7.2f} p95 {lat['p95']:7.2f} p99 {lat['p99']:7.2f} ms | errors {r['error_rate']:.2%}")
+
+
+def main(args):
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Load-test /predict/single and /predict/batch")
+    p.add_argument("--url", type=str, default=None, help="base URL of a running server (default: in-process app)")
+    p.add_argument("--serve", action="store_true", help="start a local uvicorn for the run")
+    p.add_argument("--port", type=int, default=8765, help="port for --serve")
+    p.add_argument("--server_workers", type=int, default=1, help="uvicorn workers for --serve")
+    p.add_argument("--mix", type=str, default="single=1", help="endpoint weights, e.g. single=0.9,batch=0.1")
+    p.add_argument("--batch_size", type=int, default=100, help="records per /predict/batch request")
+    p.add_argument("--concurrency", type=int, default=32, help="clients (closed loop) / max in flight (open loop)")
+    p.add_argument("--rate", type=float, default=0.0, help="target requests/s (open loop); 0 = closed loop")
+    p.add_argument("--poisson", action="store_true", help="exponential inter-arrival times for --rate")
+    p.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    p.add_argument("--warmup", type=float, default=1.0, help="seconds excluded from the results")
+    p.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    p.add_argument("--payload_records", type=int, default=2000, help="distinct synthetic records to draw from")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--output", type=str,
+                   default=os.path.join(PROJECT_ROOT, "artifacts", "benchmarks", "load_test.json"))
+
+    args = p.parse_args()
+    main(args)
@@ -6,15 +6,14 @@ Runs sequentially: load → validate → preprocess → feature engineering
 import os
 import sys
 import time
+import shutil
 import argparse
 import pandas as pd
 import mlflow
 import mlflow.sklearn
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import (
-    classification_report, precision_score, recall_score,
-    f1_score, roc_auc_score
-)
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, cross_val_predict, train_test_split
+from sklearn.metrics import classification_report
 from xgboost import XGBClassifier
 
 # === Fix import path for local modules ===
@@ -24,8 +23,28 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # Local modules - Core pipeline components
 from src.data.validate_data import validate_telco_data  # Data quality validation
 from src.data.load_data import load_data                    # Data loading with error handling
-from src.data.preprocess import preprocess_data            # Basic data cleaning
+from src.data.preprocess import preprocess_data, compact_dtypes  # Basic data cleaning (+ compact dtypes)
 from src.data.feature_engineering import build_features     # Feature engineering (CRITICAL for model performance)
+from src.data.feature_engineering import FeatureTransformer # Fitted encoder shipped to serving
+from src.data.predict.bundle import write_bundle            # Versioned serving bundle
+from src.utils.stage_cache import StageCache, file_digest   # Content-addressed stage outputs
+from src.utils.profiling import StageProfiler, stage_memory # Per-stage wall / CPU time and memory
+from src.models.incremental import (                        # Warm start from the previous model
+    check_feature_compatibility, exclude_customers, load_previous_model, rebuild_verdict
+)
+from src.models.evaluate import (                           # One-sort threshold sweep + bootstrap CIs
+    THRESHOLD_OBJECTIVES, classification_metrics, evaluate_scores
+)
+
+# Cacheable pipeline stages, in order (see --force / --from_stage)
+PIPELINE_STAGES = ["load", "validate", "preprocess", "features"]
+
+# Default cost of a missed churner relative to a false alarm (fp_cost 1): losing a customer
+# costs more than a retention offer to one who would have stayed, so the picked cut favours recall
+FN_COST = 3.0
+
+# Rows of the threshold sweep logged as an artifact (evenly subsampled above this)
+SWEEP_ARTIFACT_ROWS = 5000
 
 def main(args):
     """
@@ -45,23 +64,64 @@ def main(args):
     mlflow.set_tracking_uri(mlruns_path)
     mlflow.set_experiment(args.experiment)  # Creates experiment if doesn't exist
 
+    # Wall time, CPU time and peak memory of every stage below (optionally cProfile dumps)
+    profiler = StageProfiler(trace_malloc=args.trace_malloc, cprofile_dir=args.cprofile_dir)
+
     # Start MLflow run - all subsequent logging will be tracked under this run
-    with mlflow.start_run():
+    with mlflow.start_run(), profiler:
         # === Log hyperparameters and configuration ===
         # REQUIRED: These parameters are essential for model reproducibility
         mlflow.log_param("model", "xgboost")           # Model type for comparison
-        mlflow.log_param("threshold", args.threshold)   # Classification threshold (default: 0.35)
+        mlflow.log_param("threshold", "auto" if args.threshold is None else args.threshold)  # Fixed cut or picked from the sweep
+        mlflow.log_param("threshold_objective", args.threshold_objective)  # f1 or cost (fn_cost / fp_cost)
+        mlflow.log_param("min_recall", args.min_recall)
+        mlflow.log_param("fn_cost", args.fn_cost)
+        mlflow.log_param("fp_cost", args.fp_cost)
         mlflow.log_param("test_size", args.test_size)   # Train/test split ratio
+        mlflow.log_param("threshold_folds", args.threshold_folds)  # Out-of-fold threshold selection
+        mlflow.log_param("typed_load", args.typed)      # Schema-typed (category / narrow int) loading
+        mlflow.log_param("compact", args.compact)       # Compact dtypes + in-place preprocessing / features
+        mlflow.log_param("trace_malloc", args.trace_malloc)  # tracemalloc overhead inflates stage timings
+        mlflow.log_param("incremental", args.incremental)     # Warm start from artifacts/model
+        mlflow.log_param("full_input", args.full_input)       # History for the --incremental full-rebuild comparison
+
+        # === Stage cache: skip stages whose input data, code and config are unchanged ===
+        # Keys chain (raw file hash -> load -> preprocess -> features), so a stage's
+        # key is known before anything runs and unchanged upstream work is never redone
+        if not os.path.exists(args.input):
+            raise FileNotFoundError(f"❌ File not found: {args.input}")
+        stage_cache = StageCache(
+            os.path.join(project_root, "data", "cache", "stages"),
+            stages=PIPELINE_STAGES,
+            force=args.force,
+            from_stage=args.from_stage,
+            enabled=not args.no_cache,
+        )
+        target = args.target
+        load_key = stage_cache.key("load", [file_digest(args.input)], [load_data], {"typed": args.typed})
+        validate_key = stage_cache.key("validate", [load_key], [validate_telco_data])
+        preprocess_key = stage_cache.key("preprocess", [load_key], [preprocess_data], {"compact": args.compact})
+        features_key = stage_cache.key("features", [preprocess_key], [build_features],
+                                       {"target": target, "compact": args.compact})
+
+        # Raw data is only read (from cache or CSV) if a stage that needs it misses
+        raw = {}
+        def load_raw():
+            if "df" not in raw:
+                with profiler.stage("load"):
+                    raw["df"] = stage_cache.frame("load", load_key, lambda: load_data(args.input, typed=args.typed))
+                print(f"✅ Data loaded: {raw['df'].shape[0]} rows, {raw['df'].shape[1]} columns")
+                mlflow.log_metrics(stage_memory("load", raw["df"]))
+            return raw["df"]
 
         # === STAGE 1: Data Loading & Validation ===
         print("🔄 Loading data...")
-        df = load_data(args.input)  # Load raw CSV data with error handling
-        print(f"✅ Data loaded: {df.shape[0]} rows, {df.shape[1]} columns")
 
         # === CRITICAL: Data Quality Validation ===
         # This step is ESSENTIAL for production ML - validates data quality before training
         print("🔍 Validating data quality with Great Expectations...")
-        is_valid, failed = validate_telco_data(df)
+        with profiler.stage("validate"):
+            is_valid, failed = stage_cache.record("validate", validate_key, lambda: list(validate_telco_data(load_raw())))
         mlflow.log_metric("data_quality_pass", int(is_valid))  # Track data quality over time
 
         if not is_valid:
@@ -74,36 +134,85 @@ def main(args):
 
         # === STAGE 2: Data Preprocessing ===
         print("🔧 Preprocessing data...")
-        df = preprocess_data(df)  # Basic cleaning (handle missing values, fix data types)
+        # Basic cleaning (handle missing values, fix data types)
+        with profiler.stage("preprocess"):
+            df = stage_cache.frame("preprocess", preprocess_key, lambda: preprocess_data(load_raw(), compact=args.compact))
+        raw.clear()  # the raw frame is not needed past this point
+        mlflow.log_metrics(stage_memory("preprocess", df))
 
-        # Save processed dataset for reproducibility and debugging
+        # Save processed dataset for reproducibility and debugging (unchanged data is not rewritten)
         processed_path = os.path.join(project_root, "data", "processed", "telco_churn_processed.csv")
-        os.makedirs(os.path.dirname(processed_path), exist_ok=True)
-        df.to_csv(processed_path, index=False)
-        print(f"✅ Processed dataset saved to {processed_path} | Shape: {df.shape}")
+        if not stage_cache.hit("preprocess") or not os.path.exists(processed_path):
+            with profiler.stage("write_processed"):
+                os.makedirs(os.path.dirname(processed_path), exist_ok=True)
+                df.to_csv(processed_path, index=False)
+            print(f"✅ Processed dataset saved to {processed_path} | Shape: {df.shape}")
 
         # === STAGE 3: Feature Engineering - CRITICAL for Model Performance ===
         print("🛠️  Building features...")
-        target = args.target
         if target not in df.columns:
             raise ValueError(f"Target column '{target}' not found in data")
-        
-        # Apply feature engineering transformations
-        df_enc = build_features(df, target_col=target)  # Binary encoding + one-hot encoding
-        
-        # IMPORTANT: Convert boolean columns to integers for XGBoost compatibility
-        for c in df_enc.select_dtypes(include=["bool"]).columns:
-            df_enc[c] = df_enc[c].astype(int)
+
+        artifacts_dir = os.path.join(project_root, "artifacts")
+
+        # === Incremental mode: encode with the previous model's fitted transformer ===
+        # (read before this run overwrites preprocessing.pkl / artifacts/model), so the
+        # feature layout is exactly the one its trees were grown on
+        previous_model = None
+        if args.incremental:
+            previous_model, previous_preprocessing = load_previous_model(artifacts_dir)
+            transformer = previous_preprocessing["transformer"]
+            check_feature_compatibility(transformer, df)
+            print(f"🔁 Incremental: continuing the previous {previous_model.get_booster().num_boosted_rounds()}-tree "
+                  f"model on {len(df)} rows")
+        else:
+            # Learn category vocabularies once; serving reuses this fitted transformer
+            # (fitted before build_features, which encodes the frame in place in compact mode)
+            with profiler.stage("fit_transformer"):
+                transformer = FeatureTransformer(target_col=target).fit(df)
+
+        def compute_features():
+            # Apply feature engineering transformations
+            df_enc = build_features(df, target_col=target, copy=not args.compact, compact=args.compact)  # Binary encoding + one-hot encoding
+
+            # IMPORTANT: Convert boolean columns to integers for XGBoost compatibility
+            for c in df_enc.select_dtypes(include=["bool"]).columns:
+                df_enc[c] = df_enc[c].astype("int8" if args.compact else int)
+            if args.compact:
+                compact_dtypes(df_enc)
+            return df_enc
+
+        with profiler.stage("features"):
+            if args.incremental:
+                df_enc = transformer.transform(df)
+                df_enc[target] = df[target].to_numpy()
+            else:
+                df_enc = stage_cache.frame("features", features_key, compute_features)
+        # Only the encoded frame is used from here on (incremental mode keeps the
+        # recent rows to encode them for the full-rebuild comparison model)
+        recent = df if args.incremental else None
+        del df
         print(f"✅ Feature engineering completed: {df_enc.shape[1]} features")
+        mlflow.log_metrics(stage_memory("features", df_enc))
+
+        # Track which stages were reused and how much time that saved
+        for name, value in stage_cache.summary().items():
+            mlflow.log_metric(name, value)
+        mlflow.log_dict(stage_cache.report, "stage_cache.json")
 
         # === CRITICAL: Save Feature Metadata for Serving Consistency ===
         # This ensures serving pipeline uses exact same features in exact same order
         import json, joblib
-        artifacts_dir = os.path.join(project_root, "artifacts")
         os.makedirs(artifacts_dir, exist_ok=True)
 
         # Get feature columns (exclude target)
         feature_cols = list(df_enc.drop(columns=[target]).columns)
+
+        if transformer.feature_columns != feature_cols:
+            raise ValueError(
+                "❌ FeatureTransformer layout does not match build_features output: "
+                f"{transformer.feature_columns} != {feature_cols}"
+            )
         
         # Save locally for development serving
         with open(os.path.join(artifacts_dir, "feature_columns.json"), "w") as f:
@@ -112,28 +221,19 @@ def main(args):
         # Log to MLflow for production serving
         mlflow.log_text("\n".join(feature_cols), artifact_file="feature_columns.txt")
 
-        # ESSENTIAL: Save preprocessing artifacts for serving pipeline
-        # These artifacts ensure training and serving use identical transformations
-        preprocessing_artifact = {
-            "feature_columns": feature_cols,  # Exact feature order
-            "target": target                  # Target column name
-        }
-        joblib.dump(preprocessing_artifact, os.path.join(artifacts_dir, "preprocessing.pkl"))
-        mlflow.log_artifact(os.path.join(artifacts_dir, "preprocessing.pkl"))
-        print(f"✅ Saved {len(feature_cols)} feature columns for serving consistency")
-
         # === STAGE 4: Train/Test Split ===
         print("📊 Splitting data...")
-        X = df_enc.drop(columns=[target])  # Feature matrix
-        y = df_enc[target]                 # Target vector
-        
-        # Stratified split to maintain class distribution in both sets
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, 
-            test_size=args.test_size,    # Default: 20% for testing
-            stratify=y,                  # Maintain class balance
-            random_state=42              # Reproducible splits
-        )
+        with profiler.stage("split"):
+            X = df_enc.drop(columns=[target])  # Feature matrix
+            y = df_enc[target]                 # Target vector
+
+            # Stratified split to maintain class distribution in both sets
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y,
+                test_size=args.test_size,    # Default: 20% for testing
+                stratify=y,                  # Maintain class balance
+                random_state=42              # Reproducible splits
+            )
         print(f"✅ Train: {X_train.shape[0]} samples | Test: {X_test.shape[0]} samples")
 
         # === CRITICAL: Handle Class Imbalance ===
@@ -166,66 +266,225 @@ def main(args):
             scale_pos_weight=scale_pos_weight  # Weight for positive class (churners)
         )
 
+        if args.incremental:
+            # Same hyperparameters as the previous model; `incremental_rounds` new trees on top of its booster
+            full_model = model
+            model = XGBClassifier(**{
+                **previous_model.get_params(),
+                "n_estimators": args.incremental_rounds,
+                "n_jobs": -1,
+                "scale_pos_weight": scale_pos_weight,
+            })
+            mlflow.log_param("incremental_rounds", args.incremental_rounds)
+
         # === Train Model and Track Training Time ===
         t0 = time.time()
-        model.fit(X_train, y_train)
+        with profiler.stage("train"):
+            model.fit(X_train, y_train, xgb_model=previous_model.get_booster() if args.incremental else None)
         train_time = time.time() - t0
         mlflow.log_metric("train_time", train_time)  # Track training performance
         print(f"✅ Model trained in {train_time:.2f} seconds")
 
+        # === Out-of-fold scores for choosing the decision threshold ===
+        # Each training row is scored by a clone fit on the other folds, so the threshold is
+        # picked without touching the test set, and the shipped model still sees every training row
+        oof_proba = None
+        if args.threshold is None and args.threshold_folds > 1:
+            print(f"🔀 Scoring training rows out-of-fold ({args.threshold_folds} folds) for threshold selection...")
+            with profiler.stage("threshold_oof"):
+                oof_proba = cross_val_predict(
+                    clone(model), X_train, y_train,
+                    cv=StratifiedKFold(n_splits=args.threshold_folds, shuffle=True, random_state=42),
+                    method="predict_proba",
+                    params={"xgb_model": previous_model.get_booster()} if args.incremental else None,
+                )[:, 1]
+
         # === STAGE 6: Model Evaluation ===
         print("📊 Evaluating model performance...")
         
         # Generate predictions and track inference time
         t1 = time.time()
-        proba = model.predict_proba(X_test)[:, 1]  # Get probability of churn (class 1)
-        
-        # Apply classification threshold (default: 0.35, optimized for churn detection)
-        # Lower threshold = more sensitive to churn (higher recall, lower precision)
-        y_pred = (proba >= args.threshold).astype(int)
+        with profiler.stage("predict"):
+            proba = model.predict_proba(X_test)[:, 1]  # Get probability of churn (class 1)
         pred_time = time.time() - t1
         mlflow.log_metric("pred_time", pred_time)  # Track inference performance
 
+        # One sort of the scores gives precision / recall / F1 / cost at every threshold;
+        # without --threshold the best one on the out-of-fold scores (per --threshold_objective)
+        # becomes the serving cut, and the test set only reports metrics / CIs at it
+        with profiler.stage("evaluate"):
+            evaluation = evaluate_scores(
+                y_test, proba,
+                threshold=args.threshold,
+                objective=args.threshold_objective,
+                min_recall=args.min_recall,
+                fn_cost=args.fn_cost,
+                fp_cost=args.fp_cost,
+                n_boot=args.n_bootstrap,
+                y_select=None if oof_proba is None else y_train,
+                proba_select=oof_proba,
+            )
+        selected_on = None
+        if evaluation["selected"]:
+            selected_on = "out_of_fold" if oof_proba is not None else "test"
+            if oof_proba is None:
+                print("⚠️  Warning: --threshold_folds 0 selects the threshold on the test set; its metrics are optimistic")
+        threshold = evaluation["threshold"]
+        metrics = {k: float(v) for k, v in evaluation["metrics"].items()}
+        y_pred = (proba >= threshold).astype(int)
+
         # === CRITICAL: Log Evaluation Metrics to MLflow ===
         # These metrics are essential for model comparison and monitoring
-        precision = precision_score(y_test, y_pred)    # Of predicted churners, how many actually churned?
-        recall = recall_score(y_test, y_pred)          # Of actual churners, how many did we catch?
-        f1 = f1_score(y_test, y_pred)                  # Harmonic mean of precision and recall
-        roc_auc = roc_auc_score(y_test, proba)         # Area under ROC curve (threshold-independent)
-        
-        # Log all metrics for experiment tracking
-        mlflow.log_metric("precision", precision)
-        mlflow.log_metric("recall", recall) 
-        mlflow.log_metric("f1", f1)
-        mlflow.log_metric("roc_auc", roc_auc)
-        
-        print(f"🎯 Model Performance:")
-        print(f"   Precision: {precision:.3f} | Recall: {recall:.3f}")
-        print(f"   F1 Score: {f1:.3f} | ROC AUC: {roc_auc:.3f}")
+        mlflow.log_metric("decision_threshold", threshold)
+        mlflow.log_metrics(metrics)
+        for k, (low, high) in evaluation["ci"].items():
+            mlflow.log_metrics({f"{k}_ci_low": low, f"{k}_ci_high": high})
+        sweeps = {"threshold_sweep.csv": evaluation["sweep"]}
+        if selected_on == "out_of_fold":
+            sweeps["threshold_sweep_oof.csv"] = evaluation["selection_sweep"]
+            oof_metrics = classification_metrics(y_train, oof_proba, threshold)
+            mlflow.log_metrics({f"oof_{k}": float(v) for k, v in oof_metrics.items()})
+        for name, sweep in sweeps.items():
+            if len(sweep) > SWEEP_ARTIFACT_ROWS:
+                sweep = sweep.iloc[::-(-len(sweep) // SWEEP_ARTIFACT_ROWS)]
+            mlflow.log_text(sweep.to_csv(index=False), artifact_file=name)
+
+        print(f"🎯 Test-set performance (threshold {threshold:.4f}, "
+              + (f"{args.threshold_objective}-optimal on {selected_on}" if selected_on else "fixed") + "):")
+        for k, v in metrics.items():
+            low_high = evaluation["ci"].get(k)
+            print(f"   {k:<10} {v:.3f}" + (f"  [{low_high[0]:.3f}, {low_high[1]:.3f}]" if low_high else ""))
+
+        # ESSENTIAL: Save preprocessing artifacts for serving pipeline
+        # These artifacts ensure training and serving use identical transformations
+        preprocessing_artifact = {
+            "feature_columns": feature_cols,  # Exact feature order
+            "target": target,                 # Target column name
+            "transformer": transformer,       # Fitted raw-record → feature encoder
+            "threshold": threshold            # Decision threshold for the legacy serving path
+        }
+        with profiler.stage("save_preprocessing"):
+            joblib.dump(preprocessing_artifact, os.path.join(artifacts_dir, "preprocessing.pkl"))
+            mlflow.log_artifact(os.path.join(artifacts_dir, "preprocessing.pkl"))
+        print(f"✅ Saved {len(feature_cols)} feature columns for serving consistency")
+
+        # === Incremental mode: compare with the untouched previous model and a full retrain ===
+        if args.incremental:
+            mlflow.log_metric("total_trees", model.get_booster().num_boosted_rounds())
+
+            # How the previous model does on the new test set (drift signal, no training needed)
+            previous_metrics = classification_metrics(y_test, previous_model.predict_proba(X_test)[:, 1], threshold)
+            mlflow.log_metrics({f"previous_{k}": v for k, v in previous_metrics.items()})
+
+            if not args.no_compare_full and not args.full_input:
+                print("ℹ️  Pass --full_input <history CSV> to compare with a full rebuild")
+            elif not args.no_compare_full:
+                # Full rebuild = fresh transformer + model on history and the recent training rows,
+                # scored on the same recent test rows (recent customers' history rows are dropped,
+                # so no test customer is trained on)
+                print(f"🏗️  Full rebuild for comparison: {args.full_input} + {len(X_train)} recent training rows...")
+                with profiler.stage("full_data"):
+                    history = load_data(args.full_input, typed=args.typed)
+                    history_valid, history_failed = validate_telco_data(history)
+                    if not history_valid:
+                        raise ValueError(f"❌ Data quality check failed for --full_input. Issues: {history_failed}")
+                    recent_ids = pd.read_csv(args.input, usecols=lambda c: c == "customerID").get("customerID", [])
+                    history = preprocess_data(exclude_customers(history, recent_ids), compact=args.compact)
+                    full_df = pd.concat([history, recent.loc[X_train.index]], ignore_index=True)
+                    del history
+                    full_transformer = FeatureTransformer(target_col=target).fit(full_df)
+                    X_full, y_full = full_transformer.transform(full_df), full_df[target].to_numpy()
+                    del full_df
+                full_model.set_params(scale_pos_weight=(y_full == 0).sum() / (y_full == 1).sum())
+                t2 = time.time()
+                with profiler.stage("train_full"):
+                    full_model.fit(X_full, y_full)
+                full_train_time = time.time() - t2
+                full_proba = full_model.predict_proba(full_transformer.transform(recent.loc[X_test.index]))[:, 1]
+                full_metrics = classification_metrics(y_test, full_proba, threshold)
+                rebuild, deltas = rebuild_verdict(metrics, full_metrics, args.rebuild_tolerance)
+
+                mlflow.log_metric("full_train_time", full_train_time)
+                mlflow.log_metric("full_train_rows", len(y_full))
+                mlflow.log_metrics({f"full_{k}": v for k, v in full_metrics.items()})
+                mlflow.log_metrics({f"incremental_minus_full_{k}": v for k, v in deltas.items()})
+                mlflow.log_metric("full_rebuild_recommended", int(rebuild))
+
+                print(f"   {'':<10} {'previous':>9} {'incremental':>12} {'full':>9}")
+                for k in metrics:
+                    print(f"   {k:<10} {previous_metrics[k]:9.3f} {metrics[k]:12.3f} {full_metrics[k]:9.3f}")
+                print(f"   train: incremental {train_time:.2f}s on {len(X_train)} rows | "
+                      f"full {full_train_time:.2f}s on {len(y_full)} rows | test: {len(X_test)} recent rows")
+                if rebuild:
+                    print(f"⚠️  Incremental model trails the full retrain by more than {args.rebuild_tolerance} "
+                          "on recall / F1 / ROC AUC: a full rebuild is recommended")
+                else:
+                    print("✅ Incremental model is within tolerance of a full retrain")
 
         # === STAGE 7: Model Serialization and Logging ===
         print("💾 Saving model to MLflow...")
         # ESSENTIAL: Log model in MLflow's standard format for serving
-        mlflow.sklearn.log_model(
-            model, 
-            artifact_path="model"  # This creates a 'model/' folder in MLflow run artifacts
-        )
+        with profiler.stage("log_model"):
+            mlflow.sklearn.log_model(
+                model,
+                artifact_path="model"  # This creates a 'model/' folder in MLflow run artifacts
+            )
         print("✅ Model saved to MLflow for serving pipeline")
 
         # Also save a local copy under repo `artifacts/model` for the simple serving flow
+        # (saved next to it and swapped in: save_model refuses to overwrite, and
+        # --incremental continues from whatever this directory holds)
         try:
             local_model_dir = os.path.join(artifacts_dir, "model")
-            os.makedirs(local_model_dir, exist_ok=True)
-            mlflow.sklearn.save_model(model, local_model_dir)
+            staging_dir = f"{local_model_dir}.staging"
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            with profiler.stage("save_local_model"):
+                mlflow.sklearn.save_model(model, staging_dir)
+                shutil.rmtree(local_model_dir, ignore_errors=True)
+                os.replace(staging_dir, local_model_dir)
             print(f"✅ Local model saved to {local_model_dir}")
         except Exception as e:
             print(f"⚠️  Warning: failed to save local model to {local_model_dir}: {e}")
 
+        # ESSENTIAL: Self-contained serving bundle (native booster + feature spec + manifest)
+        # The API loads this with xgboost + numpy only, no MLflow
+        with profiler.stage("bundle"):
+            bundle_dir = write_bundle(
+                os.path.join(artifacts_dir, "bundles"),
+                model.get_booster(),
+                transformer,
+                threshold=threshold,
+                extra={
+                    "metrics": metrics,
+                    "metrics_ci": {k: list(v) for k, v in evaluation["ci"].items()},
+                    "threshold_selection": {
+                        "objective": args.threshold_objective if evaluation["selected"] else "fixed",
+                        "selected_on": selected_on,
+                        "threshold_folds": args.threshold_folds if selected_on == "out_of_fold" else 0,
+                        "min_recall": args.min_recall,
+                        "fn_cost": args.fn_cost,
+                        "fp_cost": args.fp_cost,
+                    },
+                    "trees": model.get_booster().num_boosted_rounds(),
+                    "incremental": args.incremental,
+                },
+            )
+            mlflow.log_artifacts(bundle_dir, artifact_path="serving_bundle")
+        print(f"✅ Serving bundle written to {bundle_dir}")
+
         # === Final Performance Summary ===
         print(f"\n⏱️  Performance Summary:")
         print(f"   Training time: {train_time:.2f}s")
         print(f"   Inference time: {pred_time:.4f}s")
         print(f"   Samples per second: {len(X_test)/pred_time:.0f}")
+
+        # === Stage profile: MLflow metrics + table artifact (+ cProfile dumps) ===
+        profiler.print_report()
+        mlflow.log_metrics(profiler.metrics())
+        mlflow.log_text(profiler.table().to_csv(index=False), artifact_file="stage_profile.csv")
+        if args.cprofile_dir:
+            mlflow.log_artifacts(args.cprofile_dir, artifact_path="cprofile")
+            print(f"🔬 cProfile dumps in {args.cprofile_dir} (inspect with `python -m pstats <stage>.prof`)")
         
         print(f"\n📈 Detailed Classification Report:")
         print(classification_report(y_test, y_pred, digits=3))
@@ -236,8 +495,46 @@ if __name__ == "__main__":
     p.add_argument("--input", type=str, default="data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv",
                    help="path to CSV (e.g., data/raw/Telco-Customer-Churn.csv)")
     p.add_argument("--target", type=str, default="Churn")
-    p.add_argument("--threshold", type=float, default=0.35)
+    p.add_argument("--threshold", type=float, default=None,
+                   help="fixed decision threshold (default: pick the best one from the threshold sweep)")
+    p.add_argument("--threshold_objective", type=str, default="cost", choices=THRESHOLD_OBJECTIVES,
+                   help="what the picked threshold optimizes: F1, or cost = fn_cost * FN + fp_cost * FP")
+    p.add_argument("--min_recall", type=float, default=None,
+                   help="only pick thresholds that catch at least this share of churners")
+    p.add_argument("--fn_cost", type=float, default=FN_COST,
+                   help="cost of a missed churner (cost objective; above --fp_cost = recall-oriented)")
+    p.add_argument("--fp_cost", type=float, default=1.0, help="cost of a false alarm (cost objective)")
+    p.add_argument("--threshold_folds", type=int, default=5,
+                   help="cross-validation folds scoring the training rows to pick the threshold on "
+                        "(without --threshold; 0 = pick it on the test set)")
+    p.add_argument("--n_bootstrap", type=int, default=1000,
+                   help="bootstrap resamples for metric confidence intervals (0 = skip)")
     p.add_argument("--test_size", type=float, default=0.2)
+    p.add_argument("--force", action="store_true",
+                   help="recompute every pipeline stage, ignoring the stage cache")
+    p.add_argument("--from_stage", "--from-stage", type=str, default=None, choices=PIPELINE_STAGES,
+                   help="recompute this stage and all later ones (earlier stages may come from cache)")
+    p.add_argument("--no_cache", action="store_true",
+                   help="neither read nor write the stage cache")
+    p.add_argument("--typed", action="store_true",
+                   help="load the CSV with the declared Telco schema (category / narrow dtypes, pyarrow reader)")
+    p.add_argument("--compact", action="store_true",
+                   help="shrink dtypes (category / int8 / lossless float32) and skip frame copies between stages")
+    p.add_argument("--incremental", action="store_true",
+                   help="continue boosting the previous artifacts/model on --input (e.g. recent customers)")
+    p.add_argument("--incremental_rounds", type=int, default=50,
+                   help="trees added on top of the previous model in --incremental mode")
+    p.add_argument("--full_input", type=str, default=None,
+                   help="in --incremental mode, history CSV (e.g. the previous training data) for the "
+                        "comparison full rebuild; it is trained on this plus --input's training rows")
+    p.add_argument("--no_compare_full", action="store_true",
+                   help="in --incremental mode, skip the comparison full rebuild")
+    p.add_argument("--rebuild_tolerance", type=float, default=0.01,
+                   help="recommend a full rebuild when incremental recall / F1 / ROC AUC trail the full retrain by more")
+    p.add_argument("--trace_malloc", action="store_true",
+                   help="also record per-stage peak Python allocations with tracemalloc (slower)")
+    p.add_argument("--cprofile_dir", type=str, default=None,
+                   help="write a cProfile dump + top-functions listing per stage to this directory")
     p.add_argument("--experiment", type=str, default="Telco Churn")
     p.add_argument("--mlflow_uri", type=str, default=None,
                     help="override MLflow tracking URI, else uses project_root/mlruns")
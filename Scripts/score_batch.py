@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Bulk-score a CSV / Parquet customer extract into a Parquet dataset directory.
+
+Chunks are scored in parallel processes (model loaded once per process) and
+written as they finish; re-running the same command after a crash resumes
+from the chunks already on disk.
+
+Example:
+    python Scripts/score_batch.py --input data/synthetic/telco_10m.parquet --output data/scores/nightly --workers 4
+"""
+
+import os
+import sys
+import argparse
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.predict.bulk import score_file
+
+
+def main(args):
+    score_file(
+        args.input,
+        args.output,
+        chunk_rows=args.chunk_rows,
+        n_workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        model_version=args.model_version,
+        id_col=args.id_col or None,
+        overwrite=args.overwrite,
+    )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Chunked, parallel, resumable bulk scoring to Parquet")
+    p.add_argument("--input", type=str, required=True, help="raw customer records (.csv or .parquet)")
+    p.add_argument("--output", type=str, required=True, help="output dataset directory (part-*.parquet)")
+    p.add_argument("--chunk_rows", type=int, default=250_000, help="rows per chunk / part file")
+    p.add_argument("--workers", type=int, default=None, help="scoring processes (default: CPU count)")
+    p.add_argument("--threads_per_worker", type=int, default=None,
+                   help="XGBoost threads per process (default: CPU count / workers)")
+    p.add_argument("--model_version", type=str, default=None, help="bundle version (default: LATEST)")
+    p.add_argument("--id_col", type=str, default="customerID", help="column copied next to the scores ('' for none)")
+    p.add_argument("--overwrite", action="store_true", help="discard existing parts instead of resuming")
+
+    args = p.parse_args()
+    main(args)
@@ -1,7 +1,12 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ValidationError
+from typing import Optional
+import asyncio
+import json
 import pandas as pd
 import os
 import sys
@@ -11,11 +16,70 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.data.predict.predict import predict_single, predict_batch
+from src.data.predict.predict import predict_single, predict_batch, predict_records, predict_table, registry, cache
+from src.api.batching import MicroBatcher
+from src.api.scoring import ScoringPoolBusy, pool_from_env
+from src.api.columnar import (
+    ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE, detect_columnar_format, read_table, table_to_ipc, wants_arrow
+)
+from src.api.streaming import STREAM_MEDIA_TYPES, DuplexStreamingResponse, detect_format, stream_predictions
+from src.api.metrics import MetricsMiddleware
+from src.utils.telemetry import PROMETHEUS_CONTENT_TYPE, labelled, telemetry
+
+# ---------------------------
+# Scoring pool: dedicated threads for CPU-bound work
+# (SCORING_THREADS, SCORING_MAX_INFLIGHT, SCORING_QUEUE_TIMEOUT_S)
+# ---------------------------
+scoring_pool = pool_from_env()
+
+# ---------------------------
+# Micro-batching config (env overridable)
+# ---------------------------
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "1").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+
+# Rows parsed + scored per chunk by /predict/stream (bounds its peak memory)
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "5000"))
+STREAM_MAX_CHUNK_ROWS = 100_000
+
+# Model hot-reload: poll artifacts/bundles every N seconds (0 disables); admin token (optional)
+MODEL_WATCH_INTERVAL_S = float(os.getenv("MODEL_WATCH_INTERVAL_S", "30"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Every prediction response names the model version that produced it
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+# Endpoints instrumented for /metrics (each becomes an `endpoint` label)
+PREDICT_ENDPOINTS = ("/predict/single", "/predict/batch", "/predict/stream")
+
+batcher = (
+    MicroBatcher(
+        # The batcher scores outside any request's context, so label its work explicitly
+        labelled("/predict/single", predict_records),
+        max_batch_size=MICROBATCH_MAX_SIZE,
+        max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+        executor=scoring_pool.run,
+    )
+    if MICROBATCH_ENABLED else None
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if batcher is not None:
+        await batcher.start()
+    if MODEL_WATCH_INTERVAL_S > 0:
+        registry.watch(MODEL_WATCH_INTERVAL_S)
+    yield
+    registry.stop()
+    if batcher is not None:
+        await batcher.stop()
+    scoring_pool.shutdown()
+
 # ---------------------------
 # Initialize App
 # ---------------------------
-app = FastAPI(title="Telco Customer Churn Prediction API")
+app = FastAPI(title="Telco Customer Churn Prediction API", lifespan=lifespan)
 
 # ---------------------------
 # Enable CORS (frontend / Gradio / dashboards)
@@ -28,6 +92,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------------------
+# Per-endpoint latency / throughput metrics (Prometheus text on /metrics)
+# ---------------------------
+app.add_middleware(MetricsMiddleware, telemetry=telemetry, paths=PREDICT_ENDPOINTS)
+
+telemetry.add_callback("scoring_inflight", "Tasks running on the scoring pool.", "gauge",
+                       lambda: scoring_pool.inflight)
+telemetry.add_callback("scoring_waiting", "Requests waiting for a scoring-pool slot.", "gauge",
+                       lambda: scoring_pool.waiting)
+telemetry.add_callback("scoring_rejected_total", "Requests rejected with 503 by the scoring pool.", "counter",
+                       lambda: scoring_pool.rejected)
+if batcher is not None:
+    telemetry.add_callback("microbatch_queue_depth", "Single records waiting for a micro-batch.", "gauge",
+                           lambda: batcher.stats()["queue_depth"])
+    telemetry.add_histogram("microbatch_size", "Single records coalesced per micro-batch.", batcher.batch_sizes)
+    telemetry.add_histogram("microbatch_queue_delay_seconds", "Time a single record waits for its micro-batch.",
+                            batcher.queue_delay_s)
+
 # ---------------------------
 # Request Models
 # ---------------------------
@@ -37,26 +119,137 @@ class SinglePredictionRequest(BaseModel):
 class BatchPredictionRequest(BaseModel):
     data: list
 
+def _validate_body(model, body: bytes):
+    """Validate a raw JSON body, reporting errors exactly like FastAPI's own body parsing."""
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
+
+def _json_bytes(content) -> bytes:
+    # Same encoding as JSONResponse.render, but callable off the event loop
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
 # ---------------------------
 # Endpoints
 # ---------------------------
-@app.post("/predict/single")
-def predict_single_endpoint(request: SinglePredictionRequest):
+@app.post(
+    "/predict/single",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": SinglePredictionRequest.model_json_schema()}},
+        }
+    },
+)
+async def predict_single_endpoint(request: Request):
+    body = await request.body()
+    with telemetry.stage("parse"):
+        payload = _validate_body(SinglePredictionRequest, body)
+
     try:
-        return predict_single(request.data)
+        if batcher is not None:
+            result = await batcher.submit(payload.data)
+        else:
+            result = await scoring_pool.run(predict_single, payload.data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    with telemetry.stage("serialization"):
+        return Response(
+            content=_json_bytes(result),
+            media_type="application/json",
+            headers={MODEL_VERSION_HEADER: result["model_version"]},
+        )
+
+
+def _score_batch_records(body: bytes, as_arrow: bool = False):
+    with telemetry.stage("parse"):
+        df = pd.DataFrame(_validate_body(BatchPredictionRequest, body).data)
+    result = predict_batch(df)
+    version = result.attrs["model_version"]
+    with telemetry.stage("serialization"):
+        if as_arrow:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(result, preserve_index=False)
+            return table_to_ipc(table.replace_schema_metadata({"model_version": version})), version
+        return _json_bytes(result.to_dict(orient="records")), version
 
-@app.post("/predict/batch")
-def predict_batch_endpoint(request: BatchPredictionRequest):
+
+def _score_batch_columnar(body: bytes, fmt: str):
+    with telemetry.stage("parse"):
+        table = read_table(body, fmt)
+    table = predict_table(table)
+    with telemetry.stage("serialization"):
+        return table_to_ipc(table), table.schema.metadata[b"model_version"].decode()
+
+
+_batch_request_schema = BatchPredictionRequest.model_json_schema()
+
+@app.post(
+    "/predict/batch",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _batch_request_schema},
+                ARROW_STREAM_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+                PARQUET_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def predict_batch_endpoint(request: Request):
+    """
+    Score a batch posted as JSON (`{"data": [...]}`), an Arrow IPC stream or Parquet.
+
+    Columnar requests, or requests with `Accept: application/vnd.apache.arrow.stream`,
+    get an Arrow IPC stream back; JSON requests otherwise get JSON records.
+    """
+    fmt = detect_columnar_format(request.headers.get("content-type"))
+    as_arrow = fmt is not None or wants_arrow(request.headers.get("accept"))
+    body = await request.body()
+
+    # Parsing, scoring and encoding all run on the scoring pool, off the event loop
     try:
-        df = pd.DataFrame(request.data)
-        result = predict_batch(df)
-        return result.to_dict(orient="records")
+        if fmt is not None:
+            result, version = await scoring_pool.run_limited(_score_batch_columnar, body, fmt)
+        else:
+            result, version = await scoring_pool.run_limited(_score_batch_records, body, as_arrow)
+    except RequestValidationError:
+        raise
+    except ScoringPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    media_type = ARROW_STREAM_MEDIA_TYPE if as_arrow else "application/json"
+    return Response(content=result, media_type=media_type, headers={MODEL_VERSION_HEADER: version})
+
+
+@app.post("/predict/stream")
+async def predict_stream_endpoint(request: Request, chunk_size: int = STREAM_CHUNK_ROWS):
+    """
+    Stream-score an NDJSON (`application/x-ndjson`) or CSV (`text/csv`) body.
+
+    Results are streamed back in the same format as they are produced. The
+    version header names the model active when the stream started.
+    """
+    fmt = detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Unsupported Content-Type; send application/x-ndjson or text/csv",
+        )
+    if not 1 <= chunk_size <= STREAM_MAX_CHUNK_ROWS:
+        raise HTTPException(status_code=400, detail=f"chunk_size must be between 1 and {STREAM_MAX_CHUNK_ROWS}")
+
+    return DuplexStreamingResponse(
+        stream_predictions(request.stream(), fmt, chunk_size, predict_batch, scoring_pool.run_limited),
+        media_type=STREAM_MEDIA_TYPES[fmt],
+        headers={MODEL_VERSION_HEADER: registry.active.version},
+    )
+
 
 @app.get("/")
 def read_root():
@@ -65,14 +258,80 @@ def read_root():
         "usage": {
             "single": "/predict/single",
             "batch": "/predict/batch",
-            "health": "/health"
+            "stream": "/predict/stream",
+            "health": "/health",
+            "metrics": "/metrics",
+            "batching_metrics": "/metrics/batching",
+            "scoring_metrics": "/metrics/scoring",
+            "cache_metrics": "/metrics/cache",
+            "models": "/admin/models"
         }
     }
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics")
+def prometheus_metrics():
+    """Request, stage-latency, batch-size and in-flight metrics in Prometheus text format."""
+    return Response(content=telemetry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/metrics/scoring")
+async def scoring_metrics():
+    return scoring_pool.stats()
+
+@app.get("/metrics/batching")
+def batching_metrics():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+# ---------------------------
+# Model admin (hot reload / rollback)
+# ---------------------------
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
+
+@app.get("/admin/models", dependencies=[Depends(require_admin)])
+async def list_models():
+    return registry.status()
+
+@app.post("/admin/models/reload", status_code=202, dependencies=[Depends(require_admin)])
+async def reload_model(version: Optional[str] = None, wait: bool = False):
+    """
+    Load `version` (default: LATEST bundle) in the background, warm it up and swap it in.
+
+    Returns immediately unless `wait=true`.
+    """
+    try:
+        future = registry.reload(version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if wait:
+        try:
+            model = await asyncio.wrap_future(future)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Model load failed: {e}")
+        return {"active": model.version}
+    return {"loading": version or "latest", "active": registry.active.version}
+
+@app.post("/admin/models/rollback", dependencies=[Depends(require_admin)])
+async def rollback_model(version: Optional[str] = None):
+    """Instantly re-activate a resident version (default: the previously active one)."""
+    try:
+        model = registry.rollback(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    return {"active": model.version}
+
 # ---------------------------
 # Global Error Handler
 # ---------------------------
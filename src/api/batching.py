@@ -0,0 +1,183 @@
+"""
+Adaptive micro-batching for single-record scoring.
+
+Concurrent `/predict/single` calls are coalesced into one matrix and scored
+with a single model call, so the fixed per-call cost of XGBoost prediction
+is paid once per batch instead of once per request.
+
+A batch is dispatched as soon as `max_batch_size` items are queued or
+`max_wait_ms` has passed since its first item arrived. The wait window is
+only applied under load (requests already queued, or the previous batch
+held more than one item); an isolated request is scored immediately, so
+micro-batching adds no latency when traffic is light.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from src.utils.telemetry import Histogram
+
+# Upper bounds of the batch-size (items) and queueing-delay (seconds) histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_DELAY_BUCKETS_S = (0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class MicroBatcher:
+    """
+    asyncio request coalescer in front of a batch scoring function.
+
+    Args:
+        score_fn: Callable taking a list of items and returning one result per item
+            (e.g. `predict_records`). Runs in a worker thread, never on the event loop.
+        max_batch_size: Maximum number of items scored together.
+        max_wait_ms: Maximum time the first item of a batch waits for company.
+        executor: Optional callable `(fn, *args) -> awaitable` used to run `score_fn`;
+            defaults to Starlette's threadpool.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        executor: Optional[Callable[..., Any]] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be >= 0")
+
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._executor = executor or run_in_threadpool
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_batch_size = 0
+        # Entries taken off the queue for the batch being collected / scored
+        self._in_flight: List[Tuple[Any, asyncio.Future, float]] = []
+
+        # === Metrics ===
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_delay_s = Histogram(QUEUE_DELAY_BUCKETS_S)
+        self.items_scored = 0
+        self.batch_failures = 0
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    async def start(self) -> None:
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Fail anything still waiting so callers do not hang on shutdown: the
+        # interrupted batch (already dequeued) first, then the queue
+        pending, self._in_flight = self._in_flight, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its own result."""
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher.start() has not been called")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        batch_size = self.batch_sizes.snapshot()
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "items_scored": self.items_scored,
+            "batches": batch_size["count"],
+            "batch_failures": self.batch_failures,
+            "batch_size": batch_size,
+            "queue_delay_ms": self.queue_delay_s.snapshot(scale=1000.0),
+        }
+
+    # ---------------------------
+    # Worker loop
+    # ---------------------------
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        batch = self._in_flight = [await self._queue.get()]
+
+        # Only hold the batch open when there is evidence of concurrent load
+        under_load = not self._queue.empty() or self._last_batch_size > 1
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if not under_load or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            self._in_flight = []
+            batch = await self._collect()
+            dispatched = time.perf_counter()
+
+            # Drop callers that gave up (e.g. client disconnected) before scoring
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                continue
+
+            for _, _, enqueued in batch:
+                self.queue_delay_s.observe(dispatched - enqueued)
+            self.batch_sizes.observe(len(batch))
+            self._last_batch_size = len(batch)
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = await self._executor(self.score_fn, items)
+            except Exception:
+                # One bad record must not fail its neighbours: score individually
+                self.batch_failures += 1
+                await self._score_individually(batch)
+                continue
+
+            self.items_scored += len(batch)
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _score_individually(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        for item, future, _ in batch:
+            try:
+                result = (await self._executor(self.score_fn, [item]))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self.items_scored += 1
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,53 @@
+"""
+Arrow IPC / Parquet request and response bodies for batch prediction.
+
+Upstream jobs that already hold customer snapshots in Arrow can post them
+as-is instead of converting to list-of-dicts JSON; results come back as an
+Arrow IPC stream with `probability_churn` and `prediction` columns.
+"""
+
+from typing import Optional
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+_CONTENT_TYPE_FORMATS = {
+    ARROW_STREAM_MEDIA_TYPE: "arrow",
+    PARQUET_MEDIA_TYPE: "parquet",
+    "application/parquet": "parquet",
+    "application/x-parquet": "parquet",
+}
+
+
+def detect_columnar_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a request Content-Type to "arrow" / "parquet" (None for anything else)."""
+    if not content_type:
+        return None
+    return _CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+def wants_arrow(accept: Optional[str]) -> bool:
+    """True when the client asked for an Arrow IPC stream response."""
+    return bool(accept) and ARROW_STREAM_MEDIA_TYPE in accept.lower()
+
+
+def read_table(body: bytes, fmt: str):
+    """Deserialize an Arrow IPC stream or Parquet file body into a `pyarrow.Table`."""
+    import pyarrow as pa
+
+    if fmt == "arrow":
+        with pa.ipc.open_stream(pa.BufferReader(body)) as reader:
+            return reader.read_all()
+
+    import pyarrow.parquet as pq
+    return pq.read_table(pa.BufferReader(body))
+
+
+def table_to_ipc(table) -> bytes:
+    """Serialize a `pyarrow.Table` as an Arrow IPC stream."""
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,50 @@
+"""
+ASGI middleware feeding `src.utils.telemetry` for the prediction endpoints.
+
+Wraps the app at the ASGI level (no `BaseHTTPMiddleware`, which would copy
+every response body through an extra task) and, for the instrumented paths
+only, labels the request's context with its endpoint, tracks it in flight
+and records its status and end-to-end latency once the response (including
+a streamed body) is complete.
+"""
+
+import time
+from typing import Iterable
+
+from src.utils.telemetry import Telemetry, endpoint_label
+
+
+class MetricsMiddleware:
+    """
+    Args:
+        app: The wrapped ASGI application.
+        telemetry: Where measurements go.
+        paths: Request paths to instrument; each one becomes an `endpoint` label.
+    """
+
+    def __init__(self, app, telemetry: Telemetry, paths: Iterable[str]):
+        self.app = app
+        self.telemetry = telemetry
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path")
+        if scope["type"] != "http" or path not in self.paths or not self.telemetry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # reported if the app fails before starting a response
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.telemetry.request_started(path)
+        t0 = time.perf_counter()
+        try:
+            with endpoint_label(path):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            self.telemetry.request_finished(path, status, time.perf_counter() - t0)
@@ -0,0 +1,106 @@
+"""
+Dedicated, bounded thread pool for CPU-bound scoring.
+
+Scoring (pandas + XGBoost) never runs on the event loop or on Starlette's
+shared threadpool. Batch requests additionally pass an in-flight cap, which
+is kept one below the number of scoring threads so that a thread is always
+left for the single-request micro-batcher: `/health` and small requests stay
+responsive while multi-thousand-row batches are running.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ScoringPoolBusy(RuntimeError):
+    """Raised when a request could not get an in-flight slot in time."""
+
+
+class ScoringPool:
+    """
+    Thread pool + in-flight limiter for scoring work.
+
+    Args:
+        max_workers: Number of scoring threads.
+        max_inflight: Maximum number of `run_limited` calls executing or queued
+            inside the executor at once. Defaults to `max_workers - 1` (min 1).
+        acquire_timeout: Seconds a limited call may wait for a slot before
+            `ScoringPoolBusy` is raised (None waits forever).
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_inflight: Optional[int] = None,
+        acquire_timeout: Optional[float] = 30.0,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.max_workers = max_workers
+        self.max_inflight = max_inflight or max(1, max_workers - 1)
+        self.acquire_timeout = acquire_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.inflight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` on a scoring thread (no in-flight cap)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scoring")
+        loop = asyncio.get_running_loop()
+        # Carry contextvars (e.g. request-scoped labels) into the worker thread
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(ctx.run, fn, *args))
+
+    async def run_limited(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` on a scoring thread once an in-flight slot is free."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ScoringPoolBusy(
+                f"Scoring capacity exhausted ({self.max_inflight} requests in flight); retry later"
+            )
+        finally:
+            self.waiting -= 1
+
+        self.inflight += 1
+        try:
+            return await self.run(fn, *args)
+        finally:
+            self.inflight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threads": self.max_workers,
+            "max_inflight": self.max_inflight,
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the threads; the pool is lazily recreated on the next `run`."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._semaphore = None
+
+
+def pool_from_env() -> ScoringPool:
+    """Build the API scoring pool from SCORING_THREADS / SCORING_MAX_INFLIGHT / SCORING_QUEUE_TIMEOUT_S."""
+    threads = int(os.getenv("SCORING_THREADS", str(max(2, os.cpu_count() or 1))))
+    max_inflight = int(os.getenv("SCORING_MAX_INFLIGHT", "0")) or None
+    timeout = float(os.getenv("SCORING_QUEUE_TIMEOUT_S", "30"))
+    return ScoringPool(threads, max_inflight=max_inflight, acquire_timeout=timeout if timeout > 0 else None)
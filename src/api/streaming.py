@@ -0,0 +1,151 @@
+"""
+Streaming NDJSON / CSV batch scoring.
+
+The request body is read incrementally, split into fixed-size chunks of rows,
+each chunk is parsed and scored through `predict_batch` on the scoring pool,
+and its results are written back before the next chunk is read. Peak memory
+is therefore bounded by the chunk size, not by the upload size.
+
+Output rows carry the zero-based input `row` index next to
+`probability_churn` and `prediction`, in the same format as the request.
+Because the HTTP status is sent with the first chunk, a failure mid-stream is
+reported in-band (an `{"error": ...}` NDJSON line or a `# error: ...` CSV
+line) and ends the stream.
+
+Clients should read the response while uploading (curl, aiohttp and
+`requests` with a generator body all do); results start flowing before the
+upload finishes.
+"""
+
+import io
+import json
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+import pandas as pd
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.utils.telemetry import telemetry
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+_CONTENT_TYPE_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+    "text/csv": "csv",
+    "application/csv": "csv",
+}
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a request Content-Type to "ndjson" / "csv" (None if unsupported)."""
+    if not content_type:
+        return None
+    return _CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+async def iter_line_chunks(body: AsyncIterator[bytes], chunk_rows: int) -> AsyncIterator[List[str]]:
+    """Yield lists of at most `chunk_rows` non-empty text lines from a byte stream."""
+    buffer = b""
+    lines: List[str] = []
+    async for data in body:
+        buffer += data
+        *complete, buffer = buffer.split(b"\n")
+        for raw in complete:
+            line = raw.decode("utf-8").rstrip("\r")
+            if line.strip():
+                lines.append(line)
+            if len(lines) >= chunk_rows:
+                yield lines
+                lines = []
+
+    tail = buffer.decode("utf-8").rstrip("\r")
+    if tail.strip():
+        lines.append(tail)
+    if lines:
+        yield lines
+
+
+def parse_chunk(lines: List[str], fmt: str, header: Optional[str] = None) -> pd.DataFrame:
+    """Parse one chunk of NDJSON lines, or CSV lines sharing `header`, into a DataFrame."""
+    if fmt == "ndjson":
+        return pd.DataFrame([json.loads(line) for line in lines])
+    return pd.read_csv(io.StringIO("\n".join([header] + lines)))
+
+
+def serialize_chunk(result: pd.DataFrame, fmt: str, offset: int, first: bool) -> bytes:
+    """Serialize one chunk of predictions, tagging rows with their global input index."""
+    result = result.reset_index(drop=True)
+    result.insert(0, "row", range(offset, offset + len(result)))
+    if fmt == "ndjson":
+        return result.to_json(orient="records", lines=True).rstrip("\n").encode("utf-8") + b"\n"
+    return result.to_csv(index=False, header=first).encode("utf-8")
+
+
+def _error_line(fmt: str, message: str) -> bytes:
+    if fmt == "ndjson":
+        return (json.dumps({"error": message}) + "\n").encode("utf-8")
+    return f"# error: {message}\n".encode("utf-8")
+
+
+async def stream_predictions(
+    body: AsyncIterator[bytes],
+    fmt: str,
+    chunk_rows: int,
+    predict_fn: Callable[[pd.DataFrame], pd.DataFrame],
+    run: Callable[..., Awaitable],
+) -> AsyncIterator[bytes]:
+    """
+    Score a streamed request body chunk by chunk.
+
+    Args:
+        body: Request body byte stream (e.g. `request.stream()`).
+        fmt: "ndjson" or "csv".
+        chunk_rows: Rows parsed and scored per chunk.
+        predict_fn: Batch scorer, normally `predict_batch`.
+        run: Awaitable runner for CPU-bound work (the API scoring pool).
+    """
+    header: Optional[str] = None
+    offset = 0
+
+    def score(lines: List[str], offset: int, first: bool) -> bytes:
+        with telemetry.stage("parse"):
+            df = parse_chunk(lines, fmt, header)
+        result = predict_fn(df)
+        with telemetry.stage("serialization"):
+            return serialize_chunk(result, fmt, offset, first)
+
+    try:
+        async for lines in iter_line_chunks(body, chunk_rows):
+            if fmt == "csv" and header is None:
+                header, lines = lines[0], lines[1:]
+                if not lines:
+                    continue
+            yield await run(score, lines, offset, offset == 0)
+            offset += len(lines)
+    except Exception as e:
+        yield _error_line(fmt, str(e))
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that may keep reading the request body while streaming.
+
+    Starlette's default implementation listens for client disconnects on
+    `receive` for ASGI servers older than spec 2.4 (e.g. uvicorn), which would
+    swallow the request body messages this endpoint still has to read.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            # Client went away; nothing left to send
+            return
+        if self.background is not None:
+            await self.background()
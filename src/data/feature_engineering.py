@@ -1,3 +1,6 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 import pandas as pd
 
 
@@ -12,33 +15,58 @@ def _map_binary_series(s: pd.Series) -> pd.Series:
     """
     # Get unique values and remove NaN
     vals = list(pd.Series(s.dropna().unique()).astype(str))
+    mapping = _binary_mapping(vals)
+
+    # === NON-BINARY FEATURES ===
+    # Return unchanged - will be handled by one-hot encoding
+    if mapping is None:
+        return s
+
+    # Yes/No and Male/Female map the raw values, anything else maps the
+    # string representation (stable alphabetical ordering)
+    if set(vals) in ({"Yes", "No"}, {"Male", "Female"}):
+        return s.map(mapping).astype("Int64")
+    return s.astype(str).map(mapping).astype("Int64")
+
+
+def _binary_mapping(vals: List[str]) -> Optional[Dict[str, int]]:
+    """
+    Return the deterministic 0/1 mapping for a 2-category feature.
+
+    Shared by `_map_binary_series` (training) and `FeatureTransformer`
+    (serving) so both sides always agree on which value becomes 1.
+    Returns None when the values are not binary.
+
+    """
     valset = set(vals)
 
     # === DETERMINISTIC BINARY MAPPINGS ===
     # CRITICAL: These exact mappings are hardcoded in serving pipeline
-    
+
     # Yes/No mapping (most common pattern in telecom data)
     if valset == {"Yes", "No"}:
-        return s.map({"No": 0, "Yes": 1}).astype("Int64")
-        
+        return {"No": 0, "Yes": 1}
+
     # Gender mapping (demographic feature)
     if valset == {"Male", "Female"}:
-        return s.map({"Female": 0, "Male": 1}).astype("Int64")
+        return {"Female": 0, "Male": 1}
 
     # === GENERIC BINARY MAPPING ===
     # For any other 2-category feature, use stable alphabetical ordering
     if len(vals) == 2:
         # Sort values to ensure consistent mapping across runs
         sorted_vals = sorted(vals)
-        mapping = {sorted_vals[0]: 0, sorted_vals[1]: 1}
-        return s.astype(str).map(mapping).astype("Int64")
+        return {sorted_vals[0]: 0, sorted_vals[1]: 1}
+
+    return None
 
-    # === NON-BINARY FEATURES ===
-    # Return unchanged - will be handled by one-hot encoding
-    return s
 
+def _categorical_columns(df: pd.DataFrame, target_col: str) -> List[str]:
+    """Object, string and `category` columns (excluding the target), in frame order."""
+    return [c for c in df.select_dtypes(include=["object", "string", "category"]).columns if c != target_col]
 
-def build_features(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame:
+
+def build_features(df: pd.DataFrame, target_col: str = "Churn", copy: bool = True, compact: bool = False) -> pd.DataFrame:
     """
     Apply complete feature engineering pipeline for training data.
     
@@ -46,14 +74,20 @@ def build_features(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame:
     into ML-ready features. The transformations must be exactly replicated in the
     serving pipeline to ensure prediction accuracy.
 
+    With `copy=False` the input frame is encoded in place (its binary columns
+    are overwritten) instead of being copied first; use it when the caller
+    no longer needs the preprocessed frame. `compact=True` stores binary and
+    boolean features as int8 instead of int64 (same values).
+
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     print(f"🔧 Starting feature engineering on {df.shape[1]} columns...")
 
     # === STEP 1: Identify Feature Types ===
-    # Find categorical columns (object dtype) excluding the target variable
-    obj_cols = [c for c in df.select_dtypes(include=["object"]).columns if c != target_col]
-    numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    # Find categorical columns (object, or `category` from a typed load) excluding the target variable
+    obj_cols = _categorical_columns(df, target_col)
+    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
     
     print(f"   📊 Found {len(obj_cols)} categorical and {len(numeric_cols)} numeric columns")
 
@@ -69,18 +103,28 @@ def build_features(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame:
     if multi_cols:
         print(f"      Multi-category: {multi_cols}")
 
+    # Typed loads deliver `category` columns: drop unused categories and sort the
+    # vocabulary so one-hot columns come out exactly as for object columns
+    for c in multi_cols:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            s = df[c].cat.remove_unused_categories()
+            df[c] = s.cat.reorder_categories(sorted(s.cat.categories, key=str))
+
     # === STEP 3: Apply Binary Encoding ===
     # Convert 2-category features to 0/1 using deterministic mappings
     for c in binary_cols:
         original_dtype = df[c].dtype
         df[c] = _map_binary_series(df[c].astype(str))
+        if compact:
+            # Narrow before get_dummies re-assembles the frame (Int64 is 9 bytes/row)
+            df[c] = df[c].fillna(0).astype("int8")
         print(f"      ✅ {c}: {original_dtype} → binary (0/1)")
 
     # === STEP 4: Convert Boolean Columns ===
     # XGBoost requires integer inputs, not boolean
     bool_cols = df.select_dtypes(include=["bool"]).columns.tolist()
     if bool_cols:
-        df[bool_cols] = df[bool_cols].astype(int)
+        df[bool_cols] = df[bool_cols].astype("int8" if compact else int)
         print(f"   🔄 Converted {len(bool_cols)} boolean columns to int: {bool_cols}")
 
     # === STEP 5: One-Hot Encoding for Multi-Category Features ===
@@ -98,9 +142,226 @@ def build_features(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame:
     # === STEP 6: Data Type Cleanup ===
     # Convert nullable integers (Int64) to standard integers for XGBoost
     for c in binary_cols:
-        if pd.api.types.is_integer_dtype(df[c]):
+        if not compact and pd.api.types.is_integer_dtype(df[c]):
             # Fill any NaN values with 0 and convert to int
             df[c] = df[c].fillna(0).astype(int)
 
     print(f"✅ Feature engineering complete: {df.shape[1]} final features")
-    return df
\ No newline at end of file
+    return df
+
+class FeatureTransformer:
+    """
+    Fitted, serializable version of `build_features` for serving.
+
+    `fit` learns the feature layout once from the preprocessed training frame
+    (numeric columns, binary mappings and one-hot vocabularies, in exactly the
+    column order `build_features` produces). `transform` and `transform_record`
+    then turn raw customer records into the model's feature order with
+    precomputed index lookups instead of a `pd.get_dummies` pass.
+
+    Raw records may still carry ID columns, the target or unseen categories:
+    unknown columns are ignored, unknown categories encode as all zeros and
+    numeric values that cannot be parsed become 0 (same as `preprocess_data`).
+
+    """
+
+    def __init__(self, target_col: str = "Churn"):
+        self.target_col = target_col
+        self.feature_columns: List[str] = []
+        self.numeric_index: Dict[str, int] = {}
+        self.binary_index: Dict[str, int] = {}
+        self.binary_mappings: Dict[str, Dict[str, int]] = {}
+        self.multi_categories: Dict[str, List[str]] = {}
+        self.multi_index: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_columns)
+
+    def to_spec(self) -> Dict[str, Any]:
+        """Plain-JSON feature spec (shipped in the serving bundle)."""
+        return {
+            "target_col": self.target_col,
+            "feature_columns": list(self.feature_columns),
+            "numeric": dict(self.numeric_index),
+            "binary": {c: {"index": idx, "mapping": self.binary_mappings[c]} for c, idx in self.binary_index.items()},
+            "multi": {c: {"categories": self.multi_categories[c], "index": self.multi_index[c]} for c in self.multi_categories},
+        }
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "FeatureTransformer":
+        """Rebuild a fitted transformer from `to_spec` output."""
+        t = cls(target_col=spec["target_col"])
+        t.feature_columns = list(spec["feature_columns"])
+        t.numeric_index = {c: int(i) for c, i in spec["numeric"].items()}
+        t.binary_index = {c: int(b["index"]) for c, b in spec["binary"].items()}
+        t.binary_mappings = {c: {k: int(v) for k, v in b["mapping"].items()} for c, b in spec["binary"].items()}
+        t.multi_categories = {c: list(m["categories"]) for c, m in spec["multi"].items()}
+        t.multi_index = {c: {k: int(v) for k, v in m["index"].items()} for c, m in spec["multi"].items()}
+        return t
+
+    def fit(self, df: pd.DataFrame) -> "FeatureTransformer":
+        """
+        Learn feature types, binary mappings and category vocabularies.
+
+        Mirrors the type detection of `build_features` so the learned
+        `feature_columns` match its output column order exactly.
+
+        """
+        obj_cols = _categorical_columns(df, self.target_col)
+        binary_cols = [c for c in obj_cols if df[c].dropna().nunique() == 2]
+        multi_cols = [c for c in obj_cols if df[c].dropna().nunique() > 2]
+
+        columns: List[str] = []
+        self.numeric_index, self.binary_index = {}, {}
+        self.binary_mappings, self.multi_categories, self.multi_index = {}, {}, {}
+
+        # === Numeric + binary columns keep their original position ===
+        for c in df.columns:
+            if c == self.target_col or c in multi_cols:
+                continue
+            if c in binary_cols:
+                vals = list(pd.Series(df[c].dropna().unique()).astype(str))
+                self.binary_mappings[c] = _binary_mapping(vals)
+                self.binary_index[c] = len(columns)
+            else:
+                self.numeric_index[c] = len(columns)
+            columns.append(c)
+
+        # === One-hot columns are appended (get_dummies, drop_first=True) ===
+        for c in multi_cols:
+            categories = sorted(df[c].dropna().astype(str).unique())
+            self.multi_categories[c] = categories
+            self.multi_index[c] = {}
+            for cat in categories[1:]:
+                self.multi_index[c][cat] = len(columns)
+                columns.append(f"{c}_{cat}")
+
+        self.feature_columns = columns
+        print(
+            f"🔧 Feature transformer fitted: {len(columns)} features "
+            f"({len(binary_cols)} binary, {len(multi_cols)} multi-category)"
+        )
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode a raw or preprocessed frame into `feature_columns` order.
+
+        Works column by column on NumPy arrays; missing input columns encode
+        as zeros, matching the old zero-fill behaviour of the serving code.
+
+        """
+        X = np.zeros((len(df), self.n_features), dtype=np.float32)
+
+        for c, idx in self.numeric_index.items():
+            if c in df.columns:
+                X[:, idx] = pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+
+        for c, idx in self.binary_index.items():
+            if c in df.columns:
+                mapped = df[c].astype(str).map(self.binary_mappings[c])
+                X[:, idx] = mapped.fillna(0).to_numpy(dtype=np.float32)
+
+        for c, categories in self.multi_categories.items():
+            if c not in df.columns:
+                continue
+            codes = pd.Categorical(df[c].astype(str), categories=categories).codes
+            # Position lookup per category code; the extra trailing -1 absorbs
+            # unknown values (code -1) and the dropped first category
+            lookup = np.array(
+                [self.multi_index[c].get(cat, -1) for cat in categories] + [-1], dtype=np.int64
+            )
+            positions = lookup[codes]
+            rows = np.nonzero(positions >= 0)[0]
+            X[rows, positions[rows]] = 1.0
+
+        return pd.DataFrame(X, columns=self.feature_columns, index=df.index)
+
+    def transform_arrow(self, table: Any) -> np.ndarray:
+        """
+        Encode a `pyarrow.Table` into a float32 feature matrix.
+
+        Numeric columns are cast and copied column-wise; string columns are
+        dictionary-encoded so only the (small) dictionary is looked up in
+        Python and rows are gathered by index. No per-row Python objects.
+
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        X = np.zeros((table.num_rows, self.n_features), dtype=np.float32)
+        names = set(table.column_names)
+
+        for c, idx in self.numeric_index.items():
+            if c not in names:
+                continue
+            col = table.column(c)
+            if pa.types.is_integer(col.type) or pa.types.is_floating(col.type) or pa.types.is_boolean(col.type):
+                values = pc.fill_null(pc.cast(col, pa.float32()), 0.0)
+                X[:, idx] = np.nan_to_num(values.to_numpy(), nan=0.0)
+            else:
+                # e.g. TotalCharges shipped as text: same coercion as preprocess_data
+                X[:, idx] = pd.to_numeric(col.to_pandas(), errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+
+        def encode(c: str, positions: Dict[str, int], values: Optional[Dict[str, int]] = None) -> None:
+            encoded = pc.dictionary_encode(pc.cast(table.column(c), pa.string())).combine_chunks()
+            dictionary = encoded.dictionary.to_pylist()
+            indices = pc.fill_null(encoded.indices, -1).to_numpy()
+            if values is not None:
+                # Binary column: dictionary value -> 0/1 written into one slot
+                lookup = np.array([values.get(v, 0) for v in dictionary] + [0], dtype=np.float32)
+                X[:, positions[c]] = lookup[indices]
+            else:
+                # One-hot column: dictionary value -> feature position (-1 = none)
+                lookup = np.array([positions.get(v, -1) for v in dictionary] + [-1], dtype=np.int64)
+                cols = lookup[indices]
+                rows = np.nonzero(cols >= 0)[0]
+                X[rows, cols[rows]] = 1.0
+
+        for c in self.binary_index:
+            if c in names:
+                encode(c, self.binary_index, self.binary_mappings[c])
+
+        for c, lookup in self.multi_index.items():
+            if c in names:
+                encode(c, lookup)
+
+        return X
+
+    def transform_record(self, record: Dict[str, Any], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encode a single raw record (dict) into a 1-D float32 feature row.
+
+        Pure dict lookups, no pandas. Pass `out` to reuse a preallocated row.
+
+        """
+        row = np.zeros(self.n_features, dtype=np.float32) if out is None else out
+        if out is not None:
+            row.fill(0.0)
+
+        for c, value in record.items():
+            idx = self.numeric_index.get(c)
+            if idx is not None:
+                row[idx] = _to_float(value)
+                continue
+            idx = self.binary_index.get(c)
+            if idx is not None:
+                row[idx] = self.binary_mappings[c].get(str(value), 0)
+                continue
+            lookup = self.multi_index.get(c)
+            if lookup is not None:
+                idx = lookup.get(str(value))
+                if idx is not None:
+                    row[idx] = 1.0
+
+        return row
+
+
+def _to_float(value: Any) -> float:
+    """Parse a numeric feature like `pd.to_numeric(errors="coerce").fillna(0)`."""
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if f != f else f
@@ -1,15 +1,227 @@
 import pandas as pd
 import os
+import time
+import contextlib
+from typing import Dict, Iterator, Optional
 
-def load_data(file_path: str) -> pd.DataFrame:
+from src.utils.profiling import format_mb, frame_mb, peak_rss_mb
+
+# === Declared Telco schema for typed loading ===
+# - categoricals: `category` (one small code array + shared vocabulary per column)
+# - SeniorCitizen / tenure: narrow integers
+# - MonthlyCharges stays float64 so validation and TotalCharges >= MonthlyCharges
+#   comparisons see exactly the same values as an untyped load
+# - TotalCharges stays a string: the raw file has blanks that preprocess_data coerces
+TELCO_SCHEMA: Dict[str, str] = {
+    "customerID": "string[pyarrow]",
+    "gender": "category",
+    "SeniorCitizen": "int8",
+    "Partner": "category",
+    "Dependents": "category",
+    "tenure": "int16",
+    "PhoneService": "category",
+    "MultipleLines": "category",
+    "InternetService": "category",
+    "OnlineSecurity": "category",
+    "OnlineBackup": "category",
+    "DeviceProtection": "category",
+    "TechSupport": "category",
+    "StreamingTV": "category",
+    "StreamingMovies": "category",
+    "Contract": "category",
+    "PaperlessBilling": "category",
+    "PaymentMethod": "category",
+    "MonthlyCharges": "float64",
+    "TotalCharges": "string[pyarrow]",
+    "Churn": "category",
+}
+
+def load_data(file_path: str, typed: bool = False, schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
     """
     Loads CSV data into a pandas DataFrame.
+
+    With `typed=True` the file is parsed by pyarrow's CSV reader straight into
+    the declared `schema` (default `TELCO_SCHEMA`): categoricals are dictionary
+    encoded while parsing, so full string columns are never materialized and
+    the frame needs a fraction of the memory of the default object-heavy load.
+    Columns not in the schema are inferred as usual. Numeric columns holding
+    values that do not parse are loaded as strings (see `_read_typed_csv`), so
+    validation reports them instead of the reader failing.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"❌ File not found: {file_path}")
 
-    print(f"📥 Loading: {file_path}")
-    df = pd.read_csv(file_path)
+    print(f"📥 Loading: {file_path}" + (" (typed, pyarrow engine)" if typed else ""))
+    start = time.perf_counter()
+    if typed:
+        table = _read_typed_csv(file_path, schema or TELCO_SCHEMA)
+        df = _to_pandas(table)
+        del table
+    else:
+        df = pd.read_csv(file_path)
+    elapsed = time.perf_counter() - start
+
     print(f"✅ Loaded {df.shape[0]} rows, {df.shape[1]} columns")
+    print(
+        f"   ⏱️  {elapsed:.2f}s ({df.shape[0] / max(elapsed, 1e-9):,.0f} rows/s) | "
+        f"frame {frame_mb(df):.1f} MB | peak RSS {format_mb(peak_rss_mb())}"
+    )
+
+    return df
+
+def iter_data(
+    file_path: str,
+    chunk_rows: int = 100_000,
+    schema: Optional[Dict[str, str]] = None,
+    start_row: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV (or `.parquet` file) as typed DataFrame chunks of about `chunk_rows` rows.
+
+    Reads with `pyarrow.csv.open_csv` (Parquet: row-group batches), so only
+    the current chunk is resident. CSV chunks use the same dtypes as
+    `load_data(typed=True)`; Parquet keeps the file's own types. Categorical
+    vocabularies are per chunk, so compare categoricals by value, not by code.
+    `start_row` skips that many data rows first (e.g. to resume a job), so
+    chunk boundaries stay at multiples of `chunk_rows` from that row.
+    A throughput / peak-memory summary is printed once the file is exhausted.
+    """
+    import pyarrow as pa
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"❌ File not found: {file_path}")
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    if start_row < 0:
+        raise ValueError("start_row must be >= 0")
+
+    def to_frame(batches: list) -> pd.DataFrame:
+        return _to_pandas(pa.Table.from_batches(batches))
+
+    print(f"📥 Streaming: {file_path} (chunks of {chunk_rows:,} rows"
+          + (f", from row {start_row:,})" if start_row else ")"))
+    start = time.perf_counter()
+    rows = chunks = 0
+    pending, pending_rows = [], 0
+
+    if file_path.endswith(".parquet"):
+        reader = _parquet_batches(file_path, start_row, chunk_rows)
+    else:
+        import pyarrow.csv as pacsv
+
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(skip_rows_after_names=start_row),
+            convert_options=_convert_options(file_path, schema),
+        )
+
+    with contextlib.closing(reader):
+        for batch in reader:
+            offset = 0
+            # Re-slice the reader's blocks into `chunk_rows`-sized chunks
+            while offset < batch.num_rows:
+                take = min(chunk_rows - pending_rows, batch.num_rows - offset)
+                pending.append(batch.slice(offset, take))
+                pending_rows += take
+                offset += take
+                if pending_rows == chunk_rows:
+                    yield to_frame(pending)
+                    rows, chunks = rows + pending_rows, chunks + 1
+                    pending, pending_rows = [], 0
+        if pending_rows:
+            yield to_frame(pending)
+            rows, chunks = rows + pending_rows, chunks + 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ Streamed {rows} rows in {chunks} chunks | {elapsed:.2f}s "
+        f"({rows / max(elapsed, 1e-9):,.0f} rows/s) | peak RSS {format_mb(peak_rss_mb())}"
+    )
+
+def _parquet_batches(file_path: str, start_row: int, batch_size: int) -> Iterator:
+    """Record batches of a Parquet file from `start_row` on, skipping whole row groups before it."""
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(file_path)
+    first, skip = 0, start_row
+    while first < pf.num_row_groups and skip >= pf.metadata.row_group(first).num_rows:
+        skip -= pf.metadata.row_group(first).num_rows
+        first += 1
+    for batch in pf.iter_batches(batch_size=batch_size, row_groups=range(first, pf.num_row_groups)):
+        if skip >= batch.num_rows:
+            skip -= batch.num_rows
+            continue
+        yield batch.slice(skip)
+        skip = 0
+
+def relaxed_schema(schema: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """`schema` (default `TELCO_SCHEMA`) with every numeric column read as a string."""
+    return {
+        c: "string[pyarrow]" if d != "category" and not d.startswith("string") else d
+        for c, d in (schema or TELCO_SCHEMA).items()
+    }
+
+def _read_typed_csv(file_path: str, schema: Dict[str, str]):
+    """
+    Read a CSV into an Arrow table with the declared `schema`.
+
+    One value that does not fit its numeric column (e.g. tenure "abc") makes
+    pyarrow reject the whole file. In that case the numeric columns are
+    re-read as strings and cast back one by one: a column that fails its
+    declared type falls back to float64 (as pandas would infer it) and, failing
+    that, stays a string so `validate_telco_data` reports it as non-numeric.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    try:
+        return pacsv.read_csv(file_path, convert_options=_convert_options(file_path, schema))
+    except pa.ArrowInvalid as e:
+        print(f"⚠️  Warning: typed load failed ({e}); re-reading numeric columns as strings")
+
+    relaxed = relaxed_schema(schema)
+    table = pacsv.read_csv(file_path, convert_options=_convert_options(file_path, relaxed))
+    for c, dtype in schema.items():
+        if relaxed[c] == dtype or c not in table.column_names:
+            continue
+        for target in (_arrow_type(dtype), pa.float64()):
+            try:
+                table = table.set_column(table.column_names.index(c), c, pc.cast(table[c], target))
+                break
+            except pa.ArrowInvalid:
+                continue
+        else:
+            print(f"⚠️  Warning: column '{c}' has non-numeric values; loaded as strings")
+    return table
+
+def _convert_options(file_path: str, schema: Optional[Dict[str, str]]):
+    """pyarrow CSV options for the schema columns present in the file header."""
+    import pyarrow.csv as pacsv
+
+    header = pd.read_csv(file_path, nrows=0).columns
+    return pacsv.ConvertOptions(
+        column_types={c: _arrow_type(d) for c, d in (schema or TELCO_SCHEMA).items() if c in header},
+        # Match pandas' default NA handling (blank strings become missing)
+        null_values=pacsv.ConvertOptions().null_values + ["<NA>", "None"],
+        strings_can_be_null=True,
+    )
+
+def _to_pandas(table) -> pd.DataFrame:
+    """Arrow -> pandas: dictionary columns become `category`, strings stay Arrow-backed."""
+    import pyarrow as pa
+
+    return table.to_pandas(
+        types_mapper=lambda t: pd.StringDtype("pyarrow") if t == pa.string() else None,
+        split_blocks=True,
+    )
+
+def _arrow_type(dtype: str):
+    """pyarrow CSV column type for a schema dtype (dictionary columns arrive in pandas as `category`)."""
+    import pyarrow as pa
 
-    return df
\ No newline at end of file
+    if dtype == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    if dtype.startswith("string"):
+        return pa.string()
+    return pa.from_numpy_dtype(dtype)
@@ -0,0 +1,236 @@
+"""
+Chunked, parallel and resumable bulk scoring of CSV / Parquet extracts.
+
+The input is streamed in fixed `chunk_rows` chunks (`load_data.iter_data`),
+each chunk is scored with `predict_batch` on a process pool whose workers
+load the model once, and every chunk's results are written by its worker as
+one Parquet part file:
+
+    <output_dir>/part-000000.parquet    row, [id column], probability_churn, prediction
+    <output_dir>/_job.json              input fingerprint, chunk size, model version
+    <output_dir>/_SUCCESS               written last, with rows / seconds / rows per second
+
+Parts are written atomically (temp file + rename), so after a crash every
+part on disk is complete: re-running the same command skips them and scores
+only the missing chunks. The directory reads back as one dataset with
+`pd.read_parquet(output_dir)`.
+
+CSV numeric columns are streamed as strings (`relaxed_schema`) and parsed by
+the feature transformer, so a malformed value scores as missing instead of
+aborting the job.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PART_TEMPLATE = "part-{:06d}.parquet"
+JOB_FILE = "_job.json"
+SUCCESS_FILE = "_SUCCESS"
+
+
+# ---------------------------
+# Worker side (one model per process)
+# ---------------------------
+_threads: Optional[int] = None
+_configured: set = set()  # model versions whose booster thread count is set
+
+
+def _init_worker(threads: Optional[int]) -> None:
+    global _threads
+    # Bulk rows are scored once: a prediction cache would only cost memory
+    os.environ["PREDICTION_CACHE_SIZE"] = "0"
+    _threads = threads
+
+
+def _serving_model(version: Optional[str]):
+    """The worker's model (loaded on first use), switched to `version` if given."""
+    from src.data.predict.predict import registry
+
+    if version is not None and registry.active.version != version:
+        registry.load(version)
+    model = registry.active
+    if _threads and model.version not in _configured:
+        model.booster.set_param({"nthread": _threads})
+        _configured.add(model.version)
+    return model
+
+
+def _model_version(version: Optional[str]) -> str:
+    return _serving_model(version).version
+
+
+def _score_chunk(
+    index: int, row_start: int, df: pd.DataFrame, output_dir: str, id_col: Optional[str], version: str
+) -> Tuple[int, int, float]:
+    """Score one chunk and write its part file; returns (index, rows, seconds)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from src.data.predict.predict import predict_batch
+
+    t0 = time.perf_counter()
+    _serving_model(version)
+    result = predict_batch(df)
+    if result.attrs["model_version"] != version:
+        raise RuntimeError(f"Chunk {index} was scored by model {result.attrs['model_version']}, expected {version}")
+
+    columns = {"row": np.arange(row_start, row_start + len(df), dtype=np.int64)}
+    if id_col and id_col in df.columns:
+        columns[id_col] = pa.array(df[id_col])
+    columns["probability_churn"] = result["probability_churn"].to_numpy(dtype=np.float32)
+    columns["prediction"] = result["prediction"].to_numpy(dtype=np.int8)
+    table = pa.table(columns, metadata={"model_version": version})
+
+    path = os.path.join(output_dir, PART_TEMPLATE.format(index))
+    tmp = f"{path}.tmp-{os.getpid()}"
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return index, len(df), time.perf_counter() - t0
+
+
+# ---------------------------
+# Job bookkeeping
+# ---------------------------
+def _fingerprint(input_path: str, chunk_rows: int, id_col: Optional[str], version: str) -> Dict[str, Any]:
+    stat = os.stat(input_path)
+    return {
+        "input": os.path.abspath(input_path),
+        "input_bytes": stat.st_size,
+        "input_mtime": stat.st_mtime,
+        "chunk_rows": chunk_rows,
+        "id_col": id_col,
+        "model_version": version,
+    }
+
+
+def _completed_parts(output_dir: str) -> set:
+    done = set()
+    for name in os.listdir(output_dir):
+        if name.startswith("part-") and name.endswith(".parquet"):
+            done.add(int(name[len("part-"):-len(".parquet")]))
+        elif ".parquet.tmp-" in name:
+            os.remove(os.path.join(output_dir, name))  # left behind by a crashed worker
+    return done
+
+
+def _prepare_output(output_dir: str, job: Dict[str, Any], overwrite: bool) -> set:
+    """Create / validate the output directory; returns the chunk indices already scored."""
+    os.makedirs(output_dir, exist_ok=True)
+    job_path = os.path.join(output_dir, JOB_FILE)
+
+    if os.path.exists(job_path) and not overwrite:
+        with open(job_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous != job:
+            changed = sorted(k for k in job if previous.get(k) != job[k])
+            raise RuntimeError(
+                f"❌ {output_dir} holds a different scoring job (changed: {', '.join(changed)}). "
+                "Use a new output directory or --overwrite."
+            )
+        return _completed_parts(output_dir)
+
+    for name in os.listdir(output_dir):
+        if name.startswith("part-") or name in (JOB_FILE, SUCCESS_FILE):
+            os.remove(os.path.join(output_dir, name))
+    with open(job_path, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=2)
+    return set()
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+def score_file(
+    input_path: str,
+    output_dir: str,
+    chunk_rows: int = 250_000,
+    n_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    model_version: Optional[str] = None,
+    id_col: Optional[str] = "customerID",
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """
+    Score every row of a CSV / Parquet file into a directory of Parquet parts.
+
+    Args:
+        input_path: Raw customer records (`.csv` or `.parquet`), same columns the API takes.
+        output_dir: Destination dataset directory (resumed if it holds the same job).
+        chunk_rows: Rows per chunk / part file; bounds each worker's memory.
+        n_workers: Scoring processes (default: CPU count).
+        threads_per_worker: XGBoost threads per process (default: CPU count / workers).
+        model_version: Bundle version to score with (default: the serving default, i.e. LATEST).
+        id_col: Input column copied next to the scores, if present.
+        overwrite: Discard existing parts instead of resuming.
+
+    Returns:
+        Summary with rows scored in this run, skipped chunks, seconds and rows per second.
+    """
+    from src.data.load_data import iter_data, relaxed_schema
+
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"❌ File not found: {input_path}")
+    n_workers = n_workers or os.cpu_count() or 1
+    threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // n_workers)
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(threads_per_worker,)) as pool:
+        # Resolve the model once, so every worker scores with the same version
+        version = pool.submit(_model_version, model_version).result()
+        job = _fingerprint(input_path, chunk_rows, id_col, version)
+        done = _prepare_output(output_dir, job, overwrite)
+
+        # Chunks [0, first) are all done: start reading after them
+        first = 0
+        while first in done:
+            first += 1
+        print(f"🧮 Bulk scoring {input_path} -> {output_dir} | model {version} | {n_workers} worker(s) x "
+              f"{threads_per_worker} thread(s)" + (f" | resuming, {len(done)} chunk(s) already scored" if done else ""))
+
+        rows = chunks = 0
+        pending = set()
+
+        def collect(futures) -> None:
+            nonlocal rows, chunks
+            for future in futures:
+                index, n, seconds = future.result()
+                rows, chunks = rows + n, chunks + 1
+                elapsed = time.perf_counter() - t0
+                print(f"   ✅ part {index:06d}: {n:,} rows in {seconds:.2f}s | total {rows:,} rows "
+                      f"| {rows / max(elapsed, 1e-9):,.0f} rows/s")
+
+        reader = iter_data(input_path, chunk_rows=chunk_rows, schema=relaxed_schema(), start_row=first * chunk_rows)
+        for offset, df in enumerate(reader):
+            index = first + offset
+            if index in done:
+                continue
+            pending.add(pool.submit(_score_chunk, index, index * chunk_rows, df, output_dir, id_col, version))
+            del df
+            # At most 2 x workers chunks in flight bounds memory
+            if len(pending) >= 2 * n_workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+        collect(wait(pending).done)
+
+    elapsed = time.perf_counter() - t0
+    summary = {
+        "model_version": version,
+        "rows": rows,
+        "chunks": chunks,
+        "skipped_chunks": len(done),
+        "seconds": elapsed,
+        "rows_per_s": rows / max(elapsed, 1e-9),
+    }
+    with open(os.path.join(output_dir, SUCCESS_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"✅ Scored {rows:,} rows in {chunks} chunk(s) | {elapsed:.1f}s ({summary['rows_per_s']:,.0f} rows/s)"
+          + (f" | {len(done)} chunk(s) reused" if done else ""))
+    return summary
@@ -0,0 +1,195 @@
+"""
+Self-contained, versioned serving bundle.
+
+`Scripts/run.py` writes one directory per trained model under
+`artifacts/bundles/<version>/`:
+
+    model.ubj           booster in XGBoost's native UBJSON format
+    feature_spec.json   FeatureTransformer.to_spec() (column order, mappings, vocabularies)
+    manifest.json       version, threshold, target, xgboost version, sha256 + size per file
+
+and points `artifacts/bundles/LATEST` at it. Loading a bundle needs only
+xgboost and numpy (plus the transformer class) - no MLflow, joblib or pickle.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+BUNDLE_FORMAT_VERSION = 1
+MODEL_FILE = "model.ubj"
+FEATURE_SPEC_FILE = "feature_spec.json"
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+
+
+class ServingBundle:
+    """A loaded bundle: booster, sklearn-style model, fitted transformer and manifest."""
+
+    def __init__(self, path: str, manifest: Dict[str, Any], model: Any, transformer: Any):
+        self.path = path
+        self.manifest = manifest
+        self.model = model
+        self.booster = model.get_booster()
+        self.transformer = transformer
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def threshold(self) -> float:
+        return float(self.manifest["threshold"])
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return self.transformer.feature_columns
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_text_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_bundle(
+    bundles_dir: str,
+    booster: Any,
+    transformer: Any,
+    threshold: float,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Write a new versioned bundle and mark it as LATEST.
+
+    Args:
+        bundles_dir: Parent directory (normally `artifacts/bundles`).
+        booster: Trained `xgboost.Booster`.
+        transformer: Fitted `FeatureTransformer`.
+        threshold: Decision threshold to serve with.
+        extra: Optional JSON-serializable metadata stored in the manifest (e.g. metrics).
+
+    Returns:
+        Path of the bundle directory.
+    """
+    import xgboost
+
+    os.makedirs(bundles_dir, exist_ok=True)
+    staging = os.path.join(bundles_dir, f".staging-{os.getpid()}")
+    os.makedirs(staging, exist_ok=True)
+
+    # === Payload files ===
+    booster.save_model(os.path.join(staging, MODEL_FILE))
+    with open(os.path.join(staging, FEATURE_SPEC_FILE), "w", encoding="utf-8") as f:
+        json.dump(transformer.to_spec(), f, indent=2)
+
+    files = {
+        name: {"sha256": _sha256(os.path.join(staging, name)), "bytes": os.path.getsize(os.path.join(staging, name))}
+        for name in (MODEL_FILE, FEATURE_SPEC_FILE)
+    }
+    created = datetime.datetime.now(datetime.timezone.utc)
+    version = f"{created:%Y%m%dT%H%M%SZ}-{files[MODEL_FILE]['sha256'][:8]}"
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "version": version,
+        "created_at": created.isoformat(),
+        "threshold": float(threshold),
+        "target": transformer.target_col,
+        "n_features": transformer.n_features,
+        "xgboost_version": xgboost.__version__,
+        "files": files,
+        **({"extra": extra} if extra else {}),
+    }
+    with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # === Publish: rename the finished directory, then flip LATEST ===
+    path = os.path.join(bundles_dir, version)
+    if os.path.exists(path):
+        # Same model bytes written within the same second: identical bundle
+        shutil.rmtree(staging)
+    else:
+        os.replace(staging, path)
+    _write_text_atomic(os.path.join(bundles_dir, LATEST_FILE), version)
+    return path
+
+
+def latest_bundle(bundles_dir: str) -> Optional[str]:
+    """Path of the bundle named in `LATEST` (or the newest version directory), if any."""
+    if not os.path.isdir(bundles_dir):
+        return None
+
+    pointer = os.path.join(bundles_dir, LATEST_FILE)
+    if os.path.exists(pointer):
+        with open(pointer, encoding="utf-8") as f:
+            version = f.read().strip()
+        path = os.path.join(bundles_dir, version)
+        if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            return path
+
+    versions = list_bundles(bundles_dir)
+    return os.path.join(bundles_dir, versions[-1]) if versions else None
+
+
+def list_bundles(bundles_dir: str) -> List[str]:
+    """Version names of all complete bundles, oldest first (versions sort by time)."""
+    if not os.path.isdir(bundles_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(bundles_dir)
+        if not name.startswith(".") and os.path.exists(os.path.join(bundles_dir, name, MANIFEST_FILE))
+    )
+
+
+def load_bundle(path: str, verify: bool = True) -> ServingBundle:
+    """
+    Load a bundle directory, verifying file checksums against the manifest.
+
+    Raises:
+        FileNotFoundError: if the manifest or a payload file is missing.
+        RuntimeError: on checksum mismatch or an unsupported bundle format.
+    """
+    import xgboost
+
+    from src.data.feature_engineering import FeatureTransformer
+
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Bundle manifest not found at {manifest_path}")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise RuntimeError(f"Unsupported bundle format {manifest.get('format_version')} in {path}")
+
+    if verify:
+        for name, meta in manifest["files"].items():
+            file_path = os.path.join(path, name)
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Bundle file missing: {file_path}")
+            if _sha256(file_path) != meta["sha256"]:
+                raise RuntimeError(f"Checksum mismatch for {file_path}; bundle is corrupt or was modified")
+
+    with open(os.path.join(path, FEATURE_SPEC_FILE), encoding="utf-8") as f:
+        transformer = FeatureTransformer.from_spec(json.load(f))
+
+    model = xgboost.XGBClassifier()
+    model.load_model(os.path.join(path, MODEL_FILE))
+
+    if transformer.n_features != manifest["n_features"]:
+        raise RuntimeError(f"Feature spec has {transformer.n_features} columns, manifest says {manifest['n_features']}")
+
+    return ServingBundle(path, manifest, model, transformer)
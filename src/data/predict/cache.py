@@ -0,0 +1,151 @@
+"""
+In-memory LRU + TTL cache of churn probabilities.
+
+Entries are keyed by the raw bytes of the *canonical* feature vector: the float32
+row produced by the fitted FeatureTransformer. Two requests that differ only
+in key order, number formatting ("29.85" vs 29.85) or irrelevant extra fields
+encode to the same row and therefore share an entry. Each entry also records
+the model version that produced it, so a probability is never served by a
+different model; the whole cache is cleared on every model swap as well.
+
+Only the probability is cached - the prediction label is re-derived from the
+active model's threshold on every lookup.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+def row_keys(X: np.ndarray) -> list:
+    """
+    One bytes key per row of a 2-D float32 feature matrix.
+
+    Rows are canonicalized first (-0.0 -> 0.0) and the key is the row's raw
+    bytes, so a dict hit also compares the full row: two distinct rows can
+    never share a cached probability, whatever their hashes.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32) + np.float32(0.0)
+    width = X.shape[1] * X.itemsize
+    raw = X.tobytes()
+    return [raw[start:start + width] for start in range(0, len(raw), width)]
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of probabilities with per-entry time-to-live.
+
+    Args:
+        max_entries: Capacity; least recently used entries are evicted beyond it.
+        ttl_s: Seconds an entry stays valid (<= 0 disables expiry).
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_s: float = 300.0):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[str, float, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, version: str, keys: list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up `keys` for `version`.
+
+        Returns:
+            (proba, miss) - float64 probabilities (NaN where missing) and a boolean miss mask.
+        """
+        n = len(keys)
+        proba = np.full(n, np.nan, dtype=np.float64)
+        miss = np.ones(n, dtype=bool)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._entries
+            for i, key in enumerate(keys):
+                entry = entries.get(key)
+                if entry is None:
+                    continue
+                entry_version, value, expires_at = entry
+                if entry_version != version:
+                    continue
+                if expires_at and expires_at <= now:
+                    del entries[key]
+                    self._expirations += 1
+                    continue
+                entries.move_to_end(key)
+                proba[i] = value
+                miss[i] = False
+
+            hits = n - int(miss.sum())
+            self._hits += hits
+            self._misses += n - hits
+        return proba, miss
+
+    def put_many(self, version: str, keys: list, proba: np.ndarray) -> None:
+        """Store probabilities for `keys`, evicting least recently used entries past capacity."""
+        expires_at = time.monotonic() + self.ttl_s if self.ttl_s > 0 else 0.0
+        with self._lock:
+            entries = self._entries
+            for key, value in zip(keys, proba.tolist()):
+                entries[key] = (version, value, expires_at)
+                entries.move_to_end(key)
+            overflow = len(entries) - self.max_entries
+            for _ in range(max(overflow, 0)):
+                entries.popitem(last=False)
+            self._evictions += max(overflow, 0)
+
+    def clear(self) -> None:
+        """Drop every entry (called on model swap)."""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            entries = len(self._entries)
+            key_bytes = sys.getsizeof(next(iter(self._entries))) if entries else 0
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "approx_bytes": entries * (_ENTRY_BYTES + key_bytes) + sys.getsizeof(self._entries),
+            }
+
+
+def cache_from_env() -> Optional[PredictionCache]:
+    """Build the prediction cache from PREDICTION_CACHE_SIZE (0 disables) / PREDICTION_CACHE_TTL_S."""
+    size = int(os.getenv("PREDICTION_CACHE_SIZE", "100000"))
+    if size <= 0:
+        return None
+    return PredictionCache(max_entries=size, ttl_s=float(os.getenv("PREDICTION_CACHE_TTL_S", "300")))
+
+
+def _entry_bytes() -> int:
+    """Approximate resident size of one entry without its key: value tuple, floats and dict/LRU links."""
+    value = ("version", 0.5, 1.0)
+    # OrderedDict keeps a dict slot plus a doubly linked list node per key
+    return sys.getsizeof(value) + sys.getsizeof(0.5) * 2 + 104
+
+
+_ENTRY_BYTES = _entry_bytes()
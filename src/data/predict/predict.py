@@ -1,84 +1,273 @@
-import json
-import joblib
 import numpy as np
-import mlflow
 import pandas as pd
 import os
+import threading
+
+from src.data.predict.bundle import latest_bundle
+from src.data.predict.cache import cache_from_env, row_keys
+from src.data.predict.registry import ModelRegistry, ServingModel
+from src.utils.telemetry import telemetry
 
 # Compute project-root `artifacts` path (repo-root/artifacts)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 ARTIFACTS_DIR = os.path.join(project_root, "artifacts")
+BUNDLES_DIR = os.path.join(ARTIFACTS_DIR, "bundles")
 
-# Preprocessing artifact
-preprocess_path = os.path.join(ARTIFACTS_DIR, "preprocessing.pkl")
-if not os.path.exists(preprocess_path):
-    raise FileNotFoundError(
-        f"Preprocessing artifact not found at {preprocess_path}.\n"
-        "Run the training pipeline (e.g. `Scripts/run.py`) to generate artifacts/preprocessing.pkl"
-    )
+# Where to load the model from: "auto" (bundle if present, else MLflow), "bundle" or "mlflow"
+MODEL_SOURCE = os.getenv("CHURN_MODEL_SOURCE", "auto").lower()
+if MODEL_SOURCE not in ("auto", "bundle", "mlflow"):
+    raise RuntimeError(f"Unknown CHURN_MODEL_SOURCE '{MODEL_SOURCE}' (expected 'auto', 'bundle' or 'mlflow')")
+
+# Decision threshold for legacy artifacts written before preprocessing.pkl stored the
+# one selected in training; bundles carry their own
+THRESHOLD = 0.35
+
+def _load_legacy_artifacts():
+    """
+    Load preprocessing.pkl + the MLflow-format model in artifacts/model.
+
+    Used when no serving bundle exists (or CHURN_MODEL_SOURCE=mlflow). Imports
+    joblib and MLflow lazily so the bundle path never pays for them.
+    """
+    import joblib
+    import mlflow.sklearn
+
+    # Preprocessing artifact
+    preprocess_path = os.path.join(ARTIFACTS_DIR, "preprocessing.pkl")
+    if not os.path.exists(preprocess_path):
+        raise FileNotFoundError(
+            f"Preprocessing artifact not found at {preprocess_path}.\n"
+            "Run the training pipeline (e.g. `Scripts/run.py`) to generate artifacts/preprocessing.pkl"
+        )
+
+    try:
+        preprocessing = joblib.load(preprocess_path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load preprocessing artifact: {e}")
+
+    feature_columns = preprocessing.get("feature_columns")
+    if not feature_columns:
+        raise RuntimeError("`feature_columns` not found inside preprocessing artifact")
+
+    # Fitted FeatureTransformer (artifacts written before it existed fall back to zero-fill)
+    transformer = preprocessing.get("transformer")
+    if transformer is None:
+        print("⚠️  Warning: preprocessing artifact has no fitted transformer; re-run Scripts/run.py. "
+              "Falling back to zero-filling missing feature columns.")
+    elif transformer.feature_columns != list(feature_columns):
+        raise RuntimeError("Fitted transformer does not match `feature_columns` in preprocessing artifact")
+
+    # Load model from artifacts/model (saved during training)
+    model_path = os.path.join(ARTIFACTS_DIR, "model")
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(
+            f"Model artifact not found at {model_path}.\n"
+            "Ensure the training pipeline logged a model under artifacts/model or MLflow and copy it to artifacts/model"
+        )
+
+    try:
+        model = mlflow.sklearn.load_model(model_path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load model from {model_path}: {e}")
+
+    return model, list(feature_columns), transformer, preprocessing.get("threshold", THRESHOLD)
+
+# Inference engine: "xgboost" (booster.inplace_predict) or "numpy" (flat-array TreeEnsemble)
+PREDICT_ENGINE = os.getenv("PREDICT_ENGINE", "xgboost").lower()
+if PREDICT_ENGINE not in ("xgboost", "numpy"):
+    raise RuntimeError(f"Unknown PREDICT_ENGINE '{PREDICT_ENGINE}' (expected 'xgboost' or 'numpy')")
 
-try:
-    preprocessing = joblib.load(preprocess_path)
-except Exception as e:
-    raise RuntimeError(f"Failed to load preprocessing artifact: {e}")
+# Number of model versions kept resident for instant rollback
+MODEL_KEEP_VERSIONS = int(os.getenv("MODEL_KEEP_VERSIONS", "3"))
 
-feature_columns = preprocessing.get("feature_columns")
-if not feature_columns:
-    raise RuntimeError("`feature_columns` not found inside preprocessing artifact")
+# === Model registry: versioned bundles first, MLflow model as fallback ===
+registry = ModelRegistry(BUNDLES_DIR, keep=MODEL_KEEP_VERSIONS, engine=PREDICT_ENGINE)
 
-# Load model from artifacts/model (saved during training)
-model_path = os.path.join(ARTIFACTS_DIR, "model")
-if not os.path.exists(model_path):
+bundle_path = latest_bundle(BUNDLES_DIR) if MODEL_SOURCE != "mlflow" else None
+if bundle_path is None and MODEL_SOURCE == "bundle":
     raise FileNotFoundError(
-        f"Model artifact not found at {model_path}.\n"
-        "Ensure the training pipeline logged a model under artifacts/model or MLflow and copy it to artifacts/model"
+        f"No serving bundle found under {BUNDLES_DIR}. Run `Scripts/run.py` to write one."
     )
 
-try:
-    model = mlflow.sklearn.load_model(model_path)
-except Exception as e:
-    raise RuntimeError(f"Failed to load model from {model_path}: {e}")
+if bundle_path is not None:
+    registry.load(os.path.basename(bundle_path))
+else:
+    _model, _feature_columns, _transformer, _threshold = _load_legacy_artifacts()
+    registry.register(ServingModel(
+        "mlflow-local", _model, _transformer, _feature_columns, _threshold, engine=PREDICT_ENGINE,
+    ))
 
-def predict_single(input_dict: dict):
+# === Prediction cache: repeat lookups skip model evaluation; cleared on every model swap ===
+cache = cache_from_env()
+if cache is not None:
+    registry.add_listener(lambda old, new: cache.clear())
+
+def _align_features(m: ServingModel, df: pd.DataFrame) -> pd.DataFrame:
     """
-    Applies training-time feature transformations and prediction.
+    Turn raw records into the model's feature matrix (exact `feature_columns` order).
     """
-    df = pd.DataFrame([input_dict])
+    if m.transformer is not None:
+        return m.transformer.transform(df)
+
+    df = df.copy()
 
     # Add missing columns
-    for col in feature_columns:
+    for col in m.feature_columns:
         if col not in df.columns:
             df[col] = 0
 
-    df = df[feature_columns]  # keep order
+    return df[m.feature_columns]  # keep order
+
+# One reusable (1, n_features) float32 row per serving thread
+_row_buffers = threading.local()
+
+def _row_buffer(n_features: int) -> np.ndarray:
+    row = getattr(_row_buffers, "row", None)
+    if row is None or row.shape[1] != n_features:
+        row = np.zeros((1, n_features), dtype=np.float32)
+        _row_buffers.row = row
+    return row
+
+def _score_rows(m: ServingModel, X: np.ndarray) -> np.ndarray:
+    """
+    Churn probabilities for a float32 feature matrix, evaluating only the
+    rows missing from the prediction cache.
+    """
+    telemetry.observe_batch(len(X))
+    if cache is None:
+        with telemetry.stage("inference"):
+            return m.predict_proba(X)
+
+    keys = row_keys(X)
+    proba, miss = cache.get_many(m.version, keys)
+    if miss.any():
+        miss_idx = np.flatnonzero(miss)
+        with telemetry.stage("inference"):
+            fresh = m.predict_proba(X if len(miss_idx) == len(keys) else X[miss_idx])
+        proba[miss_idx] = fresh
+        cache.put_many(m.version, [keys[i] for i in miss_idx], fresh)
+    return proba
+
+def predict_single(input_dict: dict):
+    """
+    Applies training-time feature transformations and prediction.
+
+    Fast path: the request dict is written straight into a preallocated
+    float32 row in `feature_columns` order and scored with the booster's
+    in-place prediction, with no DataFrame or DMatrix construction.
+    """
+    m = registry.active
+    if m.transformer is None:
+        return predict_single_frame(input_dict)
 
-    proba = model.predict_proba(df)[0][1]
-    pred = int(proba >= 0.35)
+    row = _row_buffer(m.n_features)
+    with telemetry.stage("feature_alignment"):
+        m.transformer.transform_record(input_dict, out=row[0])
+    proba = _score_rows(m, row)[0]
 
     return {
         "probability_churn": float(proba),
-        "prediction": pred
+        "prediction": int(proba >= m.threshold),
+        "model_version": m.version
     }
 
-def predict_batch(input_df: pd.DataFrame):
+def predict_single_frame(input_dict: dict):
     """
-    Applies training-time feature transformations and prediction.
+    Reference single-row path through pandas and the sklearn wrapper.
+
+    Kept for parity checks and for `Scripts/benchmark_predict_single.py`.
     """
-    df = input_df.copy()
+    m = registry.active
+    df = _align_features(m, pd.DataFrame([input_dict]))
 
-    # Add missing columns
-    for col in feature_columns:
-        if col not in df.columns:
-            df[col] = 0
+    proba = m.model.predict_proba(df)[0][1]
+    pred = int(proba >= m.threshold)
+
+    return {
+        "probability_churn": float(proba),
+        "prediction": pred,
+        "model_version": m.version
+    }
+
+def predict_records(records: list):
+    """
+    Score a list of raw record dicts as one feature matrix.
+
+    Batch counterpart of `predict_single` (used by the API micro-batcher):
+    every record is encoded into its own row of a single float32 matrix
+    and the whole matrix goes through one booster call.
+    """
+    m = registry.active
+    if m.transformer is None:
+        result = predict_batch(pd.DataFrame(records))
+        result["model_version"] = result.attrs["model_version"]
+        return result.to_dict(orient="records")
 
-    df = df[feature_columns]  # keep order
+    with telemetry.stage("feature_alignment"):
+        X = np.zeros((len(records), m.n_features), dtype=np.float32)
+        for i, record in enumerate(records):
+            m.transformer.transform_record(record, out=X[i])
+    proba = _score_rows(m, X)
 
-    proba = model.predict_proba(df)[:, 1]
-    pred = (proba >= 0.35).astype(int)
+    return [
+        {"probability_churn": float(p), "prediction": int(p >= m.threshold), "model_version": m.version}
+        for p in proba
+    ]
 
-    return pd.DataFrame({
+def predict_table(table):
+    """
+    Score a `pyarrow.Table` of raw records and return an Arrow table.
+
+    Columnar path for Arrow / Parquet payloads: columns are encoded straight
+    into the float32 feature matrix without building per-row Python objects.
+    The model version is stored in the schema metadata.
+    """
+    import pyarrow as pa
+
+    m = registry.active
+    if m.transformer is None:
+        result = predict_batch(table.to_pandas())
+        return pa.Table.from_pandas(result, preserve_index=False).replace_schema_metadata(
+            {"model_version": result.attrs["model_version"]}
+        )
+
+    with telemetry.stage("feature_alignment"):
+        X = m.transformer.transform_arrow(table)
+    proba = _score_rows(m, X)
+
+    return pa.table(
+        {
+            "probability_churn": pa.array(proba, type=pa.float32()),
+            "prediction": pa.array((proba >= m.threshold).astype(np.int8)),
+        },
+        metadata={"model_version": m.version},
+    )
+
+def predict_batch(input_df: pd.DataFrame):
+    """
+    Applies training-time feature transformations and prediction.
+
+    Rows already in the prediction cache are not re-scored. The serving model
+    version is returned in `result.attrs["model_version"]`.
+    """
+    m = registry.active
+    with telemetry.stage("feature_alignment"):
+        df = _align_features(m, input_df)
+
+    if m.transformer is not None:
+        proba = _score_rows(m, df.to_numpy(dtype=np.float32))
+    else:
+        telemetry.observe_batch(len(df))
+        with telemetry.stage("inference"):
+            if m.tree_engine is not None:
+                proba = m.tree_engine.predict_proba(df.to_numpy(dtype=np.float32))
+            else:
+                proba = m.model.predict_proba(df)[:, 1]
+    pred = (proba >= m.threshold).astype(int)
+
+    result = pd.DataFrame({
         "probability_churn": proba,
         "prediction": pred
     })
-    
-
+    result.attrs["model_version"] = m.version
+    return result
@@ -0,0 +1,273 @@
+"""
+In-process, hot-reloadable model registry.
+
+The registry keeps up to `keep` model versions resident and exposes one of
+them as `active`. New versions are loaded, warmed up and registered on a
+background thread, then swapped in with a single reference assignment, so
+requests in flight keep using the model they started with and nothing
+blocks. Older resident versions stay loaded for instant rollback.
+
+New versions are picked up either by `watch()` (polls `artifacts/bundles`
+for a new LATEST bundle) or by an explicit `reload()` (admin endpoint).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.data.predict.bundle import latest_bundle, list_bundles, load_bundle
+from src.data.predict.tree_engine import TreeEnsemble
+
+
+class ServingModel:
+    """One loaded model version with everything needed to score it."""
+
+    def __init__(
+        self,
+        version: str,
+        model: Any,
+        transformer: Any,
+        feature_columns: List[str],
+        threshold: float,
+        engine: str = "xgboost",
+        path: Optional[str] = None,
+        manifest: Optional[Dict[str, Any]] = None,
+    ):
+        self.version = version
+        self.model = model
+        self.booster = model.get_booster()
+        self.transformer = transformer
+        self.feature_columns = list(feature_columns)
+        self.threshold = float(threshold)
+        self.engine = engine
+        self.path = path
+        self.manifest = manifest or {}
+        self.tree_engine = TreeEnsemble.from_booster(self.booster) if engine == "numpy" else None
+        self.loaded_at = time.time()
+
+    @classmethod
+    def from_bundle(cls, path: str, engine: str = "xgboost") -> "ServingModel":
+        bundle = load_bundle(path)
+        return cls(
+            bundle.version, bundle.model, bundle.transformer, bundle.feature_columns,
+            bundle.threshold, engine=engine, path=path, manifest=bundle.manifest,
+        )
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_columns)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Churn probability for a float32 feature matrix, using the selected engine."""
+        if self.tree_engine is not None:
+            return self.tree_engine.predict_proba(X)
+        return self.booster.inplace_predict(X)
+
+    def warm_up(self) -> None:
+        """Exercise the scoring paths once so the first real request pays no setup cost."""
+        if self.transformer is not None:
+            self.transformer.transform_record({})
+        for rows in (1, 64):
+            self.predict_proba(np.zeros((rows, self.n_features), dtype=np.float32))
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "engine": self.engine,
+            "threshold": self.threshold,
+            "n_features": self.n_features,
+            "path": self.path,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class ModelRegistry:
+    """
+    Versioned set of resident `ServingModel`s with one active version.
+
+    Args:
+        bundles_dir: Directory holding versioned serving bundles.
+        keep: Number of versions kept resident (the active one is never evicted).
+        engine: Inference engine passed to every loaded `ServingModel`.
+    """
+
+    def __init__(self, bundles_dir: str, keep: int = 3, engine: str = "xgboost"):
+        if keep < 1:
+            raise ValueError("keep must be >= 1")
+        self.bundles_dir = bundles_dir
+        self.keep = keep
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[str, ServingModel]" = OrderedDict()
+        self._active: Optional[ServingModel] = None
+        self._history: List[str] = []
+        self._loading: Dict[str, Future] = {}
+        self._failed: Dict[str, str] = {}
+        self._listeners: List[Callable[[Optional[ServingModel], ServingModel], None]] = []
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-loader")
+        self._watch_stop: Optional[threading.Event] = None
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    @property
+    def active(self) -> ServingModel:
+        """The model serving requests right now (lock-free). Grab it once per request."""
+        model = self._active
+        if model is None:
+            raise RuntimeError("No model version is active")
+        return model
+
+    def status(self) -> Dict[str, Any]:
+        # Snapshot under the lock: the loader thread mutates these dicts while we iterate
+        with self._lock:
+            active = self._active
+            resident = list(self._models.values())
+            loading = list(self._loading.items())
+            failed = dict(self._failed)
+        return {
+            "active": active.version if active else None,
+            "resident": [m.info() for m in resident],
+            "available": list_bundles(self.bundles_dir),
+            "loading": sorted(v for v, f in loading if not f.done()),
+            "failed": failed,
+            "keep": self.keep,
+        }
+
+    # ---------------------------
+    # Mutations
+    # ---------------------------
+    def add_listener(self, callback: Callable[[Optional[ServingModel], ServingModel], None]) -> None:
+        """Register `callback(old, new)`, called after every activation (e.g. cache invalidation)."""
+        self._listeners.append(callback)
+
+    def register(self, model: ServingModel, activate: bool = True) -> ServingModel:
+        """Add an already-loaded model (warming it up first) and optionally activate it."""
+        model.warm_up()
+        with self._lock:
+            self._models[model.version] = model
+            self._models.move_to_end(model.version)
+        if activate:
+            self.activate(model.version)
+        self._evict()
+        return model
+
+    def activate(self, version: str) -> ServingModel:
+        """Atomically make a resident version the active one."""
+        with self._lock:
+            model = self._models.get(version)
+            if model is None:
+                raise KeyError(f"Model version '{version}' is not resident")
+            old = self._active
+            if old is not None and old.version == version:
+                return model
+            self._active = model  # single reference assignment: the swap
+            self._history.append(version)
+            del self._history[:-self.keep]  # only resident versions can be rolled back to
+        print(f"🔁 Active model version: {version}" + (f" (was {old.version})" if old else ""))
+        for callback in self._listeners:
+            callback(old, model)
+        return model
+
+    def rollback(self, version: Optional[str] = None) -> ServingModel:
+        """Re-activate `version`, or the most recent previously active resident version."""
+        if version is None:
+            with self._lock:
+                current = self._active.version if self._active else None
+                candidates = [v for v in reversed(self._history) if v != current and v in self._models]
+            if not candidates:
+                raise KeyError("No previous model version is resident to roll back to")
+            version = candidates[0]
+        return self.activate(version)
+
+    def load(self, version: Optional[str] = None, activate: bool = True) -> ServingModel:
+        """Load a bundle version (default: LATEST) synchronously; reuses it if resident."""
+        path = self._resolve(version)
+        name = os.path.basename(path)
+        with self._lock:
+            resident = self._models.get(name)
+        if resident is not None:
+            return self.activate(name) if activate else resident
+        try:
+            model = ServingModel.from_bundle(path, engine=self.engine)
+        except Exception as e:
+            with self._lock:
+                self._failed[name] = str(e)
+            raise
+        with self._lock:
+            self._failed.pop(name, None)
+        return self.register(model, activate=activate)
+
+    def reload(self, version: Optional[str] = None, activate: bool = True) -> Future:
+        """Load + warm up + swap on the background loader thread; returns its Future."""
+        name = os.path.basename(self._resolve(version))
+        with self._lock:
+            pending = self._loading.get(name)
+            if pending is not None and not pending.done():
+                return pending
+            future = self._loader.submit(self.load, name, activate)
+            self._loading[name] = future
+        return future
+
+    # ---------------------------
+    # Directory watcher
+    # ---------------------------
+    def watch(self, interval: float = 30.0) -> None:
+        """Poll the bundles directory and hot-swap when LATEST points at a new version."""
+        if self._watch_stop is not None:
+            return
+        stop = threading.Event()
+        self._watch_stop = stop
+
+        def poll() -> None:
+            while not stop.wait(interval):
+                try:
+                    path = latest_bundle(self.bundles_dir)
+                    if path is None:
+                        continue
+                    name = os.path.basename(path)
+                    with self._lock:
+                        active = self._active
+                        # Skip versions already served/resident or known to be broken
+                        known = name in self._models or name in self._failed
+                    if (active and active.version == name) or known:
+                        continue
+                    print(f"👀 New model bundle detected: {name}")
+                    self.reload(name)
+                except Exception as e:
+                    print(f"⚠️  Warning: model watcher error: {e}")
+
+        threading.Thread(target=poll, name="model-watcher", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+    def _resolve(self, version: Optional[str]) -> str:
+        if version is None:
+            path = latest_bundle(self.bundles_dir)
+            if path is None:
+                raise FileNotFoundError(f"No serving bundle found under {self.bundles_dir}")
+            return path
+        path = os.path.join(self.bundles_dir, os.path.basename(version))
+        with self._lock:
+            resident = version in self._models
+        if not resident and not os.path.isdir(path):
+            raise FileNotFoundError(f"Model bundle '{version}' not found under {self.bundles_dir}")
+        return path
+
+    def _evict(self) -> None:
+        with self._lock:
+            active = self._active.version if self._active else None
+            while len(self._models) > self.keep:
+                oldest = next(v for v in self._models if v != active)
+                del self._models[oldest]
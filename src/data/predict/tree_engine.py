@@ -0,0 +1,169 @@
+"""
+NumPy inference engine for the trained XGBoost ensemble.
+
+The booster's trees are exported once into flat NumPy arrays (feature index,
+threshold, children, missing-value direction, leaf value) and whole batches
+are evaluated with vectorized level-by-level traversal: at each depth level
+every (row, tree) pair advances one node with a handful of array gathers.
+No sklearn wrapper, DMatrix or per-call C++ round trip is involved.
+
+Select it for serving with `PREDICT_ENGINE=numpy`; outputs match
+`XGBClassifier.predict_proba` to within float32 rounding.
+"""
+
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class TreeEnsemble:
+    """
+    Flat-array form of a `binary:logistic` XGBoost booster.
+
+    All trees are concatenated into one node table; node ids are global.
+    Leaves point to themselves and always "go left" (threshold = +inf), so the
+    traversal loop needs no leaf special-casing: after `max_depth` steps every
+    (row, tree) cursor rests on its leaf.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_margin: float,
+        n_features: int,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        # Interleaved [left, right] children: next node = children[2 * node + go_right]
+        self.children = np.stack([left, right], axis=1).ravel()
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self.n_features = n_features
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_booster(cls, booster: Any) -> "TreeEnsemble":
+        """Export an `xgboost.Booster` (or anything with `save_raw`) into flat arrays."""
+        model = json.loads(bytes(booster.save_raw("json")))
+        return cls.from_model_json(model)
+
+    @classmethod
+    def from_model_json(cls, model: Dict[str, Any]) -> "TreeEnsemble":
+        learner = model["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"TreeEnsemble only supports binary:logistic boosters, got {objective}")
+
+        gbtree = learner["gradient_booster"]
+        if gbtree.get("name") != "gbtree":
+            raise ValueError(f"TreeEnsemble only supports gbtree boosters, got {gbtree.get('name')}")
+        trees: List[Dict[str, Any]] = gbtree["model"]["trees"]
+
+        feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if tree.get("categories_nodes"):
+                raise ValueError("TreeEnsemble does not support categorical splits")
+
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            is_leaf = lc == -1
+            local = np.arange(len(lc), dtype=np.int64)
+            cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+
+            feature.append(np.where(is_leaf, 0, np.asarray(tree["split_indices"], dtype=np.int64)))
+            # Leaves: +inf threshold (always "left") and self-loops
+            threshold.append(np.where(is_leaf, np.float32(np.inf), cond))
+            left.append(np.where(is_leaf, local, lc) + offset)
+            right.append(np.where(is_leaf, local, rc) + offset)
+            default_left.append(np.where(is_leaf, True, np.asarray(tree["default_left"], dtype=bool)))
+            # For leaf nodes XGBoost stores the leaf value in split_conditions
+            value.append(np.where(is_leaf, cond, np.float32(0.0)))
+            roots.append(offset)
+
+            max_depth = max(max_depth, _tree_depth(lc, rc))
+            offset += len(lc)
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        return cls(
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float32),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value).astype(np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            base_margin=float(np.log(base_score / (1.0 - base_score))),
+            n_features=int(learner["learner_model_param"]["num_feature"]),
+        )
+
+    def predict_margin(self, X: np.ndarray, chunk_rows: int = 256) -> np.ndarray:
+        """Raw margin (log-odds) for each row of a 2-D feature matrix."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected a (n, {self.n_features}) matrix, got shape {X.shape}")
+
+        out = np.empty(X.shape[0], dtype=np.float64)
+        # Chunking keeps the (rows x trees) cursor matrices cache-sized
+        for start in range(0, X.shape[0], chunk_rows):
+            block = X[start:start + chunk_rows]
+            out[start:start + len(block)] = self._margin_block(block)
+        return out
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probability of the positive class (churn) for each row."""
+        return 1.0 / (1.0 + np.exp(-self.predict_margin(X)))
+
+    def _margin_block(self, X: np.ndarray) -> np.ndarray:
+        n = X.shape[0]
+        flat = X.ravel()
+        has_missing = bool(np.isnan(flat).any())
+        row_base = (np.arange(n, dtype=np.int64) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (n, self.n_trees)).copy()
+
+        # === Level-by-level traversal ===
+        for _ in range(self.max_depth):
+            x = flat[row_base + self.feature[nodes]]
+            # NaN compares False, i.e. "right"; flip to left where the split's default is left
+            go_right = ~(x < self.threshold[nodes])
+            if has_missing:
+                go_right &= ~(np.isnan(x) & self.default_left[nodes])
+            nodes = self.children[2 * nodes + go_right]
+
+        return self.value[nodes].sum(axis=1, dtype=np.float64) + self.base_margin
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Depth (number of edges on the longest root-to-leaf path) of one tree."""
+    depth = np.zeros(len(left), dtype=np.int64)
+    # XGBoost numbers children after their parents, so one forward pass suffices
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def _parse_base_score(raw: Any) -> float:
+    """`base_score` is a plain number in older models and "[x]" in XGBoost >= 3."""
+    if isinstance(raw, str):
+        raw = raw.strip().strip("[]").split(",")[0]
+    return float(raw)
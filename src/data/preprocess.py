@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 
 
-def preprocess_data(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame:
+def preprocess_data(df: pd.DataFrame, target_col: str = "Churn", compact: bool = False) -> pd.DataFrame:
     """
     Basic cleaning for Telco churn.
     - trim column names
@@ -9,6 +10,8 @@ def preprocess_data(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame
     - fix TotalCharges to numeric
     - map target Churn to 0/1 
     - simple NA handling
+    - compact=True: also shrink dtypes (see `compact_dtypes`) and drop ID
+      columns in place instead of copying the frame (the input is modified)
     """
     # tidy headers
     df.columns = df.columns.str.strip()  # Remove leading/trailing whitespace
@@ -16,15 +19,23 @@ def preprocess_data(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame
     # drop ids if present
     for col in ["customerID", "CustomerID", "customer_id"]:
         if col in df.columns:
-            df = df.drop(columns=[col])
+            if compact:
+                df.drop(columns=[col], inplace=True)
+            else:
+                df = df.drop(columns=[col])
 
-    # target to 0/1 if it's Yes/No
-    if target_col in df.columns and df[target_col].dtype == "object":
-        df[target_col] = df[target_col].str.strip().map({"No": 0, "Yes": 1})
+    # target to 0/1 if it's Yes/No (plain strings, or `category` from a typed load)
+    if target_col in df.columns and _is_text(df[target_col]):
+        target = _map_unique(df[target_col], lambda u: u.astype(str).str.strip().map({"No": 0, "Yes": 1}))
+        df[target_col] = target.astype("int64") if not target.isna().any() else target
 
     # TotalCharges often has blanks in this dataset -> coerce to float
+    # (float64 also when a typed load delivered it as a nullable string column)
     if "TotalCharges" in df.columns:
-        df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+        if _is_text(df["TotalCharges"]):
+            df["TotalCharges"] = _map_unique(df["TotalCharges"], lambda u: pd.to_numeric(u, errors="coerce"))
+        else:
+            df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce").astype("float64")
 
     # SeniorCitizen should be 0/1 ints if present
     if "SeniorCitizen" in df.columns:
@@ -36,4 +47,49 @@ def preprocess_data(df: pd.DataFrame, target_col: str = "Churn") -> pd.DataFrame
     num_cols = df.select_dtypes(include=["number"]).columns
     df[num_cols] = df[num_cols].fillna(0)
 
+    if compact:
+        compact_dtypes(df)
+
+    return df
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink dtypes in place, without changing any value:
+    - object / string columns -> `category`
+    - integers -> the narrowest integer type holding their range (int8 / int16 ...)
+    - floats -> float32 only where every value round-trips exactly
+    Column by column, so only one column is ever held twice.
+    """
+    for c in df.columns:
+        s = df[c]
+        if s.dtype == "object" or (pd.api.types.is_string_dtype(s.dtype) and not isinstance(s.dtype, pd.CategoricalDtype)):
+            df[c] = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s.dtype) and not pd.api.types.is_extension_array_dtype(s.dtype):
+            df[c] = pd.to_numeric(s, downcast="integer")
+        elif s.dtype == np.float64:
+            narrow = s.to_numpy(dtype=np.float32)
+            if np.array_equal(narrow.astype(np.float64), s.to_numpy(), equal_nan=True):
+                df[c] = narrow
     return df
+
+
+def _map_unique(s: pd.Series, fn) -> pd.Series:
+    """
+    Apply `fn` to the distinct values of a text column only and broadcast the
+    float64 result back by code: the same result as `fn(s)`, without building
+    a Python string per row. Missing values map to NaN.
+    """
+    codes, uniques = pd.factorize(s)
+    values = pd.to_numeric(fn(pd.Series(uniques)), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    # code -1 (missing) picks the trailing NaN
+    return pd.Series(np.append(values, np.nan)[codes], index=s.index, name=s.name)
+
+
+def _is_text(s: pd.Series) -> bool:
+    """True for object, string and categorical columns."""
+    return (
+        s.dtype == "object"
+        or isinstance(s.dtype, pd.CategoricalDtype)
+        or pd.api.types.is_string_dtype(s.dtype)
+    )
@@ -1,5 +1,384 @@
+import numpy as np
 import pandas as pd
-from typing import Tuple, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# === Declarative Telco validation spec ===
+# Rules are evaluated in this order and produce exactly the failure strings of
+# the original hand-written checks:
+#   required        -> missing_column:<col> / nulls_in_column:<col>
+#   allowed_values  -> invalid_values_in_<col>:<fraction>
+#   numeric_range   -> non_numeric:<col> (or a warning), else <message> when out of bounds
+#   min_proportion  -> <message>:<proportion> when left >= right holds for too few rows
+TELCO_VALIDATION_SPEC: List[Dict[str, Any]] = [
+    {"rule": "required", "columns": [
+        "customerID", "gender", "Partner", "Dependents", "PhoneService",
+        "InternetService", "Contract", "tenure", "MonthlyCharges", "TotalCharges", "Churn",
+    ]},
+    {"rule": "allowed_values", "column": "gender", "values": ["Male", "Female"]},
+    {"rule": "allowed_values", "column": "Partner", "values": ["Yes", "No"]},
+    {"rule": "allowed_values", "column": "Dependents", "values": ["Yes", "No"]},
+    {"rule": "allowed_values", "column": "PhoneService", "values": ["Yes", "No"]},
+    {"rule": "allowed_values", "column": "Contract", "values": ["Month-to-month", "One year", "Two year"]},
+    {"rule": "allowed_values", "column": "InternetService", "values": ["DSL", "Fiber optic", "No"]},
+    {"rule": "numeric_range", "column": "tenure", "min": 0, "max": 120, "message": "tenure_out_of_bounds"},
+    {"rule": "numeric_range", "column": "MonthlyCharges", "min": 0, "max": 200,
+     "message": "MonthlyCharges_out_of_bounds"},
+    # The original dataset has some blank TotalCharges entries; warn but don't fail
+    {"rule": "numeric_range", "column": "TotalCharges", "min": 0, "message": "TotalCharges_negative",
+     "non_numeric": "warn",
+     "warning": "TotalCharges has non-numeric values; will be handled in preprocessing"},
+    {"rule": "min_proportion", "left": "TotalCharges", "op": ">=", "right": "MonthlyCharges",
+     "min": 0.9, "message": "total_vs_monthly_ratio"},
+]
+
+
+class _Check:
+    """One compiled check: owns one row of the plan's mask matrix (one bitmap bit)."""
+
+    def __init__(self, name: str, rule: Dict[str, Any], kind: str, column: Optional[str] = None, gate: Optional[int] = None):
+        self.name = name
+        self.rule = rule
+        self.kind = kind
+        self.column = column
+        # Index of a check that must have no violations for this one to be reported
+        self.gate = gate
+
+
+class ValidationStats:
+    """
+    Mergeable running aggregates of a `ValidationPlan` over one or more chunks.
+
+    Per check: violation count and whether its column(s) were present; for
+    proportion checks the number of rows where both operands parsed; for
+    range checks the min/max of the parsed values. Merging is associative and
+    commutative, so chunks can be evaluated in any order or in parallel and
+    still summarize to exactly the in-memory result.
+    """
+
+    def __init__(self, checks: List[str]):
+        k = len(checks)
+        self.checks = checks
+        self.rows = 0
+        self.counts = np.zeros(k, dtype=np.int64)
+        self.present = np.ones(k, dtype=bool)
+        self.valid = np.zeros(k, dtype=np.int64)
+        self.minimum = np.full(k, np.inf)
+        self.maximum = np.full(k, -np.inf)
+
+    def merge(self, other: "ValidationStats") -> "ValidationStats":
+        if other.checks != self.checks:
+            raise ValueError("Cannot merge statistics of different validation plans")
+        self.rows += other.rows
+        self.counts += other.counts
+        self.present &= other.present
+        self.valid += other.valid
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        return self
+
+    def value_ranges(self) -> Dict[str, Tuple[float, float]]:
+        """Parsed (min, max) per range-checked column, for columns with any numeric value."""
+        return {
+            name.split(":", 1)[1]: (float(self.minimum[i]), float(self.maximum[i]))
+            for i, name in enumerate(self.checks)
+            if name.startswith("out_of_bounds:") and self.minimum[i] <= self.maximum[i]
+        }
+
+
+class ValidationResult:
+    """
+    Outcome of a `ValidationPlan` run.
+
+    `success` / `failed` are the classic summary and `stats` the aggregates
+    they were derived from. For in-memory runs `bitmap` holds one bit per
+    check per row (`checks[i]` is bit i), packed little-endian into
+    `bitmap.shape[1]` bytes per row; streaming runs have no bitmap.
+    """
+
+    def __init__(self, failed: List[str], warnings: List[str], stats: ValidationStats, bitmap: Optional[np.ndarray] = None):
+        self.failed = failed
+        self.warnings = warnings
+        self.stats = stats
+        self.checks = stats.checks
+        self.bitmap = bitmap
+        self.counts = dict(zip(stats.checks, stats.counts.tolist()))
+
+    @property
+    def success(self) -> bool:
+        return len(self.failed) == 0
+
+    def violations(self, check: str) -> np.ndarray:
+        """Boolean row mask for one named check."""
+        if self.bitmap is None:
+            raise ValueError("Streaming validation results carry no per-row bitmap")
+        bit = self.checks.index(check)
+        return ((self.bitmap[:, bit // 8] >> (bit % 8)) & 1).astype(bool)
+
+    def invalid_rows(self) -> np.ndarray:
+        """Boolean row mask of rows violating at least one check."""
+        if self.bitmap is None:
+            raise ValueError("Streaming validation results carry no per-row bitmap")
+        return self.bitmap.any(axis=1)
+
+
+class ValidationPlan:
+    """
+    Validation spec compiled into a vectorized plan.
+
+    Every referenced column is converted once (null mask, category or
+    factorized codes, float values) and shared by all checks that need it; all checks then fill
+    one (n_checks x n_rows) boolean mask matrix, which is summarized with a
+    single reduction and packed into the per-row bitmap.
+    """
+
+    def __init__(self, spec: List[Dict[str, Any]]):
+        self.spec = spec
+        self.checks: List[_Check] = []
+        for rule in spec:
+            kind = rule["rule"]
+            if kind == "required":
+                for col in rule["columns"]:
+                    self.checks.append(_Check(f"nulls:{col}", rule, "nulls", col))
+            elif kind == "allowed_values":
+                self.checks.append(_Check(f"invalid:{rule['column']}", rule, "allowed_values", rule["column"]))
+            elif kind == "numeric_range":
+                col = rule["column"]
+                self.checks.append(_Check(f"non_numeric:{col}", rule, "non_numeric", col))
+                self.checks.append(_Check(f"out_of_bounds:{col}", rule, "range", col, gate=len(self.checks) - 1))
+            elif kind == "min_proportion":
+                if rule["op"] != ">=":
+                    raise ValueError(f"Unsupported min_proportion op '{rule['op']}'")
+                self.checks.append(_Check(f"ratio:{rule['left']}_vs_{rule['right']}", rule, "proportion"))
+            else:
+                raise ValueError(f"Unknown validation rule '{kind}'")
+
+        # Columns whose values (not just nulls) are inspected: factorized once if text
+        self.coded_columns = {c.column for c in self.checks if c.kind in ("allowed_values", "non_numeric")}
+
+    @property
+    def check_names(self) -> List[str]:
+        return [c.name for c in self.checks]
+
+    def evaluate(self, df: pd.DataFrame) -> ValidationResult:
+        """Validate a complete frame: summary plus per-row violation bitmap."""
+        masks, stats = self._masks(df)
+        failed, warnings = self.summarize(stats)
+        bitmap = np.ascontiguousarray(np.packbits(masks, axis=0, bitorder="little").T)
+        return ValidationResult(failed, warnings, stats, bitmap)
+
+    def partial(self, df: pd.DataFrame) -> ValidationStats:
+        """Mergeable statistics of one chunk (see `validate_stream`)."""
+        return self._masks(df)[1]
+
+    def empty_stats(self) -> ValidationStats:
+        return ValidationStats(self.check_names)
+
+    def _masks(self, df: pd.DataFrame) -> Tuple[np.ndarray, ValidationStats]:
+        n = len(df)
+        cols = _ColumnCache(df, self.coded_columns)
+        masks = np.zeros((len(self.checks), n), dtype=bool)
+        stats = self.empty_stats()
+        stats.rows = n
+
+        # === Fill the mask matrix (one row per check) ===
+        for i, check in enumerate(self.checks):
+            if check.kind == "proportion":
+                left, right = check.rule["left"], check.rule["right"]
+                stats.present[i] = left in df.columns and right in df.columns
+                if stats.present[i]:
+                    lv, rv = cols.numeric(left), cols.numeric(right)
+                    both = ~np.isnan(lv) & ~np.isnan(rv)
+                    masks[i] = both & ~(lv >= rv)
+                    stats.valid[i] = int(both.sum())
+                continue
+
+            stats.present[i] = check.column in df.columns
+            if not stats.present[i]:
+                continue
+            if check.kind == "nulls":
+                masks[i] = cols.isnull(check.column)
+            elif check.kind == "allowed_values":
+                masks[i] = ~cols.isin(check.column, check.rule["values"])
+            elif check.kind == "non_numeric":
+                masks[i] = np.isnan(cols.numeric(check.column))
+            elif check.kind == "range":
+                values = cols.numeric(check.column)
+                bad = np.zeros(n, dtype=bool)
+                if check.rule.get("min") is not None:
+                    bad |= values < check.rule["min"]
+                if check.rule.get("max") is not None:
+                    bad |= values > check.rule["max"]
+                masks[i] = bad
+                if n and not np.isnan(values).all():
+                    stats.minimum[i], stats.maximum[i] = np.nanmin(values), np.nanmax(values)
+
+        stats.counts[:] = masks.sum(axis=1)
+        return masks, stats
+
+    def summarize(self, stats: ValidationStats) -> Tuple[List[str], List[str]]:
+        """(failed, warnings) in spec order, with the same messages as the original checks."""
+        counts, present = stats.counts, stats.present
+        failed: List[str] = []
+        warnings: List[str] = []
+        for i, check in enumerate(self.checks):
+            rule = check.rule
+            if check.kind == "nulls":
+                if not present[i]:
+                    failed.append(f"missing_column:{check.column}")
+                elif counts[i]:
+                    failed.append(f"nulls_in_column:{check.column}")
+            elif not present[i]:
+                continue
+            elif check.kind == "allowed_values":
+                if counts[i]:
+                    failed.append(f"invalid_values_in_{check.column}:{counts[i] / stats.rows:.2f}")
+            elif check.kind == "non_numeric":
+                if counts[i]:
+                    if rule.get("non_numeric", "fail") == "warn":
+                        warnings.append(rule["warning"])
+                    else:
+                        failed.append(f"non_numeric:{check.column}")
+            elif check.kind == "range":
+                # Bounds are only judged when every value parsed as a number
+                if counts[i] and not counts[check.gate]:
+                    failed.append(rule["message"])
+            elif check.kind == "proportion":
+                if stats.valid[i]:
+                    proportion = float(stats.valid[i] - counts[i]) / stats.valid[i]
+                    if proportion < rule["min"]:
+                        failed.append(f"{rule['message']}:{proportion:.2f}")
+        return failed, warnings
+
+
+class _ColumnCache:
+    """
+    Per-evaluation conversions, computed at most once per column.
+
+    Text columns used by value checks are factorized once; null masks, allowed
+    value masks and numeric parsing are then derived from the integer codes,
+    so `pd.to_numeric` only ever parses each distinct string once.
+    """
+
+    def __init__(self, df: pd.DataFrame, coded: set):
+        self.df = df
+        self.coded = coded
+        self._null: Dict[str, np.ndarray] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+
+    def _is_text(self, col: str) -> bool:
+        dtype = self.df[col].dtype
+        return dtype == "object" or pd.api.types.is_string_dtype(dtype)
+
+    def factorize(self, col: str) -> Tuple[np.ndarray, pd.Index]:
+        """(codes, uniques); missing values get code -1."""
+        if col not in self._codes:
+            codes, uniques = pd.factorize(self.df[col])
+            self._codes[col] = (codes, pd.Index(uniques))
+        return self._codes[col]
+
+    def isnull(self, col: str) -> np.ndarray:
+        if col not in self._null:
+            s = self.df[col]
+            if col in self.coded and self._is_text(col):
+                self._null[col] = self.factorize(col)[0] == -1
+            elif isinstance(s.dtype, pd.CategoricalDtype):
+                self._null[col] = s.cat.codes.to_numpy() == -1
+            elif pd.api.types.is_float_dtype(s.dtype) and not pd.api.types.is_extension_array_dtype(s.dtype):
+                self._null[col] = np.isnan(self.numeric(col))
+            else:
+                self._null[col] = s.isna().to_numpy()
+        return self._null[col]
+
+    def isin(self, col: str, allowed: List[Any]) -> np.ndarray:
+        s = self.df[col]
+        # Decide once per distinct value, then gather by code (code -1 = NaN -> not allowed)
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            ok = np.append(s.cat.categories.isin(allowed), False)
+            return ok[s.cat.codes.to_numpy()]
+        if self._is_text(col):
+            codes, uniques = self.factorize(col)
+            return np.append(uniques.isin(allowed), False)[codes]
+        return s.isin(allowed).to_numpy()
+
+    def numeric(self, col: str) -> np.ndarray:
+        if col not in self._numeric:
+            s = self.df[col]
+            if pd.api.types.is_numeric_dtype(s.dtype) and not isinstance(s.dtype, pd.CategoricalDtype):
+                values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+            elif self._is_text(col):
+                codes, uniques = self.factorize(col)
+                parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce")
+                values = np.append(parsed.to_numpy(dtype=np.float64, na_value=np.nan), np.nan)[codes]
+            else:
+                values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            self._numeric[col] = values
+        return self._numeric[col]
+
+
+# Compiled once at import; reused by every call
+TELCO_VALIDATION_PLAN = ValidationPlan(TELCO_VALIDATION_SPEC)
+
+
+def run_validation(df: pd.DataFrame, plan: Optional[ValidationPlan] = None) -> ValidationResult:
+    """Evaluate a compiled plan (default: the Telco spec) and return the full result with row bitmap."""
+    return (plan or TELCO_VALIDATION_PLAN).evaluate(df)
+
+
+def validate_stream(
+    chunks: Iterable[pd.DataFrame],
+    plan: Optional[ValidationPlan] = None,
+    workers: int = 1,
+) -> ValidationResult:
+    """
+    Validate a stream of DataFrame chunks without holding the full data.
+
+    Each chunk is reduced to mergeable `ValidationStats`; with `workers > 1`
+    chunks are evaluated in a process pool (at most 2 x workers chunks in
+    flight) and partial statistics merged as they complete. The summary is
+    identical to validating the concatenated frame in memory.
+    """
+    plan = plan or TELCO_VALIDATION_PLAN
+    total = plan.empty_stats()
+
+    if workers <= 1:
+        for chunk in chunks:
+            total.merge(plan.partial(chunk))
+    else:
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(plan.partial, chunk))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        total.merge(future.result())
+            for future in pending:
+                total.merge(future.result())
+
+    failed, warnings = plan.summarize(total)
+    return ValidationResult(failed, warnings, total)
+
+
+def validate_telco_file(file_path: str, chunk_rows: int = 100_000, workers: int = 1) -> Tuple[bool, List[str]]:
+    """
+    Streaming counterpart of `validate_telco_data` for files that do not fit in memory.
+
+    Reads chunks with `load_data.iter_data` and returns the same
+    (success, failed) summary the in-memory validation would. Numeric columns
+    are streamed as strings (`relaxed_schema`) and parsed by the plan, so a
+    malformed value fails `non_numeric:<col>` instead of aborting the reader.
+    """
+    from src.data.load_data import iter_data, relaxed_schema
+
+    print(f"🔍 Starting streaming data validation ({workers} worker(s))...")
+    chunks = iter_data(file_path, chunk_rows=chunk_rows, schema=relaxed_schema())
+    result = validate_stream(chunks, workers=workers)
+    print(f"   📊 {result.stats.rows} rows | value ranges: {result.stats.value_ranges()}")
+    return _report(result)
 
 
 def validate_telco_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
@@ -8,96 +387,22 @@ def validate_telco_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
     This function intentionally avoids a dependency on Great Expectations
     (which may have different APIs across versions) and performs a set of
     pragmatic checks that match the project's Phase 1 expectations.
+
+    The checks come from `TELCO_VALIDATION_SPEC`, compiled into a vectorized
+    plan; use `run_validation` to also get the per-row violation bitmap.
     """
     print("🔍 Starting data validation...")
+    return _report(run_validation(df))
 
-    failed: List[str] = []
-
-    # === Schema validation ===
-    required_columns = [
-        "customerID",
-        "gender",
-        "Partner",
-        "Dependents",
-        "PhoneService",
-        "InternetService",
-        "Contract",
-        "tenure",
-        "MonthlyCharges",
-        "TotalCharges",
-        "Churn",
-    ]
-
-    for col in required_columns:
-        if col not in df.columns:
-            failed.append(f"missing_column:{col}")
-        else:
-            if df[col].isnull().any():
-                failed.append(f"nulls_in_column:{col}")
-
-    # === Business logic / categorical checks ===
-    def check_in_set(col: str, allowed: List[str]):
-        if col not in df.columns:
-            return
-        invalid = ~df[col].isin(allowed)
-        if invalid.any():
-            pct = float(invalid.mean())
-            failed.append(f"invalid_values_in_{col}:{pct:.2f}")
-
-    check_in_set("gender", ["Male", "Female"])
-    check_in_set("Partner", ["Yes", "No"])
-    check_in_set("Dependents", ["Yes", "No"])
-    check_in_set("PhoneService", ["Yes", "No"])
-    check_in_set("Contract", ["Month-to-month", "One year", "Two year"])
-    check_in_set("InternetService", ["DSL", "Fiber optic", "No"])
-
-    # === Numeric checks ===
-    def to_numeric(col: str) -> pd.Series:
-        return pd.to_numeric(df[col], errors="coerce")
-
-    if "tenure" in df.columns:
-        tenure = to_numeric("tenure")
-        if tenure.isnull().any():
-            failed.append("non_numeric:tenure")
-        else:
-            if (tenure < 0).any() or (tenure > 120).any():
-                failed.append("tenure_out_of_bounds")
-
-    if "MonthlyCharges" in df.columns:
-        monthly = to_numeric("MonthlyCharges")
-        if monthly.isnull().any():
-            failed.append("non_numeric:MonthlyCharges")
-        else:
-            if (monthly < 0).any() or (monthly > 200).any():
-                failed.append("MonthlyCharges_out_of_bounds")
-
-    if "TotalCharges" in df.columns:
-        total = to_numeric("TotalCharges")
-        if total.isnull().any():
-            # The original dataset has some blank TotalCharges entries; warn but don't fail
-            print("⚠️  Warning: TotalCharges has non-numeric values; will be handled in preprocessing")
-        else:
-            if (total < 0).any():
-                failed.append("TotalCharges_negative")
-
-    # === Pairwise logical check ===
-    if set(["TotalCharges", "MonthlyCharges"]).issubset(df.columns):
-        total = pd.to_numeric(df["TotalCharges"], errors="coerce")
-        monthly = pd.to_numeric(df["MonthlyCharges"], errors="coerce")
-        valid_mask = total.notnull() & monthly.notnull()
-        if valid_mask.any():
-            proportion = float((total[valid_mask] >= monthly[valid_mask]).mean())
-            if proportion < 0.9:
-                failed.append(f"total_vs_monthly_ratio:{proportion:.2f}")
-
-    success = len(failed) == 0
-
-    if success:
+
+def _report(result: ValidationResult) -> Tuple[bool, List[str]]:
+    for warning in result.warnings:
+        print(f"⚠️  Warning: {warning}")
+
+    if result.success:
         print("✅ Data validation PASSED")
     else:
         print("❌ Data validation FAILED")
-        print("Failed checks:", failed)
-
-    return success, failed
-
+        print("Failed checks:", result.failed)
 
+    return result.success, result.failed
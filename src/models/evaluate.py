@@ -1,35 +1,313 @@
-import mlflow
-import mlflow.xgboost
-import matplotlib.pyplot as plt
-from sklearn.metrics import (
-    accuracy_score,
-    recall_score,
-    precision_score,
-    f1_score,
-    roc_auc_score,
-    confusion_matrix,
-    ConfusionMatrixDisplay
-)
+"""
+Threshold-aware evaluation of churn scores.
+
+`threshold_sweep` sorts the predicted probabilities once and accumulates true
+and false positives down the ranking, so the confusion counts, precision,
+recall, F1 and misclassification cost of *every* candidate threshold (each
+distinct score) fall out of two cumulative sums: O(n log n) overall instead
+of one sklearn pass per metric and threshold. The same table gives ROC AUC,
+and `select_threshold` picks the operating point that is shipped to serving.
+
+`bootstrap_ci` draws all resamples at once as a (resamples x rows) matrix of
+multinomial counts; every metric of every resample is then a matrix product
+or a cumulative sum over that matrix, with no Python loop over resamples.
+"""
+
+import warnings
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
-def evaluate_model(model, X_test, y_test):
-    preds = model.predict(X_test)
-    probas = model.predict_proba(X_test)[:, 1]
+THRESHOLD_OBJECTIVES = ("f1", "cost")
+CI_METRICS = ("accuracy", "precision", "recall", "f1", "roc_auc")
+
+
+def _as_arrays(y_true, proba) -> Tuple[np.ndarray, np.ndarray]:
+    y = np.asarray(y_true).astype(bool)
+    p = np.asarray(proba, dtype=np.float64)
+    if y.shape != p.shape or y.ndim != 1:
+        raise ValueError(f"y_true and proba must be 1-D and the same length, got {y.shape} and {p.shape}")
+    if not y.any() or y.all():
+        raise ValueError("Evaluation needs both classes in y_true")
+    return y, p
+
+
+# ---------------------------
+# One-sort threshold sweep
+# ---------------------------
+def threshold_sweep(y_true, proba, fn_cost: float = 1.0, fp_cost: float = 1.0) -> pd.DataFrame:
+    """
+    Metrics at every candidate threshold, from a single sort of the scores.
+
+    Predicting churn for `proba >= threshold` with threshold set to each distinct
+    score in turn, from the highest down, the predicted-positive set grows one
+    tie group at a time, so TP / FP are cumulative sums over the sorted labels
+    taken at the last row of each tie group.
+
+    Args:
+        y_true: Binary labels (1 = churn).
+        proba: Predicted churn probabilities.
+        fn_cost: Cost of a missed churner (false negative).
+        fp_cost: Cost of a false alarm (false positive).
+
+    Returns:
+        One row per distinct score, by decreasing threshold: threshold, tp, fp,
+        fn, tn, precision, recall, f1 and cost (`fn * fn_cost + fp * fp_cost`).
+    """
+    y, p = _as_arrays(y_true, proba)
+    order = np.argsort(-p, kind="stable")
+    p_sorted = p[order]
+
+    tp = np.cumsum(y[order], dtype=np.int64)
+    fp = np.arange(1, len(p) + 1, dtype=np.int64) - tp
+    # Last row of each group of tied scores: one threshold per distinct score
+    last = np.r_[np.flatnonzero(np.diff(p_sorted)), len(p) - 1]
+    tp, fp = tp[last], fp[last]
+    positives, negatives = tp[-1], fp[-1]
+    fn, tn = positives - tp, negatives - fp
+
+    return pd.DataFrame({
+        "threshold": p_sorted[last],
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": tp / (tp + fp),
+        "recall": tp / positives,
+        "f1": 2 * tp / (2 * tp + fp + fn),
+        "cost": fn * fn_cost + fp * fp_cost,
+    })
+
+
+def roc_auc_from_sweep(sweep: pd.DataFrame) -> float:
+    """ROC AUC by the trapezoidal rule over the sweep's (FPR, TPR) points."""
+    tp = np.r_[0, sweep["tp"].to_numpy()]
+    fp = np.r_[0, sweep["fp"].to_numpy()]
+    tpr, fpr = tp / tp[-1], fp / fp[-1]
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+
+def select_threshold(sweep: pd.DataFrame, objective: str = "f1", min_recall: Optional[float] = None) -> pd.Series:
+    """
+    Pick the operating point from a `threshold_sweep` table.
+
+    Args:
+        sweep: Output of `threshold_sweep`.
+        objective: "f1" maximises F1, "cost" minimises misclassification cost.
+        min_recall: Only consider thresholds catching at least this share of churners.
+
+    Returns:
+        The chosen sweep row; among equally good thresholds the highest one wins.
+    """
+    if objective not in THRESHOLD_OBJECTIVES:
+        raise ValueError(f"Unknown threshold objective '{objective}' (expected one of {THRESHOLD_OBJECTIVES})")
+    candidates = sweep if min_recall is None else sweep[sweep["recall"] >= min_recall]
+    if candidates.empty:
+        raise ValueError(f"No threshold reaches recall >= {min_recall}")
+    # Rows run by decreasing threshold and idxmax / idxmin return the first hit
+    best = candidates["f1"].idxmax() if objective == "f1" else candidates["cost"].idxmin()
+    return sweep.loc[best]
+
+
+# ---------------------------
+# Metrics at one threshold
+# ---------------------------
+def confusion_counts(y_true, proba, threshold: float) -> Tuple[int, int, int, int]:
+    """(tn, fp, fn, tp) for predicting churn when `proba >= threshold`, in one pass."""
+    y, p = _as_arrays(y_true, proba)
+    # index = 2 * label + prediction
+    tn, fp, fn, tp = np.bincount(2 * y + (p >= threshold), minlength=4)
+    return int(tn), int(fp), int(fn), int(tp)
+
 
-    metrics = {
-        "accuracy": accuracy_score(y_test, preds),
-        "recall": recall_score(y_test, preds),
-        "precision": precision_score(y_test, preds),
-        "f1": f1_score(y_test, preds),
-        "roc_auc": roc_auc_score(y_test, probas)
+def classification_metrics(y_true, proba, threshold: float, roc_auc: Optional[float] = None) -> Dict[str, float]:
+    """
+    Accuracy / precision / recall / F1 at `threshold` plus ROC AUC.
+
+    Pass `roc_auc` when it is already known (e.g. from a sweep) to skip the sort.
+    """
+    y, p = _as_arrays(y_true, proba)
+    tn, fp, fn, tp = confusion_counts(y, p, threshold)
+    if roc_auc is None:
+        roc_auc = roc_auc_from_sweep(threshold_sweep(y, p))
+    return {
+        "accuracy": (tp + tn) / len(y),
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn),
+        "f1": 2 * tp / (2 * tp + fp + fn),
+        "roc_auc": roc_auc,
     }
 
-    with mlflow.start_run(run_name="xgb_churn_evaluation") as run:
-        for name, val in metrics.items():
-            mlflow.log_metric(name, val)
+
+# ---------------------------
+# Bootstrap confidence intervals
+# ---------------------------
+def bootstrap_ci(
+    y_true,
+    proba,
+    threshold: float,
+    n_boot: int = 1000,
+    alpha: float = 0.05,
+    seed: int = 42,
+    max_cells: int = 2 ** 24,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Percentile bootstrap confidence intervals of `CI_METRICS` at `threshold`.
+
+    Each resample is a row of multinomial counts (how often every test row is
+    drawn); confusion counts are matrix products of those weights with the
+    label / prediction indicators, and the weighted ROC AUC is one cumulative
+    sum over the scores sorted once up front (tied scores count half).
+
+    Args:
+        n_boot: Number of resamples.
+        alpha: 1 - confidence level (0.05 gives 95% intervals).
+        seed: Seed of the resampling RNG.
+        max_cells: Upper bound on the weight-matrix size; resamples are drawn in
+            blocks of `max_cells // rows` to bound memory on large test sets.
+
+    Returns:
+        {metric: (low, high)}
+    """
+    y, p = _as_arrays(y_true, proba)
+    n = len(y)
+    pred = p >= threshold
+    indicators = np.stack([y & pred, ~y & pred, y & ~pred, y], axis=1).astype(np.float64)  # tp, fp, fn, positives
+
+    # Scores sorted once; tie groups for the weighted AUC
+    order = np.argsort(p, kind="stable")
+    groups = np.r_[0, np.flatnonzero(np.diff(p[order])) + 1]
+    y_sorted = y[order].astype(np.float64)
+
+    rng = np.random.default_rng(seed)
+    block = max(1, max_cells // n)
+    values = {m: [] for m in CI_METRICS}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, n_boot, block):
+            weights = rng.multinomial(n, np.full(n, 1.0 / n), size=min(block, n_boot - start)).astype(np.float64)
+            tp, fp, fn, positives = (weights @ indicators).T
+            tn = n - positives - fp
+            values["accuracy"].append((tp + tn) / n)
+            values["precision"].append(tp / (tp + fp))
+            values["recall"].append(tp / positives)
+            values["f1"].append(2 * tp / (2 * tp + fp + fn))
+
+            # AUC = P(score of a churner > score of a non-churner), ties count half
+            w_sorted = weights[:, order]
+            pos = np.add.reduceat(w_sorted * y_sorted, groups, axis=1)
+            neg = np.add.reduceat(w_sorted * (1 - y_sorted), groups, axis=1)
+            neg_below = np.cumsum(neg, axis=1) - neg
+            values["roc_auc"].append((pos * (neg_below + neg / 2)).sum(axis=1) / (positives * (n - positives)))
+
+    # A resample without predicted churners has no precision: nan, left out of the
+    # percentiles (all nan, e.g. a threshold above every score, gives a (nan, nan) interval)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return {
+            m: tuple(float(q) for q in np.nanpercentile(np.concatenate(v), [100 * alpha / 2, 100 * (1 - alpha / 2)]))
+            for m, v in values.items()
+        }
+
+
+# ---------------------------
+# Full evaluation
+# ---------------------------
+def evaluate_scores(
+    y_true,
+    proba,
+    threshold: Optional[float] = None,
+    objective: str = "f1",
+    min_recall: Optional[float] = None,
+    fn_cost: float = 1.0,
+    fp_cost: float = 1.0,
+    n_boot: int = 1000,
+    seed: int = 42,
+    y_select=None,
+    proba_select=None,
+) -> Dict:
+    """
+    Sweep, threshold choice, metrics and bootstrap intervals for one set of scores.
+
+    Args:
+        threshold: Fixed decision threshold; None selects one with `select_threshold`.
+        objective, min_recall: Threshold selection (see `select_threshold`).
+        fn_cost, fp_cost: Misclassification costs for the sweep's cost column.
+        n_boot: Bootstrap resamples for the confidence intervals (0 skips them).
+        y_select, proba_select: Held-out validation labels / scores to select the
+            threshold on, so the reported metrics stay unbiased. Without them the
+            threshold is selected on (and flatters) the evaluated scores themselves.
+
+    Returns:
+        {"threshold", "selected" (True when chosen from a sweep), "metrics",
+        "ci" ({metric: (low, high)}), "sweep", "selection_sweep"}
+    """
+    sweep = threshold_sweep(y_true, proba, fn_cost=fn_cost, fp_cost=fp_cost)
+    selection_sweep = sweep
+    if proba_select is not None:
+        selection_sweep = threshold_sweep(y_select, proba_select, fn_cost=fn_cost, fp_cost=fp_cost)
+    selected = threshold is None
+    if selected:
+        threshold = float(select_threshold(selection_sweep, objective, min_recall)["threshold"])
+    metrics = classification_metrics(y_true, proba, threshold, roc_auc=roc_auc_from_sweep(sweep))
+    ci = bootstrap_ci(y_true, proba, threshold, n_boot=n_boot, seed=seed) if n_boot > 0 else {}
+    return {
+        "threshold": threshold,
+        "selected": selected,
+        "metrics": metrics,
+        "ci": ci,
+        "sweep": sweep,
+        "selection_sweep": selection_sweep,
+    }
+
+
+def evaluate_model(
+    model,
+    X_test,
+    y_test,
+    threshold: Optional[float] = None,
+    objective: str = "f1",
+    n_boot: int = 1000,
+    X_val=None,
+    y_val=None,
+):
+    """
+    Score `X_test` once and log metrics, intervals and a confusion matrix to MLflow.
+
+    Args:
+        threshold: Fixed decision threshold; None picks the `objective`-optimal one
+            on (`X_val`, `y_val`), which are then required.
+
+    Returns:
+        Metrics at the decision threshold, plus "threshold" itself.
+
+    Raises:
+        ValueError: If `threshold` is None and no validation data is given.
+    """
+    if threshold is None and (X_val is None or y_val is None):
+        raise ValueError("evaluate_model needs X_val / y_val to pick a threshold "
+                         "(a threshold picked on the test set overstates its metrics)")
+
+    import mlflow
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import ConfusionMatrixDisplay
+
+    probas = model.predict_proba(X_test)[:, 1]
+    val_probas = model.predict_proba(X_val)[:, 1] if threshold is None else None
+    report = evaluate_scores(
+        y_test, probas, threshold=threshold, objective=objective, n_boot=n_boot,
+        y_select=y_val, proba_select=val_probas,
+    )
+    metrics = {**report["metrics"], "threshold": report["threshold"]}
+
+    with mlflow.start_run(run_name="xgb_churn_evaluation"):
+        mlflow.log_metrics(metrics)
+        for name, (low, high) in report["ci"].items():
+            mlflow.log_metrics({f"{name}_ci_low": low, f"{name}_ci_high": high})
 
         # Confusion matrix visualization
-        cm = confusion_matrix(y_test, preds)
+        tn, fp, fn, tp = confusion_counts(y_test, probas, report["threshold"])
+        cm = np.array([[tn, fp], [fn, tp]])
         disp = ConfusionMatrixDisplay(cm)
         disp.plot(cmap="Blues")
         plt.savefig("confusion_matrix.png")
@@ -37,6 +315,7 @@ def evaluate_model(model, X_test, y_test):
 
     print("📊 Evaluation Metrics:")
     for k, v in metrics.items():
-        print(f"{k}: {v:.4f}")
+        low_high = report["ci"].get(k)
+        print(f"{k}: {v:.4f}" + (f"  [{low_high[0]:.4f}, {low_high[1]:.4f}]" if low_high else ""))
 
     return metrics
@@ -0,0 +1,116 @@
+"""
+Warm-start helpers for incremental retraining (`Scripts/run.py --incremental`).
+
+The previous model is read from `artifacts/model` (written by the last run)
+and new data is encoded with the fitted transformer from
+`artifacts/preprocessing.pkl`, so the feature columns are exactly the ones
+its trees were grown on (re-deriving them with `build_features` on a small
+recent extract would drop one-hot columns of categories it happens to lack).
+Data the previous encoder cannot represent (missing input columns, unseen
+category values) refuses the warm start instead of silently encoding as 0.
+
+The comparison baseline is a genuine full rebuild: a fresh model on the
+history (`--full_input`) plus the recent training rows, scored on the same
+recent test split as the warm-started model.
+"""
+
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+# Metrics where a warm-started model may trail a full retrain before a rebuild is advised
+REBUILD_METRICS = ("recall", "f1", "roc_auc")
+
+
+def load_previous_model(artifacts_dir: str) -> Tuple[object, Dict]:
+    """
+    Load the last trained model and its preprocessing artifact.
+
+    Raises:
+        FileNotFoundError: if `artifacts/model` or `preprocessing.pkl` is missing.
+        RuntimeError: if the model and `preprocessing.pkl` disagree on the features.
+    """
+    import joblib
+    import mlflow.sklearn
+
+    model_dir = os.path.join(artifacts_dir, "model")
+    preprocess_path = os.path.join(artifacts_dir, "preprocessing.pkl")
+    for path in (model_dir, preprocess_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"❌ Incremental training needs {path}; run a full `Scripts/run.py` first"
+            )
+
+    model = mlflow.sklearn.load_model(model_dir)
+    preprocessing = joblib.load(preprocess_path)
+    feature_columns = list(preprocessing["feature_columns"])
+    if preprocessing.get("transformer") is None:
+        raise RuntimeError(f"❌ {preprocess_path} has no fitted transformer; run a full retrain")
+
+    booster_features = model.get_booster().feature_names
+    if booster_features is not None and list(booster_features) != feature_columns:
+        raise RuntimeError(
+            f"❌ {model_dir} was not trained on the feature_columns in {preprocess_path}; "
+            "the artifacts are out of sync, run a full retrain"
+        )
+    return model, preprocessing
+
+
+def check_feature_compatibility(transformer, df: pd.DataFrame) -> None:
+    """
+    Check that the previous fitted transformer can encode `df` without loss.
+
+    Raises ValueError listing input columns it expects but `df` lacks, and
+    categorical values it has never seen (they would encode as all zeros).
+    """
+    expected = list(transformer.numeric_index) + list(transformer.binary_index) + list(transformer.multi_categories)
+    missing = [c for c in expected if c not in df.columns]
+
+    unseen: Dict[str, List[str]] = {}
+    vocabularies = {**transformer.binary_mappings, **transformer.multi_categories}
+    for c, known in vocabularies.items():
+        if c in df.columns:
+            values = set(df[c].dropna().astype(str).unique()) - set(known)
+            if values:
+                unseen[c] = sorted(values)
+
+    if missing or unseen:
+        raise ValueError(
+            "❌ Data is not compatible with the previous model's preprocessing.pkl "
+            f"(missing columns: {missing}, unseen categories: {unseen}). "
+            "Schema changes or new category values need a full retrain (drop --incremental)."
+        )
+
+
+def exclude_customers(history: pd.DataFrame, customer_ids: Iterable, id_col: str = "customerID") -> pd.DataFrame:
+    """
+    Drop the history rows of customers in the recent extract.
+
+    Their recent record is the current one: recent training rows re-enter the
+    full rebuild from the recent frame, and recent test customers must not be
+    trained on. Without `id_col` in `history` nothing can be matched and the
+    frame is returned unchanged (with a warning).
+    """
+    if id_col not in history.columns:
+        print(f"⚠️  Warning: full-rebuild history has no '{id_col}' column; "
+              "recent test customers may also be in its training data")
+        return history
+    overlap = history[id_col].isin(pd.Index(customer_ids))
+    print(f"   📚 History: {len(history)} rows, {int(overlap.sum())} replaced by / held out for the recent extract")
+    return history[~overlap]
+
+
+def rebuild_verdict(
+    incremental: Dict[str, float], full: Dict[str, float], tolerance: float
+) -> Tuple[bool, Dict[str, float]]:
+    """
+    Compare a warm-started model with a full retrain on the same test set.
+
+    Returns whether a full rebuild is recommended (any of `REBUILD_METRICS`
+    trails the full retrain by more than `tolerance`) and the per-metric
+    `incremental - full` deltas.
+    """
+    deltas = {m: incremental[m] - full[m] for m in full if m in incremental}
+    rebuild = any(deltas.get(m, 0.0) < -tolerance for m in REBUILD_METRICS)
+    return rebuild, deltas
@@ -1,57 +1,358 @@
+import os
+import json
+import math
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
 import optuna
 import mlflow
+import numpy as np
+import xgboost as xgb
 from xgboost import XGBClassifier
-from sklearn.model_selection import cross_val_score
+from xgboost.callback import TrainingCallback
+from sklearn.metrics import recall_score
+from sklearn.model_selection import StratifiedKFold
 import pandas as pd
 
-def tune_model(X: pd.DataFrame, y: pd.Series, n_trials=20):
+# Studies are persisted here by default so an interrupted search resumes
+DEFAULT_STORAGE = "sqlite:///" + os.path.join(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")), "data", "optuna", "tuning.db"
+).replace("\\", "/")
+
+# Trials that count towards `n_trials` when a study is resumed
+FINISHED_STATES = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+# Hyperparameter ranges searched by `tune_model`: name -> (kind, low, high)
+SEARCH_SPACE: Dict[str, Tuple[str, float, float]] = {
+    "n_estimators": ("int", 300, 800),
+    "learning_rate": ("float", 0.01, 0.2),
+    "max_depth": ("int", 3, 10),
+    "subsample": ("float", 0.5, 1.0),
+    "colsample_bytree": ("float", 0.5, 1.0),
+}
+
+
+def suggest_params(trial: optuna.Trial, search_space: Dict[str, Tuple[str, float, float]]) -> Dict[str, Any]:
+    """Sample one value per `search_space` entry from the trial."""
+    return {
+        name: trial.suggest_int(name, low, high) if kind == "int" else trial.suggest_float(name, low, high)
+        for name, (kind, low, high) in search_space.items()
+    }
+
+
+def study_fingerprint(X: pd.DataFrame, y: pd.Series, search_space: Dict[str, Any],
+                      extra: Optional[Dict[str, Any]] = None) -> str:
     """
-    Tunes an XGBoost model using Optuna and logs the results with MLflow.
+    Short digest of what a study's trials depend on: the data (shape, feature
+    columns and dtypes, target name, and the values themselves), the search
+    space and any `extra` objective settings.
+
+    Used in default study names, so a resumed study only ever continues trials
+    scored on the same problem; different data or ranges start a fresh study.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        "shape": list(X.shape),
+        "columns": [str(c) for c in X.columns],
+        "dtypes": [str(d) for d in X.dtypes],
+        "target": str(y.name),
+        "search_space": search_space,
+        "extra": extra or {},
+    }, sort_keys=True, default=str).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+class XGBoostPruningCallback(TrainingCallback):
+    """
+    Reports an XGBoost eval metric to an Optuna trial while boosting and
+    stops the fit with `optuna.TrialPruned` once the pruner gives up on it.
 
     Args:
-        X (pd.DataFrame): Features.
-        y (pd.Series): Target.
-        n_trials (int): Number of trials for Optuna optimization.
+        trial: The running Optuna trial.
+        metric: Eval metric name as logged by XGBoost (e.g. "aucpr").
+        data: Name of the eval set ("validation_0" for the first `eval_set`).
+        interval: Report every `interval` boosting rounds (each report is a
+            storage write, so reporting every round would dominate small fits).
+    """
+
+    def __init__(self, trial: optuna.Trial, metric: str, data: str = "validation_0", interval: int = 10):
+        super().__init__()
+        self.trial = trial
+        self.metric = metric
+        self.data = data
+        self.interval = max(1, interval)
+
+    def after_iteration(self, model, epoch: int, evals_log) -> bool:
+        if (epoch + 1) % self.interval:
+            return False
+        value = float(evals_log[self.data][self.metric][-1])
+        self.trial.report(value, step=epoch + 1)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at round {epoch + 1} ({self.metric}={value:.4f})")
+        return False
+
+
+def create_or_load_study(study_name: str, storage: Optional[str] = None, seed: Optional[int] = None,
+                         pruner: Optional[optuna.pruners.BasePruner] = None) -> optuna.Study:
+    """
+    Create `study_name` in `storage` (default `DEFAULT_STORAGE`), or load it if it already exists.
+    """
+    storage = storage or DEFAULT_STORAGE
+    if storage.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(storage[len("sqlite:///"):])), exist_ok=True)
+    return optuna.create_study(
+        study_name=study_name,
+        storage=_rdb_storage(storage),
+        direction="maximize",
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=pruner or optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=50),
+        load_if_exists=True,
+    )
+
+
+def _rdb_storage(url: str) -> optuna.storages.RDBStorage:
+    # Several worker processes share one SQLite file: wait on locks instead of failing
+    connect_args = {"timeout": 60} if url.startswith("sqlite") else {}
+    return optuna.storages.RDBStorage(url, engine_kwargs={"connect_args": connect_args})
+
+
+class _FoldCache:
+    """
+    The 3 stratified CV folds of (X, y) as XGBoost matrices, built once.
+
+    Training folds are `QuantileDMatrix`es (features quantized to `hist` bins
+    once); validation folds share their training fold's bin edges (`ref=`).
+    Trials then train with `xgb.train` straight on these matrices instead of
+    re-quantizing the same features for every fold of every trial.
+    """
+
+    def __init__(self, X: pd.DataFrame, y: pd.Series, n_splits: int = 3, max_bin: int = 256):
+        self.folds = []
+        for train_idx, test_idx in StratifiedKFold(n_splits=n_splits).split(X, y):
+            dtrain = xgb.QuantileDMatrix(X.iloc[train_idx], y.iloc[train_idx], max_bin=max_bin)
+            dvalid = xgb.QuantileDMatrix(X.iloc[test_idx], y.iloc[test_idx], ref=dtrain)
+            self.folds.append((dtrain, dvalid, y.iloc[test_idx].to_numpy()))
+
+
+class _Objective:
+    """
+    3-fold stratified CV recall (as `cross_val_score(cv=3, scoring="recall")`).
+
+    Picklable so it can be shipped to worker processes. The first fold is fit
+    with an eval set and reports its per-round `aucpr` for pruning. With
+    `cache_folds` the quantized fold matrices are built on the first trial of
+    each process and reused by every later one (they are not pickled).
     """
-    def objective(trial):
+
+    def __init__(self, X: pd.DataFrame, y: pd.Series, threads_per_trial: int, prune: bool, report_every: int,
+                 cache_folds: bool = True):
+        self.X = X
+        self.y = y
+        self.threads_per_trial = threads_per_trial
+        self.prune = prune
+        self.report_every = report_every
+        self.cache_folds = cache_folds
+        self._folds: Optional[_FoldCache] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_folds"] = None
+        return state
+
+    def __call__(self, trial: optuna.Trial) -> float:
         # Define the hyperparameters to tune
         params = {
-            "n_estimators": trial.suggest_int("n_estimators", 300, 800),
-            "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.2),
-            "max_depth": trial.suggest_int("max_depth", 3, 10),
-            "subsample": trial.suggest_float("subsample", 0.5, 1.0),
-            "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+            **suggest_params(trial, SEARCH_SPACE),
             "random_state": 42,
-            "n_jobs": -1,
-            "eval_metric": "logloss"
+            "n_jobs": self.threads_per_trial,
+            "eval_metric": ["logloss", "aucpr"],
         }
-        
-        # Create the XGBoost model
-        model = XGBClassifier(**params)
-        
-        # Evaluate using cross-validation
-        scores = cross_val_score(model, X, y, cv=3, scoring="recall")
-        mean_score = scores.mean()
-        
-        # Log the hyperparameters and metrics to MLflow
-        mlflow.log_params(params)
-        mlflow.log_metric("mean_recall", mean_score)
-        
-        return mean_score
-
-    # Start an MLflow run to track the experiment
+
+        start = time.perf_counter()
+        score = self._cv_cached(trial, params) if self.cache_folds else self._cv_sklearn(trial, params)
+        trial.set_user_attr("seconds", time.perf_counter() - start)
+        return score
+
+    def _pruning(self, trial: optuna.Trial, fold: int) -> list:
+        return [XGBoostPruningCallback(trial, "aucpr", interval=self.report_every)] if fold == 0 and self.prune else []
+
+    def _cv_sklearn(self, trial: optuna.Trial, params: Dict[str, Any]) -> float:
+        scores = []
+        for fold, (train_idx, test_idx) in enumerate(StratifiedKFold(n_splits=3).split(self.X, self.y)):
+            X_train, X_test = self.X.iloc[train_idx], self.X.iloc[test_idx]
+            y_train, y_test = self.y.iloc[train_idx], self.y.iloc[test_idx]
+
+            callbacks = self._pruning(trial, fold)
+            model = XGBClassifier(**params, callbacks=callbacks or None)
+            model.fit(X_train, y_train, eval_set=[(X_test, y_test)] if callbacks else None, verbose=False)
+            scores.append(recall_score(y_test, model.predict(X_test)))
+
+        return float(np.mean(scores))
+
+    def _cv_cached(self, trial: optuna.Trial, params: Dict[str, Any]) -> float:
+        if self._folds is None:
+            self._folds = _FoldCache(self.X, self.y)
+
+        # Same model as XGBClassifier(**params) (whose default tree_method is hist)
+        booster_params = {
+            "objective": "binary:logistic",
+            "tree_method": "hist",
+            "learning_rate": params["learning_rate"],
+            "max_depth": params["max_depth"],
+            "subsample": params["subsample"],
+            "colsample_bytree": params["colsample_bytree"],
+            "seed": params["random_state"],
+            "nthread": params["n_jobs"],
+            "eval_metric": params["eval_metric"],
+        }
+        scores = []
+        for fold, (dtrain, dvalid, y_test) in enumerate(self._folds.folds):
+            callbacks = self._pruning(trial, fold)
+            booster = xgb.train(
+                booster_params,
+                dtrain,
+                num_boost_round=params["n_estimators"],
+                evals=[(dvalid, "validation_0")] if callbacks else (),
+                callbacks=callbacks,
+                verbose_eval=False,
+            )
+            scores.append(recall_score(y_test, (booster.predict(dvalid) > 0.5).astype(int)))
+
+        return float(np.mean(scores))
+
+
+def trial_times(trials) -> Dict[str, float]:
+    """Mean / total wall-clock seconds of the completed trials (empty if none recorded)."""
+    seconds = [t.user_attrs["seconds"] for t in trials
+               if t.state == optuna.trial.TrialState.COMPLETE and "seconds" in t.user_attrs]
+    if not seconds:
+        return {}
+    return {"mean_s": float(np.mean(seconds)), "total_s": float(np.sum(seconds)), "trials": len(seconds)}
+
+
+def _run_worker(study_name: str, storage: str, objective: _Objective, n_trials: int, total_trials: int, seed: int) -> int:
+    """Worker process: attach to the shared study and run up to `n_trials` trials."""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_rdb_storage(storage),
+        sampler=optuna.samplers.TPESampler(seed=seed),
+    )
+    study.optimize(
+        objective,
+        n_trials=n_trials,
+        callbacks=[optuna.study.MaxTrialsCallback(total_trials, states=FINISHED_STATES)],
+    )
+    return n_trials
+
+
+def tune_model(
+    X: pd.DataFrame,
+    y: pd.Series,
+    n_trials: int = 20,
+    n_workers: int = 1,
+    threads_per_trial: Optional[int] = None,
+    storage: Optional[str] = None,
+    study_name: Optional[str] = None,
+    prune: bool = True,
+    report_every: int = 10,
+    seed: int = 42,
+    cache_folds: bool = True,
+) -> Dict[str, Any]:
+    """
+    Tunes an XGBoost model using Optuna and logs the results with MLflow.
+
+    Trials run in `n_workers` processes sharing one persistent study, so a
+    search that is interrupted resumes where it stopped: `n_trials` is the
+    total number of finished (complete or pruned) trials the study should
+    reach, not the number added by this call. The default study name carries
+    a `study_fingerprint` of (X, y) and the search space, so only a rerun on
+    the same problem resumes; new data starts a new study. Unpromising trials
+    are pruned from the per-round eval metric of their first CV fold.
+
+    Args:
+        X (pd.DataFrame): Features.
+        y (pd.Series): Target.
+        n_trials (int): Total number of trials for Optuna optimization.
+        n_workers (int): Worker processes running trials in parallel.
+        threads_per_trial (int): XGBoost threads per trial; defaults to
+            cpu_count // n_workers so workers don't oversubscribe the CPU.
+        storage (str): Optuna storage URL (default: SQLite under data/optuna/).
+        study_name (str): Study to create or resume (default:
+            "xgb_optuna_tuning-<fingerprint>"; an explicit name is resumed as-is).
+        prune (bool): Enable median pruning of unpromising trials.
+        report_every (int): Boosting rounds between pruning checks.
+        seed (int): Sampler seed (offset per worker).
+        cache_folds (bool): Build the CV folds' quantized `hist` matrices once
+            and train every trial on them with `xgb.train`; False refits
+            `XGBClassifier` on raw fold frames (slower, same scores).
+    """
+    storage = storage or DEFAULT_STORAGE
+    n_workers = max(1, n_workers)
+    if threads_per_trial is None:
+        threads_per_trial = max(1, (os.cpu_count() or 1) // n_workers)
+
+    if study_name is None:
+        study_name = f"xgb_optuna_tuning-{study_fingerprint(X, y, SEARCH_SPACE, {'prune': prune})}"
+    study = create_or_load_study(study_name, storage, seed=seed)
+    done = len(study.get_trials(deepcopy=False, states=FINISHED_STATES))
+    remaining = max(0, n_trials - done)
+    print(f"🔎 Study '{study_name}' ({storage}): {done} finished trials, running {remaining} more "
+          f"on {n_workers} worker(s) x {threads_per_trial} thread(s)")
+
+    objective = _Objective(X, y, threads_per_trial, prune, report_every, cache_folds)
+    if remaining and n_workers == 1:
+        study.optimize(
+            objective,
+            n_trials=remaining,
+            callbacks=[optuna.study.MaxTrialsCallback(n_trials, states=FINISHED_STATES)],
+        )
+    elif remaining:
+        per_worker = math.ceil(remaining / n_workers)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_run_worker, study_name, storage, objective, per_worker, n_trials, seed + i + 1)
+                for i in range(n_workers)
+            ]
+            for f in futures:
+                f.result()
+
+    # Trials are logged here, in the parent, once the workers are done
+    trials = study.get_trials(deepcopy=False)
     with mlflow.start_run(run_name="xgb_optuna_tuning"):
-        study = optuna.create_study(direction="maximize")
-        study.optimize(objective, n_trials=n_trials)
+        mlflow.log_params({"n_trials": n_trials, "n_workers": n_workers, "threads_per_trial": threads_per_trial,
+                           "study_name": study_name, "cache_folds": cache_folds})
+        for t in trials:
+            if t.state == optuna.trial.TrialState.COMPLETE:
+                mlflow.log_metric("mean_recall", t.value, step=t.number)
+        n_pruned = sum(t.state == optuna.trial.TrialState.PRUNED for t in trials)
+        trial_seconds = trial_times(trials)
+        if trial_seconds:
+            mlflow.log_metric("mean_trial_seconds", trial_seconds["mean_s"])
+        mlflow.log_metric("trials_complete", sum(t.state == optuna.trial.TrialState.COMPLETE for t in trials))
+        mlflow.log_metric("trials_pruned", n_pruned)
+        mlflow.log_dict(
+            [{"number": t.number, "state": t.state.name, "value": t.value, "params": t.params,
+              "seconds": t.user_attrs.get("seconds")} for t in trials],
+            "optuna_trials.json",
+        )
 
         best_params = study.best_params
         best_score = study.best_value
-        
+
         # Log the best parameters and score to MLflow
         mlflow.log_params(best_params)
         mlflow.log_metric("best_recall", best_score)
-        
+
+        print(f"✂️  Pruned {n_pruned}/{len(trials)} trials")
+        if trial_seconds:
+            print(f"⏱️  Completed trials: {trial_seconds['mean_s']:.2f}s mean, {trial_seconds['total_s']:.1f}s total "
+                  f"({'cached quantized folds' if cache_folds else 'per-trial XGBClassifier fits'})")
         print(f"🏆 Best Params: {best_params}")
         print(f"🏆 Best Recall: {best_score}")
-    
-    return study.best_params
\ No newline at end of file
+
+    return study.best_params
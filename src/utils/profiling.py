@@ -0,0 +1,236 @@
+import io
+import os
+import sys
+import time
+import threading
+import contextlib
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process so far, in MB.
+
+    Uses `resource.getrusage` (KB on Linux, bytes on macOS); returns None on
+    platforms without the `resource` module (Windows).
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident memory of this process in MB (Linux `/proc`; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    """In-memory size of a DataFrame in MB, including string/object payloads."""
+    return float(df.memory_usage(deep=True).sum()) / (1024 * 1024)
+
+
+def format_mb(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.0f} MB"
+
+
+def stage_memory(stage: str, df: pd.DataFrame) -> Dict[str, float]:
+    """
+    Print and return the frame size and process peak RSS after `stage`.
+
+    Keys are `<stage>_frame_mb` and (where available) `<stage>_peak_rss_mb`,
+    ready for `mlflow.log_metrics`.
+    """
+    frame = frame_mb(df)
+    peak = peak_rss_mb()
+    print(f"   🧠 {stage}: frame {frame:.1f} MB | peak RSS {format_mb(peak)}")
+    metrics = {f"{stage}_frame_mb": frame}
+    if peak is not None:
+        metrics[f"{stage}_peak_rss_mb"] = peak
+    return metrics
+
+
+class StageProfiler:
+    """
+    Wall time, CPU time and peak memory of named pipeline stages.
+
+    Stages may nest (e.g. a lazy load triggered inside validation); wall and
+    CPU time are then reported exclusively, so each stage shows only its own
+    work and the column totals add up. Peak RSS comes from a background thread
+    sampling `/proc/self/statm` every `sample_interval_s`, topped up with
+    `ru_maxrss` whenever the stage set a new process-wide high.
+
+    Args:
+        trace_malloc: Also record each stage's peak Python allocations with
+            `tracemalloc` (exact, but slows allocation-heavy code noticeably).
+        cprofile_dir: If set, write a cProfile dump (`<stage>.prof`) and a
+            top-functions listing (`<stage>.txt`) per stage to this directory.
+        sample_interval_s: RSS sampling period.
+    """
+
+    def __init__(
+        self,
+        trace_malloc: bool = False,
+        cprofile_dir: Optional[str] = None,
+        sample_interval_s: float = 0.02,
+    ):
+        self.trace_malloc = trace_malloc
+        self.cprofile_dir = cprofile_dir
+        self.sample_interval_s = sample_interval_s
+        self.records: List[Dict[str, Any]] = []
+        # Open stages, innermost last: {"name", "peak_rss", "py_peak", "nested_wall", "nested_cpu", "profile"}
+        self._stack: List[Dict[str, Any]] = []
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def start(self) -> "StageProfiler":
+        if self.trace_malloc:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        if self.cprofile_dir:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+        if self._sampler is None and current_rss_mb() is not None:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self) -> None:
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self.trace_malloc:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def __enter__(self) -> "StageProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> bool:
+        self.stop()
+        return False
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.sample_interval_s):
+            rss = current_rss_mb()
+            for frame in list(self._stack):
+                if rss > frame["peak_rss"]:
+                    frame["peak_rss"] = rss
+
+    # ---------------------------
+    # Stages
+    # ---------------------------
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as stage `name`."""
+        import cProfile
+
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None and parent["profile"] is not None:
+            parent["profile"].disable()
+        if self.trace_malloc:
+            import tracemalloc
+            py_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        rss_start = current_rss_mb()
+        maxrss_start = peak_rss_mb()
+        frame = {
+            "name": name,
+            "peak_rss": rss_start or 0.0,
+            "py_peak": 0,
+            "nested_wall": 0.0,
+            "nested_cpu": 0.0,
+            "profile": cProfile.Profile() if self.cprofile_dir else None,
+        }
+        self._stack.append(frame)
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        if frame["profile"] is not None:
+            frame["profile"].enable()
+        try:
+            yield
+        finally:
+            if frame["profile"] is not None:
+                frame["profile"].disable()
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            self._stack.pop()
+
+            record = {
+                "stage": name,
+                "wall_s": wall - frame["nested_wall"],
+                "cpu_s": cpu - frame["nested_cpu"],
+            }
+            rss_end, maxrss_end = current_rss_mb(), peak_rss_mb()
+            peak = max(frame["peak_rss"], rss_end or 0.0)
+            if maxrss_end is not None and maxrss_start is not None and maxrss_end > maxrss_start:
+                peak = max(peak, maxrss_end)  # new process-wide high, reached inside this stage
+            if peak:
+                record["peak_rss_mb"] = peak
+            if rss_start is not None:
+                record["rss_delta_mb"] = rss_end - rss_start
+            if self.trace_malloc:
+                # Nested stages reset the tracemalloc peak, so fold theirs back in
+                current, py_peak = tracemalloc.get_traced_memory()
+                frame["py_peak"] = max(frame["py_peak"], py_peak)
+                record["py_peak_mb"] = (frame["py_peak"] - py_start) / (1024 * 1024)
+                record["py_delta_mb"] = (current - py_start) / (1024 * 1024)
+            if frame["profile"] is not None:
+                self._dump_profile(name, frame["profile"])
+            self.records.append(record)
+
+            if parent is not None:
+                parent["nested_wall"] += wall
+                parent["nested_cpu"] += cpu
+                parent["peak_rss"] = max(parent["peak_rss"], peak)
+                parent["py_peak"] = max(parent["py_peak"], frame["py_peak"])
+                if parent["profile"] is not None:
+                    parent["profile"].enable()
+
+    def _dump_profile(self, name: str, profile) -> None:
+        import pstats
+
+        profile.dump_stats(os.path.join(self.cprofile_dir, f"{name}.prof"))
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(30)
+        with open(os.path.join(self.cprofile_dir, f"{name}.txt"), "w") as f:
+            f.write(out.getvalue())
+
+    # ---------------------------
+    # Reporting
+    # ---------------------------
+    def table(self) -> pd.DataFrame:
+        """One row per stage, in completion order."""
+        return pd.DataFrame(self.records)
+
+    def metrics(self, prefix: str = "profile_") -> Dict[str, float]:
+        """Flat `<prefix><stage>_<field>` metrics ready for `mlflow.log_metrics`."""
+        metrics = {}
+        for record in self.records:
+            for field, value in record.items():
+                if field != "stage":
+                    metrics[f"{prefix}{record['stage']}_{field}"] = float(value)
+        return metrics
+
+    def print_report(self) -> None:
+        print("\n⏱️  Stage profile (exclusive wall / CPU time, peak RSS):")
+        for r in self.records:
+            line = f"   {r['stage']:<18} wall {r['wall_s']:8.2f}s | cpu {r['cpu_s']:8.2f}s"
+            if "peak_rss_mb" in r:
+                line += f" | peak RSS {r['peak_rss_mb']:7.0f} MB ({r.get('rss_delta_mb', 0.0):+.0f})"
+            if "py_peak_mb" in r:
+                line += f" | py peak {r['py_peak_mb']:7.1f} MB"
+            print(line)
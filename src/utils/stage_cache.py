@@ -0,0 +1,191 @@
+"""
+Content-addressed cache for training-pipeline stage outputs.
+
+Each stage result is stored under `<cache_dir>/<stage>/<key>.parquet` (frames)
+or `<key>.json` (small JSON results), next to a `<key>.meta.json` sidecar.
+The key is a SHA-256 over:
+
+    - the stage name
+    - the keys of its inputs (the raw file's content hash for the first stage)
+    - the source code of the modules implementing the stage
+    - the stage's config (and the pandas version, for Parquet compatibility)
+
+so a stage is re-run only when its input data, its code or its config changed.
+Because keys chain, changing e.g. preprocess.py invalidates preprocess and
+every stage downstream of it, while hyperparameter-only changes hit the cache.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def code_digest(objs: Iterable[Any]) -> str:
+    """SHA-256 over the source files of the modules defining `objs`."""
+    h = hashlib.sha256()
+    for path in sorted({inspect.getsourcefile(obj) for obj in objs}):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class StageCache:
+    """
+    Get-or-compute cache for named pipeline stages.
+
+    Args:
+        cache_dir: Root directory for cached stage outputs.
+        stages: Stage names in pipeline order (used by `from_stage`).
+        force: Recompute (and overwrite) every stage.
+        from_stage: Recompute this stage and every later one; earlier stages may hit.
+        enabled: When False nothing is read or written.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        stages: List[str],
+        force: bool = False,
+        from_stage: Optional[str] = None,
+        enabled: bool = True,
+    ):
+        if from_stage is not None and from_stage not in stages:
+            raise ValueError(f"Unknown stage '{from_stage}' (expected one of {stages})")
+        self.cache_dir = cache_dir
+        self.stages = list(stages)
+        self.enabled = enabled
+        first_forced = 0 if force else (stages.index(from_stage) if from_stage else len(stages))
+        self._forced = set(stages[first_forced:])
+        # stage -> {"key", "hit", "seconds", "saved_s"}
+        self.report: Dict[str, Dict[str, Any]] = {}
+        # Time spent in nested (upstream) stages, so each stage reports only its own time
+        self._nested: List[float] = []
+
+    # ---------------------------
+    # Keys
+    # ---------------------------
+    def key(self, stage: str, inputs: Iterable[str], code: Iterable[Any], config: Optional[Dict[str, Any]] = None) -> str:
+        payload = {
+            "stage": stage,
+            "inputs": list(inputs),
+            "code": code_digest(code),
+            "config": config or {},
+            "pandas": pd.__version__,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    # ---------------------------
+    # Get-or-compute
+    # ---------------------------
+    def frame(self, stage: str, key: str, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Cached DataFrame output of `stage` (stored as Parquet)."""
+        return self._get_or_compute(stage, key, compute, ".parquet", _read_parquet, _write_parquet)
+
+    def record(self, stage: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached JSON-serializable output of `stage`."""
+        return self._get_or_compute(stage, key, compute, ".json", _read_json, _write_json)
+
+    def hit(self, stage: str) -> bool:
+        """Whether `stage` was restored from the cache in this run."""
+        return bool(self.report.get(stage, {}).get("hit"))
+
+    def summary(self) -> Dict[str, float]:
+        hits = sum(1 for r in self.report.values() if r["hit"])
+        return {
+            "stage_cache_hits": hits,
+            "stage_cache_misses": len(self.report) - hits,
+            "stage_cache_time_saved_s": sum(r["saved_s"] for r in self.report.values()),
+        }
+
+    def _usable(self, stage: str) -> bool:
+        return self.enabled and stage not in self._forced
+
+    def _get_or_compute(self, stage, key, compute, suffix, read, write):
+        t0 = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            value = self._lookup_or_compute(stage, key, compute, suffix, read, write)
+        finally:
+            nested = self._nested.pop()
+            elapsed = time.perf_counter() - t0
+            if self._nested:
+                self._nested[-1] += elapsed
+        self.report[stage]["seconds"] = elapsed - nested
+        return value
+
+    def _lookup_or_compute(self, stage, key, compute, suffix, read, write):
+        path = os.path.join(self.cache_dir, stage, key + suffix)
+        meta_path = self._meta_path(stage, key)
+
+        if self._usable(stage) and os.path.exists(meta_path):
+            t0 = time.perf_counter()
+            try:
+                value = read(path)
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Warning: stage cache entry for '{stage}' is unreadable ({e}); recomputing")
+            else:
+                seconds = time.perf_counter() - t0
+                saved = max(float(meta.get("compute_s", 0.0)) - seconds, 0.0)
+                self.report[stage] = {"key": key, "hit": True, "saved_s": saved}
+                print(f"♻️  Stage '{stage}' restored from cache in {seconds:.2f}s (saved ~{saved:.2f}s)")
+                return value
+
+        t0 = time.perf_counter()
+        value = compute()
+        # Exclude upstream stages resolved lazily inside `compute`
+        seconds = time.perf_counter() - t0 - self._nested[-1]
+        self.report[stage] = {"key": key, "hit": False, "saved_s": 0.0}
+
+        if self.enabled:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write(value, path)
+                _write_json({"stage": stage, "key": key, "compute_s": seconds, "created_at": time.time()}, meta_path)
+            except Exception as e:
+                print(f"⚠️  Warning: could not cache stage '{stage}': {e}")
+        return value
+
+    def _meta_path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, key + ".meta.json")
+
+
+def _atomic(write: Callable[[str], None], path: str) -> None:
+    tmp = f"{path}.tmp-{os.getpid()}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    _atomic(lambda tmp: df.to_parquet(tmp, engine="pyarrow", index=True), path)
+
+
+def _read_parquet(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path, engine="pyarrow")
+
+
+def _write_json(value: Any, path: str) -> None:
+    def write(tmp: str) -> None:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, indent=2)
+    _atomic(write, path)
+
+
+def _read_json(path: str) -> Any:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,239 @@
+"""
+Low-overhead serving telemetry with Prometheus text exposition.
+
+Request handlers set the endpoint label once (`endpoint_label`); code deeper
+in the call stack, including scoring threads that inherit the request's
+contextvars, times its stages with `telemetry.stage("inference")` without
+knowing which endpoint it serves. Calls made outside a labelled request
+(training scripts, benchmarks) record nothing.
+
+Every observation is a bisect into a fixed bucket tuple plus a few integer
+adds under a per-series lock, so the whole thing stays on in production.
+Set METRICS_ENABLED=0 to turn recording off entirely.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds / rows) of the stage-latency and batch-size histograms
+LATENCY_BUCKETS_S = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+BATCH_ROWS_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Endpoint the current request (and the scoring work it spawns) is attributed to
+_endpoint: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("metrics_endpoint", default=None)
+
+
+class Histogram:
+    """Prometheus-style histogram: per-bucket counts, rendered cumulatively."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self, scale: float = 1.0) -> Dict[str, Any]:
+        """Count, mean, max and per-bucket (non-cumulative) counts for JSON stats, values times `scale`."""
+        with self._lock:
+            counts, total, peak = list(self.counts), self.sum, self.max
+        count = sum(counts)
+        labels = [f"<={b * scale:g}" for b in self.buckets] + [f">{self.buckets[-1] * scale:g}"]
+        return {
+            "count": count,
+            "mean": total * scale / count if count else 0.0,
+            "max": peak * scale,
+            "buckets": dict(zip(labels, counts)),
+        }
+
+    def render(self, name: str, labels: str) -> List[str]:
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        sep = "," if labels else ""
+        braces = f"{{{labels}}}" if labels else ""
+        lines, cumulative = [], 0
+        for upper, n in zip(self.buckets, counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{upper:g}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {cumulative}')
+        lines.append(f"{name}_sum{braces} {total!r}")
+        lines.append(f"{name}_count{braces} {cumulative}")
+        return lines
+
+
+class _StageTimer:
+    """Context manager timing one stage of the current request."""
+
+    __slots__ = ("telemetry", "stage", "endpoint", "t0")
+
+    def __init__(self, telemetry: "Telemetry", stage: str):
+        self.telemetry = telemetry
+        self.stage = stage
+
+    def __enter__(self):
+        self.endpoint = _endpoint.get()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.endpoint is not None:
+            self.telemetry.observe_stage(self.endpoint, self.stage, time.perf_counter() - self.t0)
+        return False
+
+
+class Telemetry:
+    """
+    Per-endpoint request, stage, batch-size and in-flight metrics.
+
+    Args:
+        namespace: Prefix of every exported metric name.
+        enabled: When False every recording call is a no-op.
+    """
+
+    def __init__(self, namespace: str = "churn_api", enabled: bool = True):
+        self.namespace = namespace
+        self.enabled = enabled
+        self.stage_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.request_seconds: Dict[str, Histogram] = {}
+        self.batch_rows: Dict[str, Histogram] = {}
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.in_flight: Dict[str, int] = {}
+        self._callbacks: List[Tuple[str, str, str, Callable[[], float]]] = []
+        self._histograms: List[Tuple[str, str, Histogram]] = []
+        self._lock = threading.Lock()
+        self._noop = contextlib.nullcontext()
+
+    # ---------------------------
+    # Recording
+    # ---------------------------
+    def stage(self, name: str):
+        """`with telemetry.stage("parse"): ...` times a stage of the current request."""
+        if not self.enabled:
+            return self._noop
+        return _StageTimer(self, name)
+
+    def observe_stage(self, endpoint: str, stage: str, seconds: float) -> None:
+        self._series(self.stage_seconds, (endpoint, stage), LATENCY_BUCKETS_S).observe(seconds)
+
+    def observe_batch(self, rows: int) -> None:
+        """Rows handed to one model call on behalf of the current request."""
+        endpoint = _endpoint.get()
+        if self.enabled and endpoint is not None:
+            self._series(self.batch_rows, endpoint, BATCH_ROWS_BUCKETS).observe(rows)
+
+    def request_started(self, endpoint: str) -> None:
+        with self._lock:
+            self.in_flight[endpoint] = self.in_flight.get(endpoint, 0) + 1
+
+    def request_finished(self, endpoint: str, status: int, seconds: float) -> None:
+        key = (endpoint, str(status))
+        with self._lock:
+            self.in_flight[endpoint] -= 1
+            self.requests[key] = self.requests.get(key, 0) + 1
+        self._series(self.request_seconds, endpoint, LATENCY_BUCKETS_S).observe(seconds)
+
+    def add_callback(self, name: str, help_text: str, kind: str, fn: Callable[[], float]) -> None:
+        """Export a value read at scrape time (`kind` is "gauge" or "counter")."""
+        self._callbacks.append((name, help_text, kind, fn))
+
+    def add_histogram(self, name: str, help_text: str, hist: Histogram) -> None:
+        """Export a histogram owned and updated by another component (e.g. the micro-batcher)."""
+        self._histograms.append((name, help_text, hist))
+
+    def _series(self, family: Dict, key, buckets: Tuple[float, ...]) -> Histogram:
+        hist = family.get(key)
+        if hist is None:
+            with self._lock:
+                hist = family.setdefault(key, Histogram(buckets))
+        return hist
+
+    # ---------------------------
+    # Exposition
+    # ---------------------------
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        ns = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            requests, in_flight = dict(self.requests), dict(self.in_flight)
+            request_seconds, stage_seconds = dict(self.request_seconds), dict(self.stage_seconds)
+            batch_rows = dict(self.batch_rows)
+
+        def header(name: str, help_text: str, kind: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header(f"{ns}_requests_total", "Completed requests by endpoint and HTTP status.", "counter")
+        for (endpoint, status), n in sorted(requests.items()):
+            lines.append(f'{ns}_requests_total{{endpoint="{endpoint}",status="{status}"}} {n}')
+
+        header(f"{ns}_requests_in_flight", "Requests currently being handled.", "gauge")
+        for endpoint, n in sorted(in_flight.items()):
+            lines.append(f'{ns}_requests_in_flight{{endpoint="{endpoint}"}} {n}')
+
+        header(f"{ns}_request_duration_seconds", "End-to-end request latency.", "histogram")
+        for endpoint, hist in sorted(request_seconds.items()):
+            lines.extend(hist.render(f"{ns}_request_duration_seconds", f'endpoint="{endpoint}"'))
+
+        header(f"{ns}_stage_duration_seconds",
+               "Time per request-handling stage (parse, feature_alignment, inference, serialization).", "histogram")
+        for (endpoint, stage), hist in sorted(stage_seconds.items()):
+            lines.extend(hist.render(f"{ns}_stage_duration_seconds", f'endpoint="{endpoint}",stage="{stage}"'))
+
+        header(f"{ns}_batch_rows", "Rows per model call.", "histogram")
+        for endpoint, hist in sorted(batch_rows.items()):
+            lines.extend(hist.render(f"{ns}_batch_rows", f'endpoint="{endpoint}"'))
+
+        for name, help_text, hist in self._histograms:
+            header(f"{ns}_{name}", help_text, "histogram")
+            lines.extend(hist.render(f"{ns}_{name}", ""))
+
+        for name, help_text, kind, fn in self._callbacks:
+            header(f"{ns}_{name}", help_text, kind)
+            lines.append(f"{ns}_{name} {float(fn())!r}")
+
+        return "\n".join(lines) + "\n"
+
+
+@contextlib.contextmanager
+def endpoint_label(endpoint: str) -> Iterator[None]:
+    """Attribute stages recorded inside the block to `endpoint`."""
+    token = _endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def labelled(endpoint: str, fn: Callable) -> Callable:
+    """
+    Wrap `fn` so its stages are attributed to `endpoint`.
+
+    For work that runs outside the request's context, e.g. the micro-batcher
+    scoring records queued by many `/predict/single` requests.
+    """
+    def wrapper(*args, **kwargs):
+        with endpoint_label(endpoint):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+telemetry = Telemetry(enabled=os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes"))
@@ -0,0 +1,59 @@
+"""
+Shared fixtures: a small synthetic Telco frame with the real column layout
+and category vocabularies, so tests run without the raw dataset.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# === Fix import path for local modules ===
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Telco column -> categories (numeric columns are generated separately)
+TELCO_CATEGORIES = {
+    "gender": ["Male", "Female"],
+    "Partner": ["Yes", "No"],
+    "Dependents": ["Yes", "No"],
+    "PhoneService": ["Yes", "No"],
+    "MultipleLines": ["Yes", "No", "No phone service"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": ["Yes", "No", "No internet service"],
+    "OnlineBackup": ["Yes", "No", "No internet service"],
+    "DeviceProtection": ["Yes", "No", "No internet service"],
+    "TechSupport": ["Yes", "No", "No internet service"],
+    "StreamingTV": ["Yes", "No", "No internet service"],
+    "StreamingMovies": ["Yes", "No", "No internet service"],
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": ["Yes", "No"],
+    "PaymentMethod": [
+        "Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)",
+    ],
+}
+
+
+def make_telco_frame(rows: int = 500, seed: int = 0) -> pd.DataFrame:
+    """Raw Telco-shaped frame (strings as read from the CSV, TotalCharges as text with a few blanks)."""
+    rng = np.random.default_rng(seed)
+    tenure = rng.integers(0, 73, rows)
+    monthly = np.round(rng.uniform(18.0, 120.0, rows), 2)
+    total = np.round(monthly * np.maximum(tenure, 1) * rng.uniform(0.95, 1.05, rows), 2)
+
+    df = pd.DataFrame({"customerID": [f"{i:04d}-TEST" for i in range(rows)]})
+    for col, values in TELCO_CATEGORIES.items():
+        df[col] = rng.choice(values, rows)
+    df.insert(2, "SeniorCitizen", rng.integers(0, 2, rows))
+    df.insert(5, "tenure", tenure)
+    df["MonthlyCharges"] = monthly
+    df["TotalCharges"] = total.astype(str)
+    df.loc[tenure == 0, "TotalCharges"] = " "
+    df["Churn"] = np.where(rng.random(rows) < 0.27, "Yes", "No")
+    return df
+
+
+@pytest.fixture
+def telco_raw() -> pd.DataFrame:
+    return make_telco_frame()
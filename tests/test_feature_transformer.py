@@ -0,0 +1,64 @@
+"""FeatureTransformer must encode exactly like `build_features` + reindex to the training columns."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.feature_engineering import FeatureTransformer, build_features
+from src.data.preprocess import preprocess_data
+
+
+@pytest.fixture
+def fitted(telco_raw):
+    df = preprocess_data(telco_raw.copy())
+    return df, FeatureTransformer().fit(df)
+
+
+def reference_features(df: pd.DataFrame, columns) -> np.ndarray:
+    """The training path: build_features, bools to int, target dropped, reindexed to `columns`."""
+    enc = build_features(df)
+    for c in enc.select_dtypes(include=["bool"]).columns:
+        enc[c] = enc[c].astype(int)
+    enc = enc.drop(columns=["Churn"])
+    assert list(enc.columns) == list(columns)
+    return enc.reindex(columns=columns, fill_value=0).to_numpy(dtype=np.float32)
+
+
+def test_transform_matches_build_features(fitted):
+    df, transformer = fitted
+    expected = reference_features(df, transformer.feature_columns)
+    np.testing.assert_array_equal(transformer.transform(df).to_numpy(), expected)
+
+
+def test_transform_accepts_raw_records(telco_raw, fitted):
+    # IDs, the text target and blank TotalCharges are handled like preprocess_data
+    df, transformer = fitted
+    np.testing.assert_array_equal(
+        transformer.transform(telco_raw).to_numpy(), transformer.transform(df).to_numpy()
+    )
+
+
+def test_transform_record_matches_transform(telco_raw, fitted):
+    _, transformer = fitted
+    expected = transformer.transform(telco_raw).to_numpy()
+    out = np.empty(transformer.n_features, dtype=np.float32)
+    for i, record in enumerate(telco_raw.to_dict(orient="records")):
+        np.testing.assert_array_equal(transformer.transform_record(record), expected[i])
+        np.testing.assert_array_equal(transformer.transform_record(record, out=out), expected[i])
+
+
+def test_unseen_category_encodes_as_zeros(telco_raw, fitted):
+    _, transformer = fitted
+    record = {**telco_raw.iloc[0].to_dict(), "Contract": "Weekly"}
+    row = transformer.transform_record(record)
+    contract = [transformer.feature_columns.index(c) for c in transformer.feature_columns if c.startswith("Contract_")]
+    assert not row[contract].any()
+    np.testing.assert_array_equal(row, transformer.transform(pd.DataFrame([record])).to_numpy()[0])
+
+
+def test_spec_round_trip(telco_raw, fitted):
+    _, transformer = fitted
+    restored = FeatureTransformer.from_spec(transformer.to_spec())
+    np.testing.assert_array_equal(
+        restored.transform(telco_raw).to_numpy(), transformer.transform(telco_raw).to_numpy()
+    )
@@ -0,0 +1,42 @@
+"""TreeEnsemble must reproduce XGBClassifier.predict_proba, including missing-value routing."""
+
+import numpy as np
+import pytest
+from xgboost import XGBClassifier
+
+from src.data.predict.tree_engine import TreeEnsemble
+
+
+def make_data(rows: int, seed: int, nan_share: float = 0.1):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 8)).astype(np.float32)
+    y = ((X[:, 0] + 0.5 * X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=rows)) > 0).astype(int)
+    X[rng.random(X.shape) < nan_share] = np.nan
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def model():
+    X, y = make_data(2000, seed=0)
+    return XGBClassifier(
+        n_estimators=60, max_depth=5, learning_rate=0.1, random_state=42, scale_pos_weight=2.0
+    ).fit(X, y)
+
+
+@pytest.mark.parametrize("nan_share", [0.0, 0.1, 1.0])
+def test_predict_proba_matches_xgboost(model, nan_share):
+    X, _ = make_data(1000, seed=1, nan_share=nan_share)
+    engine = TreeEnsemble.from_booster(model.get_booster())
+    np.testing.assert_allclose(engine.predict_proba(X), model.predict_proba(X)[:, 1], rtol=0, atol=1e-6)
+
+
+def test_chunking_does_not_change_margins(model):
+    X, _ = make_data(777, seed=2)
+    engine = TreeEnsemble.from_booster(model.get_booster())
+    np.testing.assert_array_equal(engine.predict_margin(X, chunk_rows=64), engine.predict_margin(X, chunk_rows=1000))
+
+
+def test_rejects_wrong_feature_count(model):
+    engine = TreeEnsemble.from_booster(model.get_booster())
+    with pytest.raises(ValueError):
+        engine.predict_proba(np.zeros((3, engine.n_features + 1), dtype=np.float32))
@@ -0,0 +1,81 @@
+"""The compiled validation plan must report exactly what the original per-rule checks did."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Scripts.benchmark_validation import legacy_validate
+from src.data.validate_data import run_validation, validate_telco_data
+
+
+def _set(col, value, share=0.05):
+    def corrupt(df, rng):
+        rows = rng.choice(len(df), size=max(1, int(len(df) * share)), replace=False)
+        if not isinstance(value, (int, float)) or pd.isna(value):
+            df[col] = df[col].astype(object)
+        df.loc[rows, col] = value
+    return corrupt
+
+
+def _drop(col):
+    def corrupt(df, rng):
+        df.drop(columns=[col], inplace=True)
+    return corrupt
+
+
+def _fill_blank_totals(df, rng):
+    # Blank TotalCharges count as non-numeric and switch off its range check
+    df["TotalCharges"] = df["TotalCharges"].replace(" ", "0.0")
+
+
+def _low_totals(df, rng):
+    df["TotalCharges"] = (pd.to_numeric(df["TotalCharges"], errors="coerce") / 100).astype(str)
+
+
+BAD_ROWS = {
+    "clean": [],
+    "null gender": [_set("gender", np.nan)],
+    "invalid Contract": [_set("Contract", "Weekly")],
+    "invalid Partner (3%)": [_set("Partner", "Maybe", share=0.03)],
+    "tenure out of bounds": [_set("tenure", 500)],
+    "tenure non-numeric": [_set("tenure", "abc")],
+    "MonthlyCharges missing": [_set("MonthlyCharges", np.nan)],
+    "MonthlyCharges out of bounds": [_set("MonthlyCharges", 250.0)],
+    "TotalCharges n/a (warning only)": [_set("TotalCharges", "n/a")],
+    "TotalCharges negative, with blanks": [_set("TotalCharges", "-5")],
+    "TotalCharges negative": [_fill_blank_totals, _set("TotalCharges", "-5")],
+    "TotalCharges below MonthlyCharges": [_low_totals],
+    "missing Contract column": [_drop("Contract")],
+    "everything at once": [
+        _set("gender", np.nan), _set("Contract", "Weekly"), _set("tenure", 500),
+        _set("MonthlyCharges", np.nan), _set("TotalCharges", "n/a"), _drop("Dependents"),
+    ],
+}
+
+
+@pytest.mark.parametrize("typed", [False, True], ids=["object", "category"])
+@pytest.mark.parametrize("case", list(BAD_ROWS))
+def test_plan_matches_legacy_checks(telco_raw, case, typed):
+    df = telco_raw
+    rng = np.random.default_rng(0)
+    for corrupt in BAD_ROWS[case]:
+        corrupt(df, rng)
+    if typed:
+        text = [c for c in df.columns if df[c].dtype == object and c not in ("tenure", "MonthlyCharges", "TotalCharges")]
+        df = df.astype({c: "category" for c in text})
+
+    expected = legacy_validate(df)
+    assert validate_telco_data(df) == expected
+    result = run_validation(df)
+    assert (result.success, result.failed) == expected
+    assert result.success == (case == "clean" or "warning only" in case or "with blanks" in case)
+
+
+def test_bitmap_flags_exactly_the_corrupted_rows(telco_raw):
+    df = telco_raw
+    df["Contract"] = df["Contract"].astype(object)
+    bad = np.array([3, 17, 256])
+    df.loc[bad, "Contract"] = "Weekly"
+    result = run_validation(df)
+    np.testing.assert_array_equal(np.flatnonzero(result.violations("invalid:Contract")), bad)
+    assert result.invalid_rows()[bad].all()